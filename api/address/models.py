@@ -21,10 +21,26 @@ class Address(SmartModel):
 
     point = PointField(srid=4326)
 
+    # Copy of point kept in sync by a database trigger, indexed for Nearby queries
+    point_geography = PointField(geography=True, srid=4326, null=True, editable=False)
+
     def __str__(self):
         """Return a human readable representation of the model instance."""
         return "Address : {}".format(self.id)
 
+    def save(self, *args, **kwargs):
+        stored_point = Address.all_objects.filter(id=self.id).values_list("point", flat=True).first() if self.id else None
+
+        super(Address, self).save(*args, **kwargs)
+
+        if stored_point is not None and stored_point != self.point:
+            from ..venue.models import Venue
+            from ..delivery_coverage.models import DeliveryCoverage
+
+            # The cells a venue delivers to, and so its offers, follow its address
+            for venue in Venue.objects.filter(address_id=self.id).select_related("address"):
+                DeliveryCoverage.build_for(venue)
+
     @staticmethod
     def create_or_update_for(instance, address_data):
         from .serializers import AddressCreateSerializer, AddressEditSerializer
@@ -1,17 +1,17 @@
-from django.db import models
+from django.db import models, transaction
 
 from ..utils.Models import SmartModel
 
 from ..utils.Fields import EnumField
 
-from ..utils import Constants
+from ..utils import AllTimeStatCache, Constants
 
 
 class AllTimeStat(SmartModel):
 
     id = models.AutoField(primary_key=True)
 
-    type = EnumField(options=Constants.ALL_TIME_STAT_TYPES)
+    type = EnumField(options=Constants.ALL_TIME_STAT_TYPES, unique=True)
 
     value = models.PositiveIntegerField(default=0)
 
@@ -24,46 +24,58 @@ class AllTimeStat(SmartModel):
         if type not in Constants.ALL_TIME_STAT_TYPES:
             raise Exception(f"type must be one of {Constants.ALL_TIME_STAT_TYPES}")
 
-        queryset = AllTimeStat.objects.filter(type=type)
-        if not queryset.exists():
-
-            return 0
-
-        return queryset.first().value
+        return AllTimeStatCache.get([type])[type]
 
     @staticmethod
     def update_for(order):
-        from ..utils import DateUtils
+        from ..utils import DateUtils, StatsAccumulator
+
+        # Counters are buffered and written with the deltas of other orders, see StatsAccumulator
         if order.status == Constants.ORDER_STATUS_PENDING:
-            AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_TOTAL_EARNINGS, order.payment.total)
-            AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_TOTAL_COMPANY_EARNINGS, order.payment.amount)
-            AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_TOTAL_DRIVER_EARNINGS, order.payment.tip + order.payment.delivery_driver_fee)
-            AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_PLATFORM_EARNINGS, order.payment.service_fee)
-            AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_SALES_COUNT, 1)
+            StatsAccumulator.add_all_time(Constants.ALL_TIME_STAT_TYPE_TOTAL_EARNINGS, order.payment.total)
+            StatsAccumulator.add_all_time(Constants.ALL_TIME_STAT_TYPE_TOTAL_COMPANY_EARNINGS, order.payment.amount)
+            StatsAccumulator.add_all_time(Constants.ALL_TIME_STAT_TYPE_TOTAL_DRIVER_EARNINGS, order.payment.tip + order.payment.delivery_driver_fee)
+            StatsAccumulator.add_all_time(Constants.ALL_TIME_STAT_TYPE_PLATFORM_EARNINGS, order.payment.service_fee)
+            StatsAccumulator.add_all_time(Constants.ALL_TIME_STAT_TYPE_SALES_COUNT, 1)
 
         if order.status == Constants.ORDER_STATUS_REJECTED:
-            AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT, 1)
+            StatsAccumulator.add_all_time(Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT, 1)
 
+        # The average wait time is recomputed from these two when they are flushed
         if order.delivery_status == Constants.DELIVERY_STATUS_DELIVERED:
-            delivered_order_count_stat = AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_DELIVERED_ORDER_COUNT, 1).value
+            StatsAccumulator.add_all_time(Constants.ALL_TIME_STAT_TYPE_DELIVERED_ORDER_COUNT, 1)
             wait_time = DateUtils.minutes_between(order.created_at, DateUtils.now())
-            total_wait_time_stat = AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_TOTAL_WAIT_TIME, wait_time).value
-            AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_AVERAGE_WAIT_TIME, total_wait_time_stat/delivered_order_count_stat, True)
+            StatsAccumulator.add_all_time(Constants.ALL_TIME_STAT_TYPE_TOTAL_WAIT_TIME, wait_time)
 
     @staticmethod
     def update(type, value, should_reset_to_value=False):
-        from django.db.models import F
-        all_time_stat = AllTimeStat.objects.filter(type=type).first()
-
-        if not all_time_stat:
-            all_time_stat = AllTimeStat.objects.create(type=type, value=value)
-            return all_time_stat
+        """
+        Adds value to the stat, or sets it to value, creating it if needed, once the current transaction commits.
+        The write bumps the version every process checks its copy of the stats against, see AllTimeStatCache, so
+        it's kept out of request transactions instead of locking the version row until they end.
+        """
+        transaction.on_commit(lambda: AllTimeStat._write(type, value, should_reset_to_value))
 
-        if should_reset_to_value:
-            all_time_stat.value = value
-        else:
-            all_time_stat.value = F("value") + value
-
-        all_time_stat.save()
-
-        return all_time_stat
+    @staticmethod
+    def _write(type, value, should_reset_to_value):
+        from django.db import connection
+
+        table = AllTimeStat._meta.db_table
+        new_value = "EXCLUDED.value" if should_reset_to_value else f"{table}.value + EXCLUDED.value"
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                WITH stat AS (
+                    INSERT INTO {table} (type, value, created_at, updated_at)
+                    VALUES (%s, %s::integer, now(), now())
+                    ON CONFLICT (type)
+                    DO UPDATE SET value = {new_value}, updated_at = EXCLUDED.updated_at
+                    RETURNING value
+                ), version AS (
+                    UPDATE {AllTimeStatCache.VERSION_TABLE} SET value = value + 1 WHERE id = 1 RETURNING value
+                )
+                SELECT stat.value, version.value FROM stat, version
+            """, [type, value])
+            value, version = cursor.fetchone()
+
+        transaction.on_commit(lambda: AllTimeStatCache.apply(version, {type: value}))
@@ -1,7 +1,5 @@
 from __future__ import unicode_literals
 
-from .models import AllTimeStat
-
 from rest_framework import status
 
 from rest_framework.response import Response
@@ -10,7 +8,7 @@ from ..utils.Permissions import (
     IsAdminPermission,
 )
 
-from ..utils import QueryParams, Constants
+from ..utils import AllTimeStatCache, QueryParams, Constants
 
 from ..utils.Views import SmartAPIView
 
@@ -21,15 +19,7 @@ class List(SmartAPIView):
     def get(self, request):
         types = QueryParams.get_enum_list(request, "types", Constants.ALL_TIME_STAT_TYPES, raise_exception=True)
 
-        all_time_stats = AllTimeStat.objects.filter(type__in=types)
-
-        data = {}
-
-        for all_time_stat in all_time_stats:
-            data[f"{all_time_stat.type}"] = int(all_time_stat.value)
-
-        for current_type in types:
-            if current_type not in data:
-                data[current_type] = 0
+        # Served from this process's copy of the stats, see AllTimeStatCache
+        data = AllTimeStatCache.get(types)
 
         return Response(data, status=status.HTTP_200_OK)
\ No newline at end of file
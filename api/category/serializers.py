@@ -38,6 +38,20 @@ class CategoryEditSerializer(EditModelSerializer):
 
         return attrs
 
+    def update(self, instance, validated_data):
+        from django.db.models import Q
+        from ..item.models import Item
+        from ..menu.models import Menu
+
+        category = super(CategoryEditSerializer, self).update(instance, validated_data)
+
+        if {"title", "parent"} & validated_data.keys():
+            Item.update_search_documents(category_id=category.id)
+
+        Menu.invalidate(Menu.objects.filter(Q(categories__category=category) | Q(items__item__subcategory=category)))
+
+        return category
+
 
 class CategoryListSerializer(ListModelSerializer):
     image = ImageDetailSerializer()
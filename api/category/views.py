@@ -13,11 +13,11 @@ from ..utils.Permissions import (
     IsAdminPermission,
 )
 
-from django.db.models.query import F
+from django.db.models import IntegerField, Value
 
 from ..utils.Views import SmartPaginationAPIView, SmartDetailAPIView, CustomPagination
 
-from ..utils import QueryParams, Constants, DateUtils
+from ..utils import QueryParams, Constants, DateUtils, CategoryTree
 
 
 class ListCreate(SmartPaginationAPIView):
@@ -55,34 +55,17 @@ class ListCreate(SmartPaginationAPIView):
         venue_id = QueryParams.get_int(request, "venue_id")
         extend_menu_items = QueryParams.get_bool(request, "extend_menu_items")
 
-        if search_term:
-            queryset = queryset.filter(title__icontains=search_term)
-
         if order == "most_popular":
             self.paginator.ordering = "-sales_count"
         else:
             self.paginator.ordering = ("title", "-created_at")
 
-        if has_parent is not None:
-            queryset = queryset.exclude(parent__isnull=has_parent)
-
-        if parent_id is not None:
-            queryset = queryset.filter(parent_id=parent_id)
-
-        if has_items:
-            queryset = queryset.filter(item_count__gt=0)
-
-        if has_menu_items:
-            queryset = queryset.filter(menu_item_count__gt=0)
-
-        if venue_id and not has_parent:
-            queryset = queryset.filter(menu_categories__menu__venue_id=venue_id)
-
-        if venue_id and has_parent:
-            queryset = queryset.filter(parent__menu_categories__menu__venue_id=venue_id)
+        queryset = queryset.filter(id__in=CategoryTree.filter_ids(search_term, has_parent, parent_id, has_items,
+                                                                  has_menu_items, venue_id))
 
+        # Menu ids are venue ids
         if extend_menu_items and venue_id and has_parent:
-            queryset = queryset.annotate(menu_id=F("parent__menu_categories__menu"))
+            queryset = queryset.annotate(menu_id=Value(venue_id, output_field=IntegerField()))
 
         return queryset
 
@@ -61,6 +61,8 @@ class Company(SmartModel):
 
     average_accept_time = models.PositiveIntegerField(default=0)
 
+    accepted_order_count = models.PositiveIntegerField(default=0)
+
     venue_count = models.PositiveIntegerField(default=0)
 
     passcode = models.PositiveIntegerField()
@@ -69,6 +71,9 @@ class Company(SmartModel):
         """Return a human readable representation of the model instance."""
         return "Company {}: ".format(self.id)
 
+    # Whether customers can order from the company's venues depends on these, see MenuItem.add_customer_filters
+    OFFER_FIELDS = ["status", "stripe_account_id", "stripe_charges_enabled"]
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = Slug.generate(self, 'title', 'slug')
@@ -76,32 +81,58 @@ class Company(SmartModel):
         if not self.passcode:
             self.passcode = random.randint(1000, 9999)
 
+        stored = Company.all_objects.filter(id=self.id).values(*Company.OFFER_FIELDS).first() if self.id else None
+
         super(Company, self).save()
 
+        if stored and any(stored[field] != getattr(self, field) for field in Company.OFFER_FIELDS):
+            from ..item_offer.models import ItemOffer
+            ItemOffer.refresh(venue_ids=self.venues.values("id"))
+
     def can_accept_payments(self):
         # For regular orders, validate Stripe account and charges enabled
         return self.stripe_account_id is not None and self.stripe_charges_enabled
 
+    # Recomputed from their total and count whenever either changes, see Counters
+    STAT_AVERAGES = {
+        "average_accept_time": ("total_accept_time", "accepted_order_count"),
+        "average_delivery_time": ("total_delivery_time", "delivered_order_count")
+    }
+
     def update_stats_for(self, order):
-        from ..utils import Constants, DateUtils
-        from django.db.models import F
+        Company.update_stats_for_orders([order])
+
+    @staticmethod
+    def update_stats_for_orders(orders):
+        """
+        Applies the stats of every one of orders with one UPDATE, see Counters. Each order's venue is used to find
+        its company.
+        """
+        from ..utils import Counters
+
+        rows = Counters.collect((order.venue.company_id, Company.stat_deltas_for(order)) for order in orders)
+
+        return Counters.add(Company, rows, Company.STAT_AVERAGES)
+
+    @staticmethod
+    def stat_deltas_for(order):
+        from ..utils import DateUtils
+
+        deltas = {}
 
         if order.status == Constants.ORDER_STATUS_PENDING:
-            self.sales_count = F("sales_count") + 1
-            self.total_earnings = F("total_earnings") + order.payment.amount
+            deltas["sales_count"] = 1
+            deltas["total_earnings"] = order.payment.amount
 
         if order.status == Constants.ORDER_STATUS_LOOKING_FOR_DRIVER:
-            accept_time = DateUtils.minutes_between(order.created_at, DateUtils.now())
-            self.total_accept_time = F("total_accept_time") + accept_time
-            self.average_accept_time = (F("average_accept_time") + accept_time) / F("sales_count")
+            deltas["accepted_order_count"] = 1
+            deltas["total_accept_time"] = DateUtils.minutes_between(order.created_at, DateUtils.now())
 
         if order.delivery_status == Constants.DELIVERY_STATUS_DELIVERED:
-            delivery_time = DateUtils.minutes_between(order.collected_at, DateUtils.now())
-            self.delivered_order_count = F("delivered_order_count") + 1
-            self.total_delivery_time = F("total_delivery_time") + delivery_time
-            self.average_delivery_time = self.total_delivery_time / self.delivered_order_count
+            deltas["delivered_order_count"] = 1
+            deltas["total_delivery_time"] = DateUtils.minutes_between(order.collected_at, DateUtils.now())
 
-        self.save()
+        return deltas
 
     @staticmethod
     def exclude_stripe_incomplete(queryset, accessor):
@@ -29,16 +29,30 @@ class Customer(SmartModel):
         """Return a human readable representation of the model instance."""
         return "Customer {}: ".format(self.user.id)
 
+    # Recomputed from their total and count whenever either changes, see Counters
+    STAT_AVERAGES = {
+        "average_spending_per_order": ("total_spending", "order_count")
+    }
+
     def update_stats_for(self, order):
-        from ..utils import DateUtils
-        from django.db.models import F
+        Customer.update_stats_for_orders([order])
+
+    @staticmethod
+    def update_stats_for_orders(orders):
+        """
+        Applies the stats of every one of orders with one UPDATE, see Counters.
+        """
+        from ..utils import Counters, DateUtils
+
+        now = DateUtils.now()
 
-        self.last_order_at = DateUtils.now()
-        self.order_count = F("order_count") + 1
-        self.total_spending = F("total_spending") + order.payment.total
-        self.average_spending_per_order = self.total_spending/self.order_count
+        rows = Counters.collect(((order.customer_id, {
+            "last_order_at": now,
+            "order_count": 1,
+            "total_spending": order.payment.total
+        }) for order in orders), latest=["last_order_at"])
 
-        self.save()
+        return Counters.add(Customer, rows, Customer.STAT_AVERAGES, latest=["last_order_at"])
 
     def delete(self):
         self.user.redact()
@@ -1,3 +1,5 @@
+import datetime
+
 from django.db import models
 
 from ..utils.Models import SmartModel
@@ -7,11 +9,19 @@ from ..utils.Fields import EnumField
 from ..venue.models import Venue
 from ..company.models import Company
 
-from ..utils import Constants, DateUtils, StatUtils
+from ..utils import Constants, DateUtils, StatsAccumulator, TimeSeries
 
 
 class DailyStat(SmartModel):
 
+    # Earnings type of every series of the daily stats endpoint, each is returned next to the sales count
+    SERIES = {
+        "total": Constants.DAILY_STAT_TYPE_TOTAL_EARNINGS,
+        "company": Constants.DAILY_STAT_TYPE_TOTAL_COMPANY_EARNINGS,
+        "driver": Constants.DAILY_STAT_TYPE_TOTAL_DRIVER_EARNINGS,
+        "platform": Constants.DAILY_STAT_TYPE_PLATFORM_EARNINGS
+    }
+
     id = models.AutoField(primary_key=True)
 
     date = models.DateField()
@@ -38,75 +48,119 @@ class DailyStat(SmartModel):
 
     @staticmethod
     def update(type, value_to_be_added, venue=None):
-        from django.db.models import F
-        date = DateUtils.today().date()
+        # Buffered and written with the deltas of other orders, see StatsAccumulator
+        StatsAccumulator.add_daily(type, value_to_be_added, venue)
 
-        daily_stat = DailyStat.objects.filter(type=type, date=date).first()
+    @staticmethod
+    def rollup(min_date, max_date):
+        """
+        Computes every stat from min_date to max_date (inclusive) straight from orders and their payments, as
+        {(type, date, venue_id, company_id): value}. An order counts on the day it was created, like update_for
+        which runs when it's placed.
+        """
+        from django.db.models import Count, F, Sum
+        from django.db.models.functions import TruncDate
+        from ..order.models import Order
+
+        orders = Order.objects.filter(created_at__gte=DateUtils.combine(min_date, datetime.time.min),
+                                      created_at__lt=DateUtils.combine(max_date + datetime.timedelta(days=1),
+                                                                       datetime.time.min))\
+            .annotate(day=TruncDate("created_at"))\
+            .order_by()
+
+        stats = {}
+
+        for row in orders.values("day").annotate(total=Sum("payment__total"),
+                                                 amount=Sum("payment__amount"),
+                                                 driver=Sum(F("payment__tip") + F("payment__delivery_driver_fee")),
+                                                 platform=Sum("payment__service_fee"),
+                                                 count=Count("id")):
+            stats[(Constants.DAILY_STAT_TYPE_TOTAL_EARNINGS, row["day"], None, None)] = row["total"]
+            stats[(Constants.DAILY_STAT_TYPE_TOTAL_COMPANY_EARNINGS, row["day"], None, None)] = row["amount"]
+            stats[(Constants.DAILY_STAT_TYPE_TOTAL_DRIVER_EARNINGS, row["day"], None, None)] = row["driver"]
+            stats[(Constants.DAILY_STAT_TYPE_PLATFORM_EARNINGS, row["day"], None, None)] = row["platform"]
+            stats[(Constants.DAILY_STAT_TYPE_SALES_COUNT, row["day"], None, None)] = row["count"]
+
+        for row in orders.values("day", "venue_id").annotate(amount=Sum("payment__amount"), count=Count("id")):
+            stats[(Constants.DAILY_STAT_TYPE_TOTAL_COMPANY_EARNINGS, row["day"], row["venue_id"], None)] = row["amount"]
+            stats[(Constants.DAILY_STAT_TYPE_SALES_COUNT, row["day"], row["venue_id"], None)] = row["count"]
+
+        for row in orders.values("day", "venue__company_id").annotate(amount=Sum("payment__amount"), count=Count("id")):
+            company_id = row["venue__company_id"]
+            stats[(Constants.DAILY_STAT_TYPE_TOTAL_COMPANY_EARNINGS, row["day"], None, company_id)] = row["amount"]
+            stats[(Constants.DAILY_STAT_TYPE_SALES_COUNT, row["day"], None, company_id)] = row["count"]
+
+        return stats
 
-        if not daily_stat:
-            DailyStat.objects.create(type=type, date=date, value=value_to_be_added)
-        else:
-            daily_stat.value = F("value") + value_to_be_added
-            daily_stat.save()
+    @staticmethod
+    def rebuild(min_date, max_date):
+        """
+        Replaces every stat from min_date to max_date (inclusive) with the ones computed by rollup.
+        Days that are still taking orders keep receiving deltas, so only closed days should be rebuilt.
+        """
+        from django.db import transaction
 
-        if not venue:
-            return
+        with transaction.atomic():
+            stats = DailyStat.rollup(min_date, max_date)
 
-        daily_stat_venue = DailyStat.objects.filter(type=type, date=date, venue=venue).first()
+            DailyStat.all_objects.filter(date__gte=min_date, date__lte=max_date).hard_delete()
+            DailyStat.objects.bulk_create([
+                DailyStat(type=type, date=date, venue_id=venue_id, company_id=company_id, value=value)
+                for (type, date, venue_id, company_id), value in stats.items()
+            ], batch_size=1000)
 
-        if not daily_stat_venue:
-            DailyStat.objects.create(type=type, date=date, venue=venue, value=value_to_be_added)
-        else:
-            daily_stat_venue.value = F("value") + value_to_be_added
-            daily_stat_venue.save()
+        return len(stats)
 
-        company = venue.company
+    @staticmethod
+    def verify(min_date, max_date):
+        """
+        Returns (type, date, venue_id, company_id, stored value, computed value) for every stat from min_date to
+        max_date (inclusive) that differs from what rollup computes.
+        """
+        expected = DailyStat.rollup(min_date, max_date)
+        stored = {(stat.type, stat.date, stat.venue_id, stat.company_id): stat.value
+                  for stat in DailyStat.objects.filter(date__gte=min_date, date__lte=max_date)}
 
-        daily_stat_company = DailyStat.objects.filter(type=type, date=date, company=company).first()
+        differences = []
 
-        if not daily_stat_venue:
-            DailyStat.objects.create(type=type, date=date, company=company, value=value_to_be_added)
-            return
+        for key in set(expected) | set(stored):
+            if stored.get(key, 0) != expected.get(key, 0):
+                differences.append((*key, stored.get(key, 0), expected.get(key, 0)))
 
-        daily_stat_company.value = F("value") + value_to_be_added
-        daily_stat_company.save()
+        return sorted(differences, key=lambda difference: (difference[1], difference[0],
+                                                           difference[2] or 0, difference[3] or 0))
 
     @staticmethod
-    def get_stats(type, min_date=None, max_date=None, company_id=None,):
-        types = [type, Constants.DAILY_STAT_TYPE_SALES_COUNT]
+    def get_series(names, min_date, max_date, company_id=None, interval=TimeSeries.DAY):
+        """
+        Returns {name: [{"date", "earnings", "sales_count"}, ...]} for every one of names (keys of SERIES), read with
+        one query. With company_id the company series is the company's own instead of every company's.
+        """
+        from django.db.models import Q
 
-        queryset = DailyStat.objects.filter(date__gte=min_date, date__lte=max_date, type__in=types)
+        if "company" not in names:
+            company_id = None
 
-        if company_id and type == Constants.DAILY_STAT_TYPE_TOTAL_COMPANY_EARNINGS:
-            queryset = queryset.filter(venue__company__id=company_id)
+        types = {DailyStat.SERIES[name] for name in names} | {Constants.DAILY_STAT_TYPE_SALES_COUNT}
 
-        else:
-            queryset = queryset.filter(venue__isnull=True, company__isnull=True)
-
-        stats = DailyStat._to_list(queryset, types)
-
-        return StatUtils.sort_list_multi(stats, min_date, max_date, ["earnings", Constants.DAILY_STAT_TYPE_SALES_COUNT])
-
-    @staticmethod
-    def _to_list(queryset, types):
-        list_ = []
-        queryset = queryset.values("date", "type", "value")
-        for current in queryset:
-            if current["type"] not in types:
-                continue
+        scopes = Q(company__isnull=True)
+        if company_id:
+            scopes |= Q(company_id=company_id)
 
-            found_item = next((x for x in list_ if x["date"] == current["date"]), None)
+        queryset = DailyStat.objects.filter(scopes, date__gte=min_date, date__lte=max_date, type__in=types,
+                                            venue__isnull=True)
 
-            if current["type"] != Constants.DAILY_STAT_TYPE_SALES_COUNT:
-                current["type"] = "earnings"
+        rows = []
 
-            if found_item is None:
-                list_.append({
-                    "date": current["date"],
-                    f"{current['type']}": current["value"]
-                })
-                continue
+        for date, type, value, row_company_id in queryset.values_list("date", "type", "value", "company_id"):
+            for name in names:
+                if row_company_id != (company_id if name == "company" else None):
+                    continue
 
-            found_item[f"{current['type']}"] = current["value"]
+                if type == Constants.DAILY_STAT_TYPE_SALES_COUNT:
+                    rows.append((name, date, Constants.DAILY_STAT_TYPE_SALES_COUNT, value))
+                elif type == DailyStat.SERIES[name]:
+                    rows.append((name, date, "earnings", value))
 
-        return list_
+        return TimeSeries.build_many(rows, names, min_date, max_date,
+                                     ["earnings", Constants.DAILY_STAT_TYPE_SALES_COUNT], interval)
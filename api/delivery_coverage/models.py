@@ -0,0 +1,136 @@
+from django.db import models, transaction
+from django.db.models import Q
+
+from ..venue.models import Venue
+
+from ..utils import DeliveryTiers, Distance, Geohash
+
+
+class DeliveryCoverage(models.Model):
+    """
+    Maps the geohash cells around a venue to how far the venue is from them, so the venues that deliver to a point are
+    one indexed lookup on the point's cell. Fee tiers are resolved when reading, so changing DeliveryDistance only
+    needs venues rebuilt when the longest tier grows past the radius they were built for.
+    """
+
+    # ~0.6km x 0.7km cells around Dublin
+    PRECISION = 6
+
+    id = models.BigAutoField(primary_key=True)
+
+    geohash = models.CharField(max_length=12, db_index=True)
+
+    venue = models.ForeignKey(Venue, related_name="delivery_coverage", on_delete=models.CASCADE)
+
+    # Closest and furthest distance in kms between the venue and the cell
+    min_distance = models.FloatField()
+
+    max_distance = models.FloatField()
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "DeliveryCoverage {}: {}".format(self.geohash, self.venue_id)
+
+    @staticmethod
+    @transaction.atomic
+    def build_for(venue, radius=None):
+        from ..delivery_distance.models import DeliveryDistance
+        from ..item_offer.models import ItemOffer
+
+        if radius is None:
+            max_delivery_distance = DeliveryDistance.objects.order_by("-ends").first()
+            radius = max_delivery_distance.ends if max_delivery_distance else None
+
+        DeliveryCoverage.objects.filter(venue=venue).delete()
+
+        if radius is not None:
+            point = venue.address.point
+            DeliveryCoverage.objects.bulk_create([
+                DeliveryCoverage(geohash=geohash, venue=venue, min_distance=min_distance, max_distance=max_distance)
+                for geohash, min_distance, max_distance in Geohash.cells_within(point.coords[1], point.coords[0],
+                                                                                float(radius),
+                                                                                DeliveryCoverage.PRECISION)
+            ], batch_size=5000)
+
+        Venue.objects.filter(id=venue.id).update(delivery_coverage_radius=radius)
+        venue.delivery_coverage_radius = radius
+
+        ItemOffer.refresh(venue_ids=[venue.id])
+
+    @staticmethod
+    def rebuild_stale():
+        """
+        Builds every venue whose coverage doesn't reach the longest delivery distance yet.
+        """
+        from ..delivery_distance.models import DeliveryDistance
+
+        max_delivery_distance = DeliveryDistance.objects.order_by("-ends").first()
+
+        if not max_delivery_distance:
+            return 0
+
+        venues = Venue.objects.filter(Q(delivery_coverage_radius__isnull=True) |
+                                      Q(delivery_coverage_radius__lt=max_delivery_distance.ends))
+
+        count = 0
+        for venue in venues.select_related("address").iterator():
+            DeliveryCoverage.build_for(venue, max_delivery_distance.ends)
+            count += 1
+
+        return count
+
+    @staticmethod
+    def delivery_distances_for(point, venue_ids=None):
+        """
+        Returns {venue_id: DeliveryDistance} for every venue that delivers to point, None if there are no
+        delivery distances set up.
+        """
+        snapshot = DeliveryTiers.table()
+        tiers = snapshot[0]
+
+        if not tiers:
+            return None
+
+        longest = tiers[-1].ends
+
+        rows = DeliveryCoverage.objects.filter(geohash=Geohash.encode(point.coords[1], point.coords[0],
+                                                                      DeliveryCoverage.PRECISION),
+                                               min_distance__lte=longest)
+
+        # Venues built for a shorter radius than the longest tier may be missing cells, they are checked directly
+        stale_venues = Venue.objects.filter(Q(delivery_coverage_radius__isnull=True) |
+                                            Q(delivery_coverage_radius__lt=longest))
+
+        if venue_ids is not None:
+            rows = rows.filter(venue_id__in=venue_ids)
+            stale_venues = stale_venues.filter(id__in=venue_ids)
+
+        delivery_distances = {}
+        boundary_venue_ids = []
+
+        for venue_id, min_distance, max_distance in rows.values_list("venue_id", "min_distance", "max_distance"):
+            tier = DeliveryTiers.find(min_distance, snapshot)
+
+            if tier is not None and tier is DeliveryTiers.find(max_distance, snapshot):
+                delivery_distances[venue_id] = tier
+            else:
+                # The cell crosses a tier boundary or the edge of the delivery area
+                boundary_venue_ids.append(venue_id)
+
+        boundary_venues = Venue.objects.filter(Q(id__in=boundary_venue_ids) | Q(id__in=stale_venues.values("id")))
+
+        for venue_id, venue_point in boundary_venues.values_list("id", "address__point"):
+            tier = DeliveryTiers.find(Distance.between(venue_point, point, True), snapshot)
+
+            if tier is not None:
+                delivery_distances[venue_id] = tier
+
+        return delivery_distances
+
+    @staticmethod
+    def delivery_distance_for(venue, point):
+        """
+        Returns the DeliveryDistance tier venue delivers to point with, None if it doesn't deliver there.
+        """
+        delivery_distances = DeliveryCoverage.delivery_distances_for(point, [venue.id])
+        return delivery_distances.get(venue.id) if delivery_distances else None
@@ -1,6 +1,6 @@
 from ..utils.Serializers import serializers, CreateSerializer, ValidateModelSerializer, ListSerializer, ListModelSerializer
 
-from ..utils import Constants
+from ..utils import Constants, DeliveryTiers
 
 from django.db.models import Q
 
@@ -44,6 +44,9 @@ class DeliveryDistanceBulkCreateSerializer(CreateSerializer):
         return attrs
 
     def create(self, validated_data):
+        from ..tasks import rebuild_delivery_coverage
+        from django.db import transaction
+
         delivery_distances_data = validated_data.pop("delivery_distances")
 
         DeliveryDistance.objects.delete()
@@ -54,6 +57,11 @@ class DeliveryDistanceBulkCreateSerializer(CreateSerializer):
             delivery_distance = DeliveryDistance.objects.create(**delivery_distance_data)
             delivery_distances.append(delivery_distance)
 
+        transaction.on_commit(DeliveryTiers.clear)
+
+        # Venues built for a shorter radius are checked directly until this catches them up
+        rebuild_delivery_coverage.delay_on_commit()
+
         return delivery_distances
 
     def delivery_distances_range_validation(self, delivery_distances):
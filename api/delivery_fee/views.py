@@ -6,9 +6,9 @@ from rest_framework.response import Response
 from django.db.models import Q
 
 from ..venue.models import Venue
-from ..delivery_distance.models import DeliveryDistance
+from ..delivery_coverage.models import DeliveryCoverage
 
-from ..utils import QueryParams, Point, Distance
+from ..utils import QueryParams, Point, Distance, DeliveryTiers
 
 from ..utils.Views import SmartAPIView
 
@@ -29,20 +29,59 @@ class Detail(SmartAPIView):
         if not venue:
             return self.respond_with("Please check id", status_code=status.HTTP_400_BAD_REQUEST)
 
-        distance = Distance.between(venue.address.point, point, True)
+        delivery_distance = DeliveryCoverage.delivery_distance_for(venue, point)
 
-        fee = None
-        try:
-            fee = DeliveryDistance.get_by_distance(distance).fee
-        except Exception as e:
+        if not delivery_distance:
             return self.respond_with("Venue cannot deliver to this location", status_code=status.HTTP_400_BAD_REQUEST)
 
         data = {
-            "fee": fee
+            "fee": delivery_distance.fee
         }
 
         return Response(data, status=status.HTTP_200_OK)
 
 
+class List(SmartAPIView):
 
+    # Most venues that can be quoted in one request
+    max_venue_count = 100
 
+    def get(self, request):
+        if not self.is_customer_request() and not self.is_anonymous_request():
+            return self.get_permission_denied_response(request, "GET")
+
+        point = Point.get(request)
+
+        if not point:
+            return self.respond_with("'latitude' and 'longitude' are required", status_code=status.HTTP_400_BAD_REQUEST)
+
+        venue_ids = QueryParams.get_int_list(request, "venue_ids", [], raise_exception=True)
+
+        if len(venue_ids) == 0:
+            return self.respond_with("'venue_ids' is required", status_code=status.HTTP_400_BAD_REQUEST)
+
+        if len(venue_ids) > self.max_venue_count:
+            return self.respond_with(f"You can only quote up to {self.max_venue_count} venues at once",
+                                     status_code=status.HTTP_400_BAD_REQUEST)
+
+        venue_points = dict(Venue.objects.filter(id__in=venue_ids).values_list("id", "address__point"))
+
+        snapshot = DeliveryTiers.table()
+
+        results = []
+
+        for venue_id in dict.fromkeys(venue_ids):
+            if venue_id not in venue_points:
+                continue
+
+            distance = Distance.between(venue_points[venue_id], point, True)
+            delivery_distance = DeliveryTiers.find(distance, snapshot)
+
+            results.append({
+                "venue": venue_id,
+                "distance": distance * 1000,
+                "fee": delivery_distance.fee if delivery_distance else None,
+                "deliverable": delivery_distance is not None
+            })
+
+        return Response({"results": results}, status=status.HTTP_200_OK)
@@ -25,52 +25,148 @@ class DeliveryRequest(SmartModel):
 
     rejected_at = models.DateTimeField(null=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["order", "driver"], name="api_deliveryrequest_order_driver_uniq")
+        ]
+
     def __str__(self):
         """Return a human readable representation of the model instance."""
         return f"DeliveryRequest: id: {self.id}, driver: {self.driver}"
 
+    def accept(self, driver, driver_location=None):
+        """
+        Claims the order for driver with one conditional UPDATE, so when several drivers accept at the same time
+        exactly one of them updates the row. Returns False if the order was already claimed, isn't looking for
+        drivers anymore or the driver has an ongoing delivery.
+        """
+        from django.db.models import Exists, F
+        from ..order.models import Order
+        from ..driver.models import Driver
+        from ..timing_sketch.models import TimingSketch
+        from ..utils import DateUtils
+
+        now = DateUtils.now()
+
+        ongoing_deliveries = Order.objects.filter(driver_id=driver.user_id,
+                                                  delivery_status__in=[Constants.DELIVERY_STATUS_PENDING,
+                                                                       Constants.DELIVERY_STATUS_OUT_FOR_DELIVERY,
+                                                                       Constants.DELIVERY_STATUS_FAILED])
+
+        claimed = Order.objects.filter(~Exists(ongoing_deliveries),
+                                       id=self.order_id,
+                                       driver__isnull=True,
+                                       status=Constants.ORDER_STATUS_LOOKING_FOR_DRIVER)\
+            .update(driver_id=driver.user_id, status=Constants.ORDER_STATUS_ACCEPTED, accepted_at=now, updated_at=now)
+
+        if not claimed:
+            return False
+
+        # The order row is locked by this transaction from here on, nobody else can accept it
+
+        self.status = Constants.DELIVERY_REQUEST_STATUS_ACCEPTED
+        self.accepted_at = now
+        update_fields = ["status", "accepted_at", "updated_at"]
+
+        if driver_location:
+            self.driver_location = driver_location
+            update_fields.append("driver_location")
+
+        self.save(update_fields=update_fields)
+
+        DeliveryRequest.objects.filter(order_id=self.order_id, status=Constants.DELIVERY_REQUEST_STATUS_PENDING)\
+            .update(status=Constants.DELIVERY_REQUEST_STATUS_MISSED, updated_at=now)
+
+        accept_time = DateUtils.minutes_between(self.created_at, now)
+
+        Driver.objects.filter(user_id=driver.user_id).update(total_accept_time=F("total_accept_time") + accept_time,
+                                                             order_count=F("order_count") + 1,
+                                                             current_delivery_request=self,
+                                                             updated_at=now)
+
+        TimingSketch.add([(Constants.TIMING_SKETCH_TYPE_ACCEPT_TIME, None, driver.user_id,
+                           (now - self.created_at).total_seconds())])
+
+        order = self.order
+        order.driver = driver
+        order.status = Constants.ORDER_STATUS_ACCEPTED
+        order.accepted_at = now
+
+        return True
+
     # Called by the celery scheduled task create_delivery_requests
     @staticmethod
     def create_for(order, max_distance):
-        from ..utils import Nearby, Exception
-        from ..driver.models import Driver
-        from django.db.models import Q
+        from ..utils import Exception
         from rest_framework import status
 
         if order.status != Constants.ORDER_STATUS_LOOKING_FOR_DRIVER:
             raise Exception.raiseError(f"This order: {order.id} isn't looking for drivers", status_code=status.HTTP_400_BAD_REQUEST)
 
-        queryset = Driver.objects.filter(current_delivery_request__isnull=True)
+        return DeliveryRequest.create_for_orders([(order, max_distance)])
+
+    # Called by the celery periodic task dispatch_delivery_requests with every order due a new wave
+    @staticmethod
+    def create_for_orders(orders_with_max_distances, wave_size=None):
+        """
+        Sends every one of orders a wave of delivery requests, to the wave_size closest free drivers within its max
+        distance that weren't asked yet.
+        """
+        from ..utils import Api, DriverIndex, DriverLocationBuffer
+        from ..driver.models import Driver
+        from django.contrib.gis.geos import Point
+
+        # Nearby drivers are answered from the in-memory grid, the database is only asked which of them are
+        # still free and haven't been sent these orders yet
+        DriverIndex.sync()
+
+        nearby_driver_ids_by_order = {}
+
+        for order, max_distance in orders_with_max_distances:
+            venue_point = Point(order.data["venue_address"]["longitude"], order.data["venue_address"]["latitude"])
+            nearby_driver_ids_by_order[order.id] = DriverIndex.nearby(venue_point, max_distance)
 
-        queryset = queryset.exclude(delivery_requests__order=order).distinct()
-        # Log.create(f"Available drivers for order {order.id}: {queryset}")
+        nearby_driver_ids = set().union(*nearby_driver_ids_by_order.values())
 
-        nearby_drivers = Nearby.drivers(queryset, order, max_distance=max_distance).distinct()
-        Log.create(f"Nearby drivers for order {order.id}: {nearby_drivers}")
+        if not nearby_driver_ids:
+            logger.info(f"No nearby drivers found for orders {list(nearby_driver_ids_by_order.keys())}")
+            return []
+
+        free_drivers = Driver.objects.filter(user_id__in=nearby_driver_ids, current_delivery_request__isnull=True)\
+            .only("user_id", "last_known_location", "last_known_location_updated_at")
+
+        free_drivers = {driver.user_id: driver for driver in map(DriverLocationBuffer.apply, free_drivers)
+                        if driver.last_known_location is not None}
+
+        already_requested = set(DeliveryRequest.objects.filter(order_id__in=nearby_driver_ids_by_order.keys(),
+                                                               driver_id__in=free_drivers.keys())
+                                .values_list("order_id", "driver_id"))
 
         delivery_requests = []
 
-        if nearby_drivers:
-            for driver in nearby_drivers:
-                # Make sure the driver does not have an existing delivery request already
-                existing_request = DeliveryRequest.objects.filter(
-                    driver=driver,
-                    order=order,
-                    status=Constants.DELIVERY_REQUEST_STATUS_PENDING
-                ).exists()
-                if not existing_request:
-                    delivery_requests.append(DeliveryRequest(
-                        driver=driver,
-                        order=order,
-                        status=Constants.DELIVERY_REQUEST_STATUS_PENDING,
-                        driver_location=driver.last_known_location
-                    ))
-
-            delivery_requests = DeliveryRequest.objects.bulk_create(delivery_requests)
-            logger.info(f"Created delivery requests for order {order.id}: {delivery_requests}")
-        else:
-            logger.info(f"No nearby drivers found for order {order.id}")
-        
-        return delivery_requests
+        if wave_size is None:
+            wave_size = Api.DISPATCH_WAVE_SIZE
 
+        for order, max_distance in orders_with_max_distances:
+            # The index returns drivers closest first
+            driver_ids = [driver_id for driver_id in nearby_driver_ids_by_order[order.id]
+                          if driver_id in free_drivers and (order.id, driver_id) not in already_requested]
+            driver_ids = sorted(driver_ids[:wave_size])
+            Log.create(f"Nearby drivers for order {order.id}: {driver_ids}")
 
+            for driver_id in driver_ids:
+                delivery_requests.append(DeliveryRequest(driver=free_drivers[driver_id],
+                                                         order=order,
+                                                         status=Constants.DELIVERY_REQUEST_STATUS_PENDING,
+                                                         driver_location=free_drivers[driver_id].last_known_location))
+
+        if not delivery_requests:
+            logger.info(f"No new nearby drivers found for orders {list(nearby_driver_ids_by_order.keys())}")
+            return []
+
+        # Callers hold DISPATCH_LOCK_KEY, the unique (order, driver) constraint is the last guard against a driver
+        # getting the same order twice
+        delivery_requests = DeliveryRequest.objects.bulk_create(delivery_requests, ignore_conflicts=True)
+        logger.info(f"Created delivery requests: {[(delivery_request.order_id, delivery_request.driver_id) for delivery_request in delivery_requests]}")
+
+        return delivery_requests
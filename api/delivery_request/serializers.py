@@ -6,7 +6,7 @@ from ..order.serializers import OrderDriverListSerializer, OrderDriverDetailSeri
 
 from ..utils import Constants, DateUtils
 
-from ..tasks import set_delivery_requests_as_missed
+from ..tasks import send_notification
 
 
 class DeliveryRequestEditSerializer(EditModelSerializer):
@@ -19,40 +19,42 @@ class DeliveryRequestEditSerializer(EditModelSerializer):
         return self.validate_enum_field("status", status, [Constants.DELIVERY_REQUEST_STATUS_ACCEPTED, Constants.DELIVERY_REQUEST_STATUS_REJECTED])
 
     def validate(self, attrs):
-        driver = attrs["driver"]
-        order = self.instance.order
         status = attrs["status"]
 
-        accepted = status == Constants.DELIVERY_REQUEST_STATUS_ACCEPTED
-
         if self.instance.status != Constants.DELIVERY_REQUEST_STATUS_PENDING:
             self.raise_validation_error("DeliveryRequest", f"You can only accept or reject pending delivery requests")
 
-        if accepted and driver.has_ongoing_delivery():
-            self.raise_validation_error("DeliveryRequest", "You can't accept another delivery before finishing up with current order")
-
-        if accepted and order.driver is not None:
-            self.raise_validation_error("DeliveryRequest", "This request was already accepted by a different driver")
-
-        if accepted and order.status != Constants.ORDER_STATUS_LOOKING_FOR_DRIVER:
-            self.raise_validation_error("DeliveryRequest", "This order is not looking for drivers")
-
-        if accepted:
-            attrs["accepted_at"] = DateUtils.now()
-        else:
+        # Whether an accept wins is only known when the order is claimed, see update
+        if status == Constants.DELIVERY_REQUEST_STATUS_REJECTED:
             attrs["rejected_at"] = DateUtils.now()
 
         return attrs
 
     def update(self, instance, validated_data):
-        delivery_request = super(DeliveryRequestEditSerializer, self).update(instance, validated_data)
+        if validated_data["status"] != Constants.DELIVERY_REQUEST_STATUS_ACCEPTED:
+            return super(DeliveryRequestEditSerializer, self).update(instance, validated_data)
+
+        driver = validated_data["driver"]
+
+        if not instance.accept(driver, validated_data.get("driver_location")):
+            self.raise_validation_error("DeliveryRequest", self.get_accept_failure_reason(instance, driver))
+
+        send_notification.delay_on_commit("send_order_for_customer", instance.order_id, Constants.ORDER_STATUS_ACCEPTED)
+
+        return instance
+
+    def get_accept_failure_reason(self, instance, driver):
+        from ..order.models import Order
+
+        if driver.has_ongoing_delivery():
+            return "You can't accept another delivery before finishing up with current order"
+
+        order = Order.objects.only("driver_id", "status").get(id=instance.order_id)
 
-        # If accepted then update the order and other deliveryrequests, if rejected just return
-        if delivery_request.status == Constants.DELIVERY_REQUEST_STATUS_ACCEPTED:
-            delivery_request.order.accepted(delivery_request)
-            set_delivery_requests_as_missed.delay_on_commit(delivery_request.order.id)
+        if order.driver_id is not None:
+            return "This request was already accepted by a different driver"
 
-        return delivery_request
+        return "This order is not looking for drivers"
 
 
 class DeliveryRequestListSerializer(ListModelSerializer):
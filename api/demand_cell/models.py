@@ -0,0 +1,127 @@
+import pytz
+
+from django.db import connection, models
+
+from ..utils import Geohash
+
+
+class DemandCell(models.Model):
+    """
+    Counts orders placed to a geohash cell per hour of the week, and how many of them no driver was found for, so
+    the demand heatmap is read from these counters instead of from the customer address of every order.
+    """
+
+    # Same cells as DeliveryCoverage
+    PRECISION = 6
+
+    # Hours of the week are in Dublin time, 0 is monday 00:00 to 01:00
+    TIMEZONE = pytz.timezone("Europe/Dublin")
+
+    COUNTERS = ["order_count", "no_driver_found_order_count"]
+
+    id = models.BigAutoField(primary_key=True)
+
+    geohash = models.CharField(max_length=12)
+
+    hour_of_week = models.PositiveSmallIntegerField()
+
+    order_count = models.PositiveIntegerField(default=0)
+
+    no_driver_found_order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["geohash", "hour_of_week"], name="api_demandcell_geohash_hour_uniq")
+        ]
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "DemandCell {}: {}".format(self.geohash, self.hour_of_week)
+
+    @staticmethod
+    def hour_of_week_for(datetime):
+        datetime = datetime.astimezone(DemandCell.TIMEZONE)
+        return datetime.weekday() * 24 + datetime.hour
+
+    @staticmethod
+    def geohash_for(order):
+        # Redacted orders don't have an address anymore
+        address = order.data.get("customer_address")
+
+        if not isinstance(address, dict) or address.get("latitude") is None or address.get("longitude") is None:
+            return None
+
+        return Geohash.encode(float(address["latitude"]), float(address["longitude"]), DemandCell.PRECISION)
+
+    @staticmethod
+    def add(orders, counter):
+        """
+        Adds 1 to counter for every one of orders, in the cell of its customer address and the hour of the week it was
+        placed in, with one INSERT ... ON CONFLICT DO UPDATE.
+        """
+        if counter not in DemandCell.COUNTERS:
+            raise Exception(f"counter must be one of {DemandCell.COUNTERS}")
+
+        counts = {}
+
+        for order in orders:
+            geohash = DemandCell.geohash_for(order)
+
+            if geohash is None:
+                continue
+
+            key = (geohash, DemandCell.hour_of_week_for(order.created_at))
+            counts[key] = counts.get(key, 0) + 1
+
+        if not counts:
+            return 0
+
+        values = []
+        params = []
+
+        for (geohash, hour_of_week), count in counts.items():
+            values.append("(%s, %s::smallint, %s::integer)")
+            params.extend([geohash, hour_of_week, count])
+
+        table = DemandCell._meta.db_table
+
+        sql = f"""
+            INSERT INTO {table} (geohash, hour_of_week, {counter})
+            VALUES {", ".join(values)}
+            ON CONFLICT (geohash, hour_of_week)
+            DO UPDATE SET {counter} = {table}.{counter} + EXCLUDED.{counter}
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    @staticmethod
+    def heatmap(hours_of_week=None):
+        """
+        Returns every cell with its center and its counters summed over hours_of_week, or over the whole week when
+        it's not given, busiest first.
+        """
+        queryset = DemandCell.objects.all()
+
+        if hours_of_week is not None:
+            queryset = queryset.filter(hour_of_week__in=hours_of_week)
+
+        rows = queryset.values("geohash")\
+            .annotate(order_count=models.Sum("order_count"),
+                      no_driver_found_order_count=models.Sum("no_driver_found_order_count"))\
+            .order_by("-order_count", "geohash")
+
+        cells = []
+
+        for row in rows:
+            latitude, longitude = Geohash.decode(row["geohash"])
+            cells.append({
+                "geohash": row["geohash"],
+                "latitude": latitude,
+                "longitude": longitude,
+                "order_count": row["order_count"],
+                "no_driver_found_order_count": row["no_driver_found_order_count"]
+            })
+
+        return cells
@@ -0,0 +1,36 @@
+from __future__ import unicode_literals
+
+from .models import DemandCell
+
+from rest_framework import status
+
+from rest_framework.response import Response
+
+from ..utils.Permissions import (
+    IsAdminPermission,
+)
+
+from ..utils import QueryParams, Constants
+
+from ..utils.Views import SmartAPIView
+
+
+class List(SmartAPIView):
+    permission_classes = [IsAdminPermission, ]
+
+    def get(self, request):
+        day = QueryParams.get_enum(request, "day", Constants.DAYS_ORDERED)
+        hour = QueryParams.get_int(request, "hour")
+
+        if hour is not None and not 0 <= hour <= 23:
+            return self.respond_with("'hour' must be between 0 and 23", status_code=status.HTTP_400_BAD_REQUEST)
+
+        days = [Constants.DAYS_ORDERED.index(day)] if day else range(len(Constants.DAYS_ORDERED))
+        hours = [hour] if hour is not None else range(24)
+
+        hours_of_week = [day * 24 + hour for day in days for hour in hours] if day or hour is not None else None
+
+        # Read from the counters kept per cell and hour of the week, see DemandCell
+        data = DemandCell.heatmap(hours_of_week)
+
+        return Response(data, status=status.HTTP_200_OK)
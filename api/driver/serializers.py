@@ -11,7 +11,7 @@ from ..identification.serializers import (Identification,
 
 from ..all_time_stat.models import AllTimeStat
 
-from ..utils import Constants, DateUtils
+from ..utils import Constants, DateUtils, DriverLocationBuffer, LocationHistory
 
 from .models import Driver
 from ..setting.models import Setting
@@ -124,15 +124,11 @@ class DriverEditSerializer(EditModelSerializer):
         if "last_known_location" in validated_data:
             instance.last_known_location = validated_data["last_known_location"]
             instance.last_known_location_updated_at = DateUtils.now()
-            # Logging the driver's ID and location updates
-            logger.info(
-                f"Driver ID: {instance.user.id} - Updating last_known_location "
-                f"to Lat:{latitude} Long:{longitude} Point: {point}"
-            )
-            logger.info(
-                f"Driver ID: {instance.user.id} - last_known_location_updated_at: {instance.last_known_location_updated_at}"
-            )
-            instance.save(update_fields=["last_known_location", "last_known_location_updated_at"])
+            logger.info(f"Driver ID: {instance.user_id} - Updating last_known_location to Lat:{latitude} Long:{longitude}")
+
+            # Pings are written in batches by the buffer, dispatch picks them up with DriverIndex.sync once written
+            if DriverLocationBuffer.add(instance.user_id, instance.last_known_location, instance.last_known_location_updated_at):
+                LocationHistory.append(instance.user_id, instance.last_known_location, instance.last_known_location_updated_at)
 
         return instance
 
@@ -172,6 +168,11 @@ class DriverListSerializer(ListModelSerializer):
     def get_select_related_fields(self):
         return ["user", "identification"]
 
+    def to_representation(self, instance):
+        # Pings that haven't been flushed yet are fresher than the stored location
+        DriverLocationBuffer.apply(instance)
+        return super(DriverListSerializer, self).to_representation(instance)
+
     def get_latitude(self, instance):
         if not instance.last_known_location:
             return None
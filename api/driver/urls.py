@@ -1,8 +1,9 @@
 from django.urls import path
 
-from .views import ListCreate, Detail
+from .views import ListCreate, Detail, LocationList
 
 urlpatterns = [
     path('', ListCreate.as_view()),
-    path('/<int:id>', Detail.as_view())
+    path('/<int:id>', Detail.as_view()),
+    path('/<int:id>/locations', LocationList.as_view())
 ]
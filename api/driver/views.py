@@ -12,9 +12,13 @@ from ..utils.Permissions import (
 
 from django.db.models import Q
 
-from ..utils.Views import SmartPaginationAPIView, SmartDetailAPIView
+from ..utils.Views import SmartAPIView, SmartPaginationAPIView, SmartDetailAPIView
 
-from ..utils import Constants, Token, QueryParams
+from ..utils import Constants, Token, QueryParams, DateUtils, LocationHistory
+
+from django.http import StreamingHttpResponse
+from rest_framework import status
+import json
 
 
 class ListCreate(SmartPaginationAPIView):
@@ -81,3 +85,36 @@ class Detail(SmartDetailAPIView):
             partial=getattr(self, 'partial', True),  # Default to `partial=True` if not explicitly set
             context={'request': request}
         )
+
+
+class LocationList(SmartAPIView):
+    permission_classes = [IsAdminPermission]
+
+    # Longest window that can be replayed in one request
+    max_days = 7
+
+    def get(self, request, id):
+        starts_at = DateUtils.to_aware(QueryParams.get_datetime(request, "starts_at", raise_exception=True))
+        ends_at = DateUtils.to_aware(QueryParams.get_datetime(request, "ends_at", DateUtils.now()))
+
+        if ends_at < starts_at:
+            return self.respond_with("'ends_at' cannot be less than 'starts_at'", status_code=status.HTTP_400_BAD_REQUEST)
+
+        if (ends_at - starts_at).days >= self.max_days:
+            return self.respond_with(f"You can only replay up to {self.max_days} days at once", status_code=status.HTTP_400_BAD_REQUEST)
+
+        if not Driver.all_objects.filter(user_id=id).exists():
+            return self.respond_with("An object with this id does not exist", status_code=status.HTTP_404_NOT_FOUND)
+
+        return StreamingHttpResponse(self.stream(id, starts_at, ends_at), content_type="application/json")
+
+    def stream(self, driver_id, starts_at, ends_at):
+        yield f'{{"driver": {driver_id}, "locations": ['
+
+        separator = ""
+        for location in LocationHistory.read(driver_id, starts_at, ends_at):
+            location["recorded_at"] = location["recorded_at"].isoformat()
+            yield separator + json.dumps(location)
+            separator = ","
+
+        yield "]}"
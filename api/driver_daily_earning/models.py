@@ -0,0 +1,70 @@
+import datetime
+
+from django.db import models
+
+from ..driver.models import Driver
+from ..currency.models import Currency
+
+
+class DriverDailyEarning(models.Model):
+    """
+    What a driver was paid per day, kept up to date with their payments by the trigger of migration 0063 so a driver's
+    earnings over any range are one indexed read instead of aggregates over their payments.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+
+    driver = models.ForeignKey(Driver, related_name="daily_earnings", on_delete=models.CASCADE)
+
+    date = models.DateField()
+
+    currency = models.ForeignKey(Currency, related_name="driver_daily_earnings", on_delete=models.CASCADE)
+
+    payment_count = models.PositiveIntegerField(default=0)
+
+    earnings = models.PositiveIntegerField(default=0)
+
+    # Only tips that were paid, return payments don't include the order's tip
+    tips = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["driver", "date"], name="api_driverdailyearning_driver_date_uniq")
+        ]
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "DriverDailyEarning {}: {}".format(self.driver_id, self.date)
+
+    @staticmethod
+    def summary_for(driver, min_date, max_date):
+        """
+        Returns the driver's payment count, earnings, tips and currency from min_date (inclusive) to max_date
+        (exclusive), with a breakdown per day, from one query.
+        """
+        from ..currency.serializers import CurrencyListSerializer
+        from ..utils import TimeSeries
+
+        days = list(DriverDailyEarning.objects.filter(driver=driver, date__gte=min_date, date__lt=max_date)
+                    .select_related("currency")
+                    .order_by("date"))
+
+        rows = []
+
+        for day in days:
+            rows.append((day.date, "count", day.payment_count))
+            rows.append((day.date, "earnings", day.earnings))
+            rows.append((day.date, "tips", day.tips))
+
+        breakdown = []
+        if min_date < max_date:
+            breakdown = TimeSeries.build(rows, min_date, max_date - datetime.timedelta(days=1),
+                                         ["count", "earnings", "tips"])
+
+        return {
+            "count": sum(day.payment_count for day in days),
+            "total_earnings": sum(day.earnings for day in days) if days else None,
+            "total_tips": sum(day.tips for day in days) if days else None,
+            "currency": CurrencyListSerializer(days[0].currency).data if days else None,
+            "days": breakdown
+        }
@@ -32,17 +32,16 @@ class DriverPayment(SmartModel):
 
     @staticmethod
     def create(order, type):
-        from django.db.models import F
+        from ..driver.models import Driver
+        from ..utils import Counters
+
         payment = order.payment
         amount = payment.delivery_driver_fee
-        driver = order.driver
 
         if type == Constants.DRIVER_PAYMENT_TYPE_DELIVERY:
             amount += payment.tip
-            driver.total_earnings = F("total_earnings") + amount
-            driver.save()
-
-        driver_payment = DriverPayment.objects.create(driver=driver, order=order, currency=payment.currency,
-                                                      amount=amount, type=type)
+            Counters.add(Driver, {order.driver_id: {"total_earnings": amount}})
 
-        return driver_payment
+        # The driver's daily earnings are kept up to date by a trigger, see DriverDailyEarning
+        return DriverPayment.objects.create(driver_id=order.driver_id, order=order, currency=payment.currency,
+                                            amount=amount, type=type)
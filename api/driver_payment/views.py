@@ -2,7 +2,7 @@ from __future__ import unicode_literals
 
 from .serializers import *
 
-from django.db.models import F, Sum
+from ..driver_daily_earning.models import DriverDailyEarning
 
 from ..utils.Permissions import (
     IsAdminPermission,
@@ -39,31 +39,28 @@ class List(SmartPaginationAPIView):
             serializer_class = self.get_list_serializer(request, queryset)
             return self.paginated_response(queryset, serializer_class)
 
-        data = {
-            "count": queryset.count(),
-            "total_earnings": queryset.aggregate(total_earnings=Sum('amount'))["total_earnings"],
-            "total_tips": queryset.aggregate(total_tips=Sum("order__payment__tip"))["total_tips"],
-            "currency": CurrencyListSerializer(queryset.first().currency).data if queryset.exists() else None
-        }
+        min_date, max_date = self.get_date_range(request)
+
+        # Read from the driver's daily earnings instead of aggregating their payments
+        data = DriverDailyEarning.summary_for(self.get_driver_from_request(), min_date, max_date)
 
         return Response(data, status=status.HTTP_200_OK)
 
+    def get_date_range(self, request):
+        min_date = QueryParams.get_date(request, "min_date", DateUtils.today().date())
+        max_date = QueryParams.get_date(request, "max_date", DateUtils.next_week(min_date))
+
+        return min_date, max_date
+
     def add_filters(self, queryset, request):
         search_term = QueryParams.get_str(request, "search_term")
         type = QueryParams.get_enum(request, "type", Constants.DRIVER_PAYMENT_TYPES)
-        min_date = QueryParams.get_date(request, "min_date")
-        max_date = QueryParams.get_date(request, "max_date")
 
         if self.is_driver_request():
-            queryset = queryset.filter(driver=self.get_driver_from_request())
+            min_date, max_date = self.get_date_range(request)
 
-            if min_date is None:
-                min_date = DateUtils.today().date()
-
-            if max_date is None:
-                max_date = DateUtils.next_week(min_date)
-
-            queryset = queryset.filter(created_at__gte=min_date, created_at__lte=max_date)
+            queryset = queryset.filter(driver=self.get_driver_from_request())
+            queryset = queryset.filter(created_at__gte=min_date, created_at__lt=max_date)
 
         if self.is_admin_request() and type:
             queryset = queryset.filter(type=type)
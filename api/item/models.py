@@ -1,9 +1,13 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, models
 
 from ..image.models import Image
 from ..category.models import Category
 
+from ..utils.Fields import SearchDocumentField
 from ..utils.Models import SmartModel
+from ..utils import Search
 
 
 class Item(SmartModel):
@@ -22,6 +26,17 @@ class Item(SmartModel):
 
     sales_count = models.PositiveIntegerField(default=0)
 
+    # Built from the title, description, subcategory and category, see update_search_documents
+    search_document = SearchDocumentField(default="")
+
+    search_vector = SearchVectorField(null=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="api_item_search_vector_gin"),
+            GinIndex(fields=["search_document"], name="api_item_search_document_trgm", opclasses=["gin_trgm_ops"])
+        ]
+
     def __str__(self):
         """Return a human readable representation of the model instance."""
         return "Item: {}".format(self.id)
@@ -34,3 +49,33 @@ class Item(SmartModel):
         category = subcategory.parent
         category.item_count = Item.objects.filter(subcategory__parent_id=subcategory.parent_id).count()
         category.save()
+
+    @staticmethod
+    def update_search_documents(item_ids=None, category_id=None):
+        """
+        Rebuilds the search document and vector of the items of item_ids, or of every item in category_id when it's
+        a subcategory or in one of its subcategories when it's a category, with one UPDATE.
+        """
+        if item_ids is not None:
+            where = "item.id = ANY(%s)"
+            params = [list(item_ids)]
+        else:
+            where = "(subcategory.id = %s OR subcategory.parent_id = %s)"
+            params = [category_id, category_id]
+
+        # Titles weigh more than categories, which weigh more than descriptions
+        sql = f"""
+            UPDATE {Item._meta.db_table} AS item
+            SET search_document = lower(concat_ws(' ', item.title, subcategory.title, category.title, item.description)),
+                search_vector = setweight(to_tsvector('{Search.CONFIG}', item.title), 'A') ||
+                                setweight(to_tsvector('{Search.CONFIG}', concat_ws(' ', subcategory.title,
+                                                                                    category.title)), 'B') ||
+                                setweight(to_tsvector('{Search.CONFIG}', coalesce(item.description, '')), 'C')
+            FROM {Category._meta.db_table} AS subcategory
+            LEFT JOIN {Category._meta.db_table} AS category ON category.id = subcategory.parent_id
+            WHERE subcategory.id = item.subcategory_id AND {where}
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
@@ -4,6 +4,8 @@ from ..image.serializers import ImageDetailSerializer
 
 from ..category.serializers import CategoryListSerializer, CategoryOrderDetailSerializer
 
+from ..currency.serializers import Currency, CurrencyDetailSerializer
+
 from .models import Item
 
 
@@ -11,7 +13,7 @@ class ItemCreateSerializer(CreateModelSerializer):
 
     class Meta:
         model = Item
-        exclude = ["sales_count"]
+        exclude = ["sales_count", "search_document", "search_vector"]
 
     def validate_subcategory(self, subcategory):
         if subcategory.parent is None:
@@ -25,6 +27,9 @@ class ItemCreateSerializer(CreateModelSerializer):
 
         Item.update_item_count_for(item.subcategory)
 
+        if created:
+            Item.update_search_documents(item_ids=[item.id])
+
         return item
 
 
@@ -32,7 +37,7 @@ class ItemEditSerializer(EditModelSerializer):
 
     class Meta:
         model = Item
-        exclude = ["sales_count", ]
+        exclude = ["sales_count", "search_document", "search_vector"]
 
     def validate_subcategory(self, subcategory):
         if subcategory.parent is None:
@@ -48,6 +53,8 @@ class ItemEditSerializer(EditModelSerializer):
         return attrs
 
     def update(self, instance, validated_data):
+        from ..menu.models import Menu
+
         subcategory_old = instance.subcategory
         item = super(ItemEditSerializer, self).update(instance, validated_data)
 
@@ -55,6 +62,11 @@ class ItemEditSerializer(EditModelSerializer):
             Item.update_item_count_for(subcategory_old)
             Item.update_item_count_for(item.subcategory)
 
+        if {"title", "description", "subcategory"} & validated_data.keys():
+            Item.update_search_documents(item_ids=[item.id])
+
+        Menu.invalidate(Menu.objects.filter(items__item=item))
+
         return item
 
 
@@ -65,7 +77,7 @@ class ItemListSerializer(ListModelSerializer):
 
     class Meta:
         model = Item
-        exclude = ["sales_count"]
+        exclude = ["sales_count", "search_document", "search_vector"]
 
     def get_select_related_fields(self):
         return ["image", "subcategory"]
@@ -75,10 +87,28 @@ class ItemListSerializer(ListModelSerializer):
         if not menu_item_id:
             return None
 
+        # Annotated from the item's ItemOffer, except for open now lists and partial offers
+        price = getattr(instance, "menu_item_price", None)
+
+        if price is not None:
+            return {
+                "price": price,
+                "currency": self.get_currency(instance.menu_item_currency_id)
+            }
+
         from ..menu_item.serializers import MenuItemLowestPriceSerializer, MenuItem
         menu_item = MenuItem.objects.filter(id=instance.menu_item_id).first()
         return MenuItemLowestPriceSerializer(menu_item).data
 
+    def get_currency(self, currency_id):
+        # There are only a few currencies, each one is loaded once per page
+        currencies = self.context.setdefault("currencies", {})
+
+        if currency_id not in currencies:
+            currencies[currency_id] = CurrencyDetailSerializer(Currency.objects.get(id=currency_id)).data
+
+        return currencies[currency_id]
+
 
 class ItemMenuListSerializer(ListModelSerializer):
     image = ImageDetailSerializer()
@@ -97,7 +127,8 @@ class ItemAdminListSerializer(ListModelSerializer):
 
     class Meta(ListModelSerializer):
         model = Item
-        fields = "__all__"
+        # The search columns are derived, see Item.update_search_documents
+        exclude = ["search_document", "search_vector"]
 
     def get_select_related_fields(self):
         return ["image", ]
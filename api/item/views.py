@@ -1,7 +1,6 @@
 from __future__ import unicode_literals
 
 from django.db import transaction
-from django.db.models import Q
 
 from rest_framework import status
 
@@ -22,7 +21,7 @@ from rest_framework.response import Response
 
 from ..utils.Views import SmartPaginationAPIView, SmartDetailAPIView, SmartAPIView, CustomPagination
 
-from ..utils import QueryParams, Constants, Point, Nearby, DateUtils
+from ..utils import QueryParams, Constants, Point, Nearby, Search, OpeningSchedule
 
 from ..tasks import import_items_via_csv
 
@@ -54,10 +53,7 @@ class ListCreate(SmartPaginationAPIView):
         has_menu_item = QueryParams.get_bool(request, "has_menu_item")
 
         if search_term:
-            queryset = queryset.filter(Q(title__icontains=search_term) |
-                                       Q(description__icontains=search_term) |
-                                       Q(subcategory__title__icontains=search_term) |
-                                       Q(subcategory__parent__title__icontains=search_term))
+            queryset = Search.filter(queryset, search_term)
 
         subcategory = Category.objects.filter(id=category_id, parent__isnull=False).first()
 
@@ -74,30 +70,44 @@ class ListCreate(SmartPaginationAPIView):
         if point and not (self.is_company_member_request() or self.is_admin_request()):
             queryset = Nearby.items(queryset, point)
 
+        if open_now:
+            queryset = OpeningSchedule.filter(queryset, "menu_items__menu__venue__")
+
         if order == "most_popular":
             self.paginator.ordering = "-sales_count"
             queryset = queryset.distinct("id", "sales_count")
+        elif search_term:
+            # DISTINCT ON can't be ordered by relevance, the rows repeated by the joins above are collapsed by
+            # selecting the items by id instead
+            queryset = Search.rank(Item.all_objects.filter(id__in=queryset.values("id")), search_term)
+            self.paginator.ordering = ["-search_rank", "id"]
         else:
             self.paginator.ordering = "id"
             queryset = queryset.distinct("id")
 
-        if open_now:
-            day = DateUtils.weekday()
-            time = DateUtils.time(DateUtils.now(True))
-            queryset = queryset.filter(menu_items__menu__venue__opening_hours__day__iexact=day,
-                                       menu_items__menu__venue__opening_hours__starts_at__lte=time,
-                                       menu_items__menu__venue__opening_hours__ends_at__gt=time,
-                                       menu_items__menu__venue__opening_hours__deleted_at__isnull=True)
-
         if not (self.is_company_member_request() or self.is_admin_request()):
-            from django.db.models import OuterRef, Subquery
+            from django.db.models import Case, F, FilteredRelation, IntegerField, OuterRef, Q, Subquery, When
             from ..menu_item.models import MenuItem
+            from ..item_offer.models import ItemOffer
 
             subquery = MenuItem.objects.filter(item_id=OuterRef("id"))
             subquery = subquery.order_by("price_sale", "price")
             subquery = MenuItem.add_customer_filters(subquery, point, open_now)
 
-            queryset = queryset.annotate(menu_item_id=Subquery(subquery.values("id")[:1]))
+            if open_now:
+                # Venues open and close with the clock, so the cheapest open one is looked up per item
+                queryset = queryset.annotate(menu_item_id=Subquery(subquery.values("id")[:1]))
+            else:
+                geohash = ItemOffer.geohash_for(point)
+
+                # Partial offers depend on where in the cell the customer is, so they're looked up per item as well
+                queryset = queryset.annotate(offer=FilteredRelation("offers", condition=Q(offers__geohash=geohash)))
+                queryset = queryset.annotate(menu_item_id=Case(When(offer__partial=True,
+                                                                    then=Subquery(subquery.values("id")[:1])),
+                                                               default=F("offer__menu_item_id"),
+                                                               output_field=IntegerField()),
+                                             menu_item_price=Case(When(offer__partial=False, then=F("offer__price"))),
+                                             menu_item_currency_id=F("offer__currency_id"))
 
             if has_menu_item:
                 queryset = queryset.exclude(menu_item_id__isnull=True)
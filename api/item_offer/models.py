@@ -0,0 +1,118 @@
+from django.db import connection, models, transaction
+
+from ..item.models import Item
+from ..menu_item.models import MenuItem
+from ..currency.models import Currency
+
+from ..utils import DeliveryTiers, Geohash
+
+
+class ItemOffer(models.Model):
+    """
+    The cheapest menu item customers can order of an item in a DeliveryCoverage cell, so the item list joins one row
+    per item instead of looking for it among the menu items of every venue. The row with an empty geohash is the
+    cheapest one anywhere, for customers that didn't give a location.
+    """
+
+    ANYWHERE = ""
+
+    id = models.BigAutoField(primary_key=True)
+
+    geohash = models.CharField(max_length=12)
+
+    item = models.ForeignKey(Item, related_name="offers", on_delete=models.CASCADE)
+
+    menu_item = models.ForeignKey(MenuItem, related_name="offers", on_delete=models.CASCADE)
+
+    currency = models.ForeignKey(Currency, related_name="offers", on_delete=models.CASCADE)
+
+    # Lowest of the menu item's price and sale price
+    price = models.PositiveIntegerField()
+
+    # The venue only delivers to part of the cell, so the item list looks the menu item up for the customer's point
+    partial = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["geohash", "item"], name="api_itemoffer_geohash_item_uniq")
+        ]
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "ItemOffer {}: {}".format(self.geohash, self.item_id)
+
+    @staticmethod
+    def geohash_for(point):
+        """
+        Returns the cell the offers of point are stored for, ANYWHERE when there's no point or no delivery distances.
+        """
+        from ..delivery_coverage.models import DeliveryCoverage
+
+        if not point or not DeliveryTiers.get():
+            return ItemOffer.ANYWHERE
+
+        return Geohash.encode(point.coords[1], point.coords[0], DeliveryCoverage.PRECISION)
+
+    @staticmethod
+    @transaction.atomic
+    def refresh(item_ids=None, venue_ids=None):
+        """
+        Rebuilds the offers of item_ids, of the items on the menus of venue_ids, or of every item when neither is given,
+        with one DELETE and one INSERT ... SELECT DISTINCT ON, once no other refresh of the same items is running. A
+        venue offers its menu items in every cell it delivers to any part of. An offer from a venue that only delivers
+        to part of its cell is marked partial and the item list resolves it against the customer's point instead, so
+        an offer is never from a venue that doesn't deliver to the customer.
+        """
+        from ..delivery_coverage.models import DeliveryCoverage
+
+        items = Item.all_objects.all()
+
+        if item_ids is not None:
+            items = items.filter(id__in=item_ids)
+
+        if venue_ids is not None:
+            items = items.filter(id__in=MenuItem.all_objects.filter(menu_id__in=venue_ids).values("item_id"))
+
+        # Refreshes of the same items wait for each other, otherwise one's INSERT hits the offers another inserted
+        # after its DELETE ran. Row locks rather than advisory ones, which a full refresh would take thousands of,
+        # and no key locks so menu items can still be added for the items meanwhile
+        list(items.order_by("id").select_for_update(no_key=True).values_list("id", flat=True))
+
+        ItemOffer.objects.filter(item_id__in=items.values("id")).delete()
+
+        live_menu_items = MenuItem.add_customer_filters(MenuItem.objects.filter(item_id__in=items.values("id")))
+        live_sql, live_params = live_menu_items.values("id").query.sql_with_params()
+
+        tiers = DeliveryTiers.get()
+        radius = float(tiers[-1].ends) if tiers else -1
+
+        table = ItemOffer._meta.db_table
+        menu_item_table = MenuItem._meta.db_table
+        coverage_table = DeliveryCoverage._meta.db_table
+
+        # Cells a venue only delivers to part of are offered too, the cheapest offer of a cell is only partial when
+        # it's from such a venue, any that delivers to the whole cell and is cheaper wins over it
+        sql = f"""
+            INSERT INTO {table} (geohash, item_id, menu_item_id, currency_id, price, partial)
+            SELECT DISTINCT ON (offer.geohash, offer.item_id)
+                   offer.geohash, offer.item_id, offer.menu_item_id, offer.currency_id, offer.price, offer.partial
+            FROM (
+                SELECT coverage.geohash, menu_item.item_id, menu_item.id AS menu_item_id, menu_item.currency_id,
+                       LEAST(menu_item.price, COALESCE(menu_item.price_sale, menu_item.price)) AS price,
+                       coverage.max_distance > %s AS partial
+                FROM {menu_item_table} AS menu_item
+                JOIN {coverage_table} AS coverage
+                  ON coverage.venue_id = menu_item.menu_id AND coverage.min_distance <= %s
+                WHERE menu_item.id IN ({live_sql})
+                UNION ALL
+                SELECT %s, menu_item.item_id, menu_item.id, menu_item.currency_id,
+                       LEAST(menu_item.price, COALESCE(menu_item.price_sale, menu_item.price)), false
+                FROM {menu_item_table} AS menu_item
+                WHERE menu_item.id IN ({live_sql})
+            ) AS offer
+            ORDER BY offer.geohash, offer.item_id, offer.price, offer.menu_item_id
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [radius, radius, *live_params, ItemOffer.ANYWHERE, *live_params])
+            return cursor.rowcount
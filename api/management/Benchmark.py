@@ -0,0 +1,81 @@
+import random
+from contextlib import contextmanager
+
+from django.contrib.gis.geos import Point
+from django.db import transaction
+
+# Helpers shared by the benchmark and simulation commands
+
+# Dublin, seeded addresses are spread around it
+CENTER = (-6.26, 53.35)
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """
+    Runs the block in a transaction that is rolled back at the end, so nothing it seeds is kept.
+    """
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback()
+    except Rollback:
+        pass
+
+
+def random_point(spread_in_degrees, center=CENTER):
+    return Point(center[0] + random.uniform(-spread_in_degrees, spread_in_degrees),
+                 center[1] + random.uniform(-spread_in_degrees, spread_in_degrees),
+                 srid=4326)
+
+
+def seed_company(name, slug=None):
+    """
+    Returns a new currency and a company called name, slug has to be unique when the seeded data is committed.
+    """
+    from ..company.models import Company
+    from ..currency.models import Currency
+
+    slug = slug or name.lower()
+
+    currency = Currency.objects.create(name="Euro", symbol="€", code="EUR", iso_code="eur")
+    company = Company.objects.create(title=name, slug=f"{slug}-company", eircode=slug, vat_no=slug,
+                                     liquor_license_no=slug, passcode=1234)
+
+    return currency, company
+
+
+def seed_venues(company, currency, points):
+    """
+    Returns one venue of company per point, each with its own address there.
+    """
+    from ..address.models import Address
+    from ..venue.models import Venue
+
+    addresses = Address.objects.bulk_create([
+        Address(line_1=f"{company.title} {index}", city="Dublin", country="Ireland", state="Dublin",
+                country_short="IE", point=point)
+        for index, point in enumerate(points)
+    ], batch_size=1000)
+
+    return Venue.objects.bulk_create([
+        Venue(title=f"{company.title} {index}", slug=f"{company.slug}-venue-{index}", address=address,
+              company=company, phone_country_code="353", phone_number="000000", currency=currency)
+        for index, address in enumerate(addresses)
+    ], batch_size=1000)
+
+
+def percentile(values, percentile):
+    """
+    Nearest rank percentile of values, None when there are none.
+    """
+    if not values:
+        return None
+
+    values = sorted(values)
+
+    return values[min(int(len(values) * percentile / 100), len(values) - 1)]
@@ -0,0 +1,176 @@
+import random
+import statistics
+import threading
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ...utils import Constants
+from .. import Benchmark
+
+
+class Command(BaseCommand):
+    help = "Has drivers accept delivery requests for the same order at the same time, each from its own thread and " \
+           "database connection, and checks exactly one of them wins. The seeded data is committed, because the " \
+           "threads have to see it, and deleted at the end, so it only runs with DEBUG on or --i-know-this-writes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--drivers", type=int, default=20)
+        parser.add_argument("--rounds", type=int, default=10)
+        parser.add_argument("--i-know-this-writes", action="store_true",
+                            help="Run against a database that isn't a development one")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["i_know_this_writes"]:
+            raise CommandError("This commits benchmark data to the database, run it with DEBUG on or pass "
+                               "--i-know-this-writes")
+
+        latencies = []
+        winner_counts = []
+        missed_counts = []
+
+        self.seed_shared()
+
+        # The customer notification of the winner isn't part of what's measured
+        from ...tasks import send_notification
+
+        try:
+            with mock.patch.object(send_notification, "delay_on_commit"):
+                self.run_rounds(options["rounds"], options["drivers"], latencies, winner_counts, missed_counts)
+        finally:
+            self.cleanup()
+
+        self.stdout.write(f"{options['rounds']} rounds of {options['drivers']} simultaneous accepts")
+        self.stdout.write(f"winners per round: {winner_counts}")
+        self.stdout.write(f"missed per round: {missed_counts}")
+        self.stdout.write(f"accept latency p50 {statistics.median(latencies):.1f}ms, "
+                          f"p95 {Benchmark.percentile(latencies, 95):.1f}ms, max {max(latencies):.1f}ms")
+
+        if any(count != 1 for count in winner_counts):
+            self.stderr.write("An order was accepted by more or less than one driver")
+
+    def run_rounds(self, round_count, driver_count, latencies, winner_counts, missed_counts):
+        for _ in range(round_count):
+            delivery_requests = self.seed_round(driver_count)
+            results = self.accept_at_once(delivery_requests)
+
+            latencies.extend(latency for latency, accepted in results)
+            winner_counts.append(sum(1 for latency, accepted in results if accepted))
+
+            missed_counts.append(self.delivery_requests_with_status(delivery_requests,
+                                                                    Constants.DELIVERY_REQUEST_STATUS_MISSED))
+
+    def seed_shared(self):
+        from ...customer.models import Customer
+
+        self.users = []
+
+        # Committed, so the slugs have to differ from the ones of earlier runs
+        self.currency, self.company = Benchmark.seed_company("Benchmark", f"benchmark-{int(time.time())}")
+        self.venue, = Benchmark.seed_venues(self.company, self.currency, [Benchmark.random_point(0)])
+
+        user = self.create_user(Constants.USER_ROLE_CUSTOMER)
+        self.customer = Customer.objects.create(user=user)
+
+    def seed_round(self, driver_count):
+        from ...address.serializers import AddressDetailSerializer
+        from ...delivery_request.models import DeliveryRequest
+        from ...driver.models import Driver
+        from ...order.models import Order
+        from ...payment.models import Payment
+
+        now = timezone.now()
+
+        payment = Payment.objects.create(currency=self.currency, amount=1000, total=1500, service_fee=50,
+                                         delivery_driver_fee=300, delivery_fee=450, customer=self.customer,
+                                         company=self.company, paid_at=now)
+        order = Order.objects.create(customer=self.customer, venue=self.venue, payment=payment,
+                                     status=Constants.ORDER_STATUS_LOOKING_FOR_DRIVER,
+                                     started_looking_for_drivers_at=now,
+                                     data={"venue_address": AddressDetailSerializer(self.venue.address).data},
+                                     driver_verification_number=random.randint(1000, 9999))
+
+        delivery_requests = []
+        for _ in range(driver_count):
+            driver = Driver.objects.create(user=self.create_user(Constants.USER_ROLE_DRIVER), ppsn="benchmark",
+                                           vehicle_type=Constants.VEHICLE_TYPE_SCOOTER,
+                                           last_known_location=self.venue.address.point,
+                                           last_known_location_updated_at=now)
+            delivery_requests.append(DeliveryRequest.objects.create(driver=driver, order=order,
+                                                                    status=Constants.DELIVERY_REQUEST_STATUS_PENDING,
+                                                                    driver_location=driver.last_known_location))
+
+        return delivery_requests
+
+    def create_user(self, role):
+        from ...user.models import User
+
+        index = len(self.users)
+        user = User.objects.create(role=role, first_name="Benchmark", last_name=str(index), password="benchmark",
+                                   email=f"benchmark-{int(time.time())}-{index}@clinks.ie")
+        self.users.append(user)
+        return user
+
+    def accept_at_once(self, delivery_requests):
+        barrier = threading.Barrier(len(delivery_requests))
+        results = [None] * len(delivery_requests)
+
+        def accept(index, delivery_request_id):
+            from ...delivery_request.models import DeliveryRequest
+            from ...delivery_request.serializers import DeliveryRequestEditSerializer
+
+            try:
+                delivery_request = DeliveryRequest.objects.get(id=delivery_request_id)
+                data = {
+                    "status": Constants.DELIVERY_REQUEST_STATUS_ACCEPTED,
+                    "driver": delivery_request.driver_id
+                }
+
+                barrier.wait()
+
+                started_at = time.perf_counter()
+                accepted = True
+                try:
+                    # The same path as PATCH /delivery-requests/<id>, which runs in a transaction
+                    with transaction.atomic():
+                        serializer = DeliveryRequestEditSerializer(instance=delivery_request, data=data, partial=True)
+                        serializer.is_valid(raise_exception=True)
+                        serializer.update(delivery_request, serializer.validated_data)
+                except Exception:
+                    accepted = False
+
+                results[index] = ((time.perf_counter() - started_at) * 1000, accepted)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=accept, args=(index, delivery_request.id))
+                   for index, delivery_request in enumerate(delivery_requests)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def delivery_requests_with_status(self, delivery_requests, status):
+        from ...delivery_request.models import DeliveryRequest
+
+        return DeliveryRequest.objects.filter(id__in=[delivery_request.id for delivery_request in delivery_requests],
+                                              status=status).count()
+
+    def cleanup(self):
+        from ...address.models import Address
+        from ...company.models import Company
+        from ...currency.models import Currency
+        from ...user.models import User
+
+        # Orders, payments, delivery requests and drivers go with the company and the users
+        Company.all_objects.filter(id=self.company.id).hard_delete()
+        User.objects.filter(id__in=[user.id for user in self.users]).delete()
+        Address.all_objects.filter(id=self.venue.address_id).hard_delete()
+        Currency.all_objects.filter(id=self.currency.id).hard_delete()
@@ -0,0 +1,113 @@
+import random
+import statistics
+import time
+
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.db.models.functions import Cast, Distance
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from ...utils import Nearby
+from .. import Benchmark
+
+
+class Command(BaseCommand):
+    help = "Seeds venues and menu items and compares Nearby queries through the geography cast and the indexed " \
+           "address geography column. Everything that is seeded is rolled back."
+
+    # The seeded venues are spread over roughly 60km x 60km around Dublin
+    spread_in_degrees = 0.3
+
+    def add_arguments(self, parser):
+        parser.add_argument("--venues", type=int, default=10000)
+        parser.add_argument("--menu-items", type=int, default=100000)
+        parser.add_argument("--runs", type=int, default=20)
+        parser.add_argument("--max-distance", type=float, default=5, help="kms")
+
+    def handle(self, *args, **options):
+        random.seed(0)
+
+        with Benchmark.rolled_back():
+            self.seed(options["venues"], options["menu_items"])
+            self.compare(options["runs"], options["max_distance"])
+
+    def seed(self, venue_count, menu_item_count):
+        from ...address.models import Address
+        from ...category.models import Category
+        from ...image.models import Image
+        from ...item.models import Item
+        from ...menu.models import Menu
+        from ...menu_category.models import MenuCategory
+        from ...menu_item.models import MenuItem
+
+        started_at = time.perf_counter()
+
+        currency, company = Benchmark.seed_company("Benchmark")
+        category = Category.objects.create(title="Benchmark", image=Image.objects.create(original="benchmark"))
+        subcategory = Category.objects.create(title="Benchmark", parent=category,
+                                              image=Image.objects.create(original="benchmark"))
+
+        venues = Benchmark.seed_venues(company, currency,
+                                       [Benchmark.random_point(self.spread_in_degrees) for _ in range(venue_count)])
+
+        menus = Menu.objects.bulk_create([Menu(venue=venue) for venue in venues], batch_size=1000)
+
+        menu_categories = MenuCategory.objects.bulk_create([
+            MenuCategory(menu=menu, category=category, order=0) for menu in menus
+        ], batch_size=1000)
+
+        items = [Item.objects.create(title=f"Benchmark {index}", subcategory=subcategory,
+                                     image=Image.objects.create(original="benchmark"))
+                 for index in range(50)]
+
+        MenuItem.objects.bulk_create([
+            MenuItem(item=items[index % len(items)],
+                     menu_category=menu_categories[index % len(menu_categories)],
+                     menu_id=menu_categories[index % len(menu_categories)].menu_id,
+                     currency=currency,
+                     price=random.randint(500, 5000),
+                     order=index)
+            for index in range(menu_item_count)
+        ], batch_size=5000)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Address._meta.db_table}")
+            cursor.execute(f"ANALYZE {MenuItem._meta.db_table}")
+
+        self.stdout.write(f"Seeded {venue_count} venues and {menu_item_count} menu items "
+                          f"in {time.perf_counter() - started_at:.1f}s")
+
+    def compare(self, runs, max_distance):
+        from ...menu_item.models import MenuItem
+        from ...venue.models import Venue
+
+        points = [Benchmark.random_point(self.spread_in_degrees) for _ in range(runs)]
+
+        cases = [
+            ("venues",
+             lambda point: self.cast(Venue.objects.all(), "address__point", point, max_distance),
+             lambda point: Nearby._get(Venue.objects.all(), "address__point_geography", point,
+                                       True, max_delivery_distance=max_distance)),
+            ("menu items",
+             lambda point: self.cast(MenuItem.objects.all(), "menu__venue__address__point", point, max_distance),
+             lambda point: Nearby._get(MenuItem.objects.all(), "menu__venue__address__point_geography", point,
+                                       True, max_delivery_distance=max_distance)),
+        ]
+
+        for title, cast_queryset, geography_queryset in cases:
+            for path, get_queryset in (("cast", cast_queryset), ("geography", geography_queryset)):
+                timings = []
+                for point in points:
+                    started_at = time.perf_counter()
+                    list(get_queryset(point).order_by("distance")[:20])
+                    timings.append((time.perf_counter() - started_at) * 1000)
+
+                self.stdout.write(f"\n{title} via {path}: median {statistics.median(timings):.1f}ms, "
+                                  f"p95 {Benchmark.percentile(timings, 95):.1f}ms over {runs} runs")
+                self.stdout.write(get_queryset(points[0]).order_by("distance")[:20].explain(analyze=True))
+
+    def cast(self, queryset, point_field, point, max_distance):
+        # The query Nearby used to run
+        queryset = queryset.annotate(point_geo=Cast(point_field, PointField(geography=True)))
+        queryset = queryset.filter(point_geo__distance_lte=(point, max_distance * 1000))
+        return queryset.annotate(distance=Distance("point_geo", point))
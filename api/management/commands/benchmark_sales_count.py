@@ -0,0 +1,116 @@
+import statistics
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
+from ...utils import List
+from .. import Benchmark
+
+
+class Command(BaseCommand):
+    help = "Compares the sales count propagation of orders with baskets of 1, 10 and 50 lines, one get and save per " \
+           "row against one UPDATE per table. Everything that is seeded is rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--basket-sizes", default="1,10,50")
+        parser.add_argument("--runs", type=int, default=50)
+
+    def handle(self, *args, **options):
+        basket_sizes = [int(size) for size in options["basket_sizes"].split(",")]
+
+        with Benchmark.rolled_back():
+            lines = self.seed(max(basket_sizes))
+            for basket_size in basket_sizes:
+                self.compare(lines[:basket_size], options["runs"])
+
+    def seed(self, line_count):
+        from ...category.models import Category
+        from ...image.models import Image
+        from ...item.models import Item
+        from ...menu.models import Menu
+        from ...menu_category.models import MenuCategory
+        from ...menu_item.models import MenuItem
+
+        currency, company = Benchmark.seed_company("Benchmark")
+        venue, = Benchmark.seed_venues(company, currency, [Benchmark.random_point(0)])
+        menu = Menu.objects.create(venue=venue)
+
+        # A few categories with a few subcategories each, like a real menu
+        categories = [Category.objects.create(title=f"Benchmark {index}",
+                                              image=Image.objects.create(original="benchmark"))
+                      for index in range(5)]
+        subcategories = [Category.objects.create(title=f"Benchmark {index}", parent=categories[index % len(categories)],
+                                                 image=Image.objects.create(original="benchmark"))
+                         for index in range(15)]
+
+        menu_categories = {category.id: MenuCategory.objects.create(menu=menu, category=category, order=0)
+                           for category in categories}
+
+        lines = []
+
+        for index in range(line_count):
+            subcategory = subcategories[index % len(subcategories)]
+            item = Item.objects.create(title=f"Benchmark {index}", subcategory=subcategory,
+                                       image=Image.objects.create(original="benchmark"))
+            menu_item = MenuItem.objects.create(item=item, menu_category=menu_categories[subcategory.parent_id],
+                                                menu=menu, currency=currency, price=1000, order=index)
+
+            # The shape order.data["items"] is stored in
+            lines.append({
+                "id": menu_item.id,
+                "quantity": 1,
+                "item": {
+                    "id": item.id,
+                    "subcategory": {
+                        "id": subcategory.id,
+                        "parent": {
+                            "id": subcategory.parent_id
+                        }
+                    }
+                }
+            })
+
+        return lines
+
+    def compare(self, lines, runs):
+        from ...menu_item.models import MenuItem
+
+        order = SimpleNamespace(data={"items": lines})
+
+        self.stdout.write(f"\nbasket of {len(lines)} lines")
+
+        for title, update in (("get and save", self.get_and_save), ("one update per table",
+                                                                    MenuItem.update_sales_count_for)):
+            timings = []
+
+            for _ in range(runs):
+                started_at = time.perf_counter()
+                update(order)
+                timings.append((time.perf_counter() - started_at) * 1000)
+
+            with CaptureQueriesContext(connection) as queries:
+                update(order)
+
+            self.stdout.write(f"{title}: {len(queries)} queries, median {statistics.median(timings):.2f}ms, "
+                              f"p95 {Benchmark.percentile(timings, 95):.2f}ms")
+
+    def get_and_save(self, order):
+        # What MenuItem.update_sales_count_for used to do
+        from ...category.models import Category
+        from ...item.models import Item
+        from ...menu_item.models import MenuItem
+
+        menu_items = order.data["items"]
+        items = [menu_item["item"] for menu_item in menu_items]
+        subcategories = [item["subcategory"] for item in items]
+        categories = [subcategory["parent"] for subcategory in subcategories]
+
+        for model, rows in ((MenuItem, menu_items), (Item, items), (Category, subcategories), (Category, categories)):
+            for data in List.count_occurrence(rows, "id"):
+                row = model.objects.get(id=data["item"]["id"])
+                row.sales_count = F("sales_count") + data["occurrence"]
+                row.save()
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from ...delivery_coverage.models import DeliveryCoverage
+from ...venue.models import Venue
+
+
+class Command(BaseCommand):
+    help = "Builds the delivery coverage of venues that don't reach the longest delivery distance, or of every venue " \
+           "with --all."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            Venue.objects.update(delivery_coverage_radius=None)
+
+        count = DeliveryCoverage.rebuild_stale()
+
+        self.stdout.write(f"Built delivery coverage for {count} venues")
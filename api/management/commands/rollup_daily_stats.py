@@ -0,0 +1,75 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ...daily_stat.models import DailyStat
+from ...utils import DateUtils
+
+
+class Command(BaseCommand):
+    help = "Rebuilds daily stats from orders and payments for a date range, or with --verify reports the stats that " \
+           "differ from what they should be without writing anything. The range is split in chunks of days that " \
+           "are processed in parallel. Defaults to yesterday."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-date", type=datetime.date.fromisoformat)
+        parser.add_argument("--max-date", type=datetime.date.fromisoformat)
+        parser.add_argument("--chunk-days", type=int, default=7)
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--verify", action="store_true")
+
+    def handle(self, *args, **options):
+        yesterday = DateUtils.yesterday().date()
+
+        max_date = options["max_date"] or yesterday
+        min_date = options["min_date"] or max_date
+
+        if max_date < min_date:
+            raise CommandError("'max-date' cannot be less than 'min-date'")
+
+        if max_date >= DateUtils.today().date() and not options["verify"]:
+            self.stderr.write("Today is still taking orders, its stats may be off until it's rebuilt tomorrow")
+
+        chunks = list(_chunks(min_date, max_date, options["chunk_days"]))
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            if options["verify"]:
+                differences = [difference for chunk_differences in executor.map(self.verify, chunks)
+                               for difference in chunk_differences]
+                self.report(differences)
+                return
+
+            counts = list(executor.map(self.rebuild, chunks))
+
+        self.stdout.write(f"Rebuilt {sum(counts)} daily stats from {min_date} to {max_date} in {len(chunks)} chunks")
+
+    def rebuild(self, chunk):
+        try:
+            count = DailyStat.rebuild(*chunk)
+            self.stdout.write(f"{chunk[0]} to {chunk[1]}: {count} stats")
+            return count
+        finally:
+            connection.close()
+
+    def verify(self, chunk):
+        try:
+            return DailyStat.verify(*chunk)
+        finally:
+            connection.close()
+
+    def report(self, differences):
+        for type, date, venue_id, company_id, stored, expected in differences:
+            scope = f"venue {venue_id}" if venue_id else f"company {company_id}" if company_id else "platform"
+            self.stdout.write(f"{date} {type} ({scope}): stored {stored}, expected {expected}")
+
+        self.stdout.write(f"{len(differences)} daily stats differ")
+
+
+def _chunks(min_date, max_date, chunk_days):
+    starts = min_date
+    while starts <= max_date:
+        ends = min(starts + datetime.timedelta(days=max(chunk_days, 1) - 1), max_date)
+        yield starts, ends
+        starts = ends + datetime.timedelta(days=1)
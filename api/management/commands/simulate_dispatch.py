@@ -0,0 +1,243 @@
+import datetime
+import json
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from freezegun import freeze_time
+
+from ...utils import Api, Constants, DriverIndex, DriverLocationBuffer, Push
+from .. import Benchmark
+
+
+class Command(BaseCommand):
+    help = "Runs the dispatch loop against synthetic drivers moving around a city and orders looking for drivers, " \
+           "with push notifications stubbed. Reports time to first request, queries per tick and tick duration. " \
+           "Everything that is seeded is rolled back."
+
+    # Drivers and venues are spread over roughly 20km x 20km around Dublin
+    spread_in_degrees = 0.1
+
+    # How often the dispatch_delivery_requests beat runs, see celery.py
+    tick_interval_in_seconds = 2
+
+    # How far a driver moves between two ticks at most, ~40km/h
+    driver_step_in_kms = 0.025
+
+    def add_arguments(self, parser):
+        parser.add_argument("--drivers", type=int, default=1000)
+        parser.add_argument("--orders", type=int, default=200)
+        parser.add_argument("--venues", type=int, default=50)
+        parser.add_argument("--ticks", type=int, default=60)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--baseline", default="dispatch_baseline.json",
+                            help="Report to compare against, written instead with --save-baseline")
+        parser.add_argument("--save-baseline", action="store_true")
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+
+        started_at = timezone.now()
+
+        # The index has to be loaded from inside the transaction to see the seeded drivers
+        DriverIndex.clear()
+
+        with Benchmark.rolled_back(), self.stubs():
+            with freeze_time(started_at):
+                self.seed(options["drivers"], options["venues"])
+
+            report = self.run(started_at, options["orders"], options["ticks"])
+
+        DriverIndex.clear()
+
+        self.print_report(report)
+
+        if options["save_baseline"]:
+            with open(options["baseline"], "w") as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(f"\nSaved baseline to {options['baseline']}")
+        elif os.path.exists(options["baseline"]):
+            with open(options["baseline"]) as file:
+                self.print_comparison(report, json.load(file))
+
+    def stubs(self):
+        stack = ExitStack()
+
+        stack.enter_context(mock.patch.multiple(Push,
+                                                _send_fcm=mock.Mock(return_value=(0, [])),
+                                                _send_apns=mock.Mock(return_value=(0, []))))
+
+        # Everything runs in one transaction that is rolled back, so on commit callbacks (the notifications) run
+        # straight away and pings are flushed once per tick from this thread instead of the background flusher
+        stack.enter_context(mock.patch.object(transaction, "on_commit", lambda func, using=None: func()))
+        stack.enter_context(mock.patch.object(DriverLocationBuffer, "_start_flusher", lambda: None))
+
+        # The synthetic pings are appended to a history of their own, their driver ids are rolled back and reused
+        history_directory = stack.enter_context(tempfile.TemporaryDirectory())
+        stack.enter_context(mock.patch.object(Api, "DRIVER_LOCATION_HISTORY_DIRECTORY", history_directory))
+
+        return stack
+
+    def seed(self, driver_count, venue_count):
+        from django.contrib.auth.hashers import make_password
+        from push_notifications.models import GCMDevice
+        from ...customer.models import Customer
+        from ...driver.models import Driver
+        from ...user.models import User
+
+        password = make_password("simulation")
+
+        self.currency, self.company = Benchmark.seed_company("Simulation")
+        self.venues = Benchmark.seed_venues(self.company, self.currency,
+                                            [Benchmark.random_point(self.spread_in_degrees) for _ in range(venue_count)])
+
+        customer_user = User.objects.create(role=Constants.USER_ROLE_CUSTOMER, first_name="Simulation",
+                                            last_name="Customer", email="simulation-customer@clinks.ie",
+                                            password=password)
+        self.customer = Customer.objects.create(user=customer_user)
+
+        users = User.objects.bulk_create([
+            User(role=Constants.USER_ROLE_DRIVER, first_name="Simulation", last_name=f"Driver {index}",
+                 email=f"simulation-driver-{index}@clinks.ie", password=password)
+            for index in range(driver_count)
+        ], batch_size=1000)
+
+        now = timezone.now()
+        self.drivers = Driver.objects.bulk_create([
+            Driver(user=user, ppsn="simulation", vehicle_type=Constants.VEHICLE_TYPE_SCOOTER,
+                   last_known_location=Benchmark.random_point(self.spread_in_degrees),
+                   last_known_location_updated_at=now)
+            for user in users
+        ], batch_size=1000)
+
+        # Real devices so resolving them is part of every tick, sending is stubbed
+        GCMDevice.objects.bulk_create([
+            GCMDevice(user=user, registration_id=f"simulation-{user.id}", cloud_message_type="FCM")
+            for user in users
+        ], batch_size=1000)
+
+        self.stdout.write(f"Seeded {driver_count} drivers and {venue_count} venues")
+
+    def create_orders(self, count, now):
+        from ...address.serializers import AddressDetailSerializer
+        from ...order.models import Order
+        from ...payment.models import Payment
+
+        venues = [random.choice(self.venues) for _ in range(count)]
+
+        payments = Payment.objects.bulk_create([
+            Payment(currency=self.currency, amount=1000, total=1500, service_fee=50, delivery_driver_fee=300,
+                    delivery_fee=450, customer=self.customer, company=self.company, paid_at=now)
+            for _ in venues
+        ])
+
+        return Order.objects.bulk_create([
+            Order(customer=self.customer, venue=venue, payment=payment,
+                  status=Constants.ORDER_STATUS_LOOKING_FOR_DRIVER, started_looking_for_drivers_at=now,
+                  data={"venue_address": AddressDetailSerializer(venue.address).data},
+                  driver_verification_number=random.randint(1000, 9999))
+            for venue, payment in zip(venues, payments)
+        ])
+
+    def run(self, started_at, order_count, tick_count):
+        from ...delivery_request.models import DeliveryRequest
+        from ...driver.serializers import DriverEditSerializer
+        from ...tasks import dispatch_delivery_requests
+
+        # Orders arrive evenly over the first half of the simulation
+        arrival_ticks = sorted(random.randrange(max(tick_count // 2, 1)) for _ in range(order_count))
+
+        positions = [(driver, list(driver.last_known_location.coords)) for driver in self.drivers]
+
+        arrived_at_tick = {}
+        first_request_at_tick = {}
+
+        tick_durations = []
+        dispatch_queries = []
+        flush_queries = []
+
+        for tick in range(tick_count):
+            now = started_at + datetime.timedelta(seconds=tick * self.tick_interval_in_seconds)
+
+            with freeze_time(now):
+                arriving = arrival_ticks.count(tick)
+                if arriving:
+                    for order in self.create_orders(arriving, now):
+                        arrived_at_tick[order.id] = tick
+
+                # Every driver pings its new location through the serializer of PATCH /drivers/<id>
+                with CaptureQueriesContext(connection) as queries:
+                    for driver, position in positions:
+                        self.move(position)
+                        serializer = DriverEditSerializer(instance=driver, partial=True,
+                                                          data={"latitude": position[1], "longitude": position[0]})
+                        serializer.is_valid(raise_exception=True)
+                        serializer.update(driver, serializer.validated_data)
+                    DriverLocationBuffer.flush()
+                flush_queries.append(len(queries))
+
+                # freezegun fakes time.perf_counter and time.monotonic but not clock_gettime
+                tick_started_at = time.clock_gettime(time.CLOCK_MONOTONIC)
+                with CaptureQueriesContext(connection) as queries:
+                    dispatch_delivery_requests()
+                tick_durations.append((time.clock_gettime(time.CLOCK_MONOTONIC) - tick_started_at) * 1000)
+                dispatch_queries.append(len(queries))
+
+            requested_order_ids = DeliveryRequest.objects.filter(order_id__in=arrived_at_tick.keys())\
+                .exclude(order_id__in=first_request_at_tick.keys())\
+                .values_list("order_id", flat=True).distinct()
+
+            for order_id in requested_order_ids:
+                first_request_at_tick[order_id] = tick
+
+        times_to_first_request = sorted((first_request_at_tick[order_id] - arrived_at_tick[order_id])
+                                        * self.tick_interval_in_seconds
+                                        for order_id in first_request_at_tick)
+
+        return {
+            "drivers": len(self.drivers),
+            "orders": order_count,
+            "ticks": tick_count,
+            "orders_without_request": len(arrived_at_tick) - len(first_request_at_tick),
+            "time_to_first_request_p50": Benchmark.percentile(times_to_first_request, 50),
+            "time_to_first_request_p95": Benchmark.percentile(times_to_first_request, 95),
+            "tick_duration_p50": Benchmark.percentile(tick_durations, 50),
+            "tick_duration_p95": Benchmark.percentile(tick_durations, 95),
+            "dispatch_queries_per_tick": statistics.mean(dispatch_queries) if dispatch_queries else None,
+            "location_flush_queries_per_tick": statistics.mean(flush_queries) if flush_queries else None
+        }
+
+    def move(self, position):
+        heading = random.uniform(0, 2 * math.pi)
+        step = random.uniform(0, self.driver_step_in_kms)
+
+        position[0] += step * math.cos(heading) / (111.32 * math.cos(math.radians(position[1])))
+        position[1] += step * math.sin(heading) / 111.32
+
+    def print_report(self, report):
+        self.stdout.write("")
+        for key, value in report.items():
+            self.stdout.write(f"{key}: {_format(value)}")
+
+    def print_comparison(self, report, baseline):
+        self.stdout.write("\nCompared to the baseline:")
+        for key, value in report.items():
+            before = baseline.get(key)
+            if isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+                self.stdout.write(f"{key}: {_format(before)} -> {_format(value)} "
+                                  f"({(value - before) / before * 100:+.1f}%)")
+
+
+def _format(value):
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
@@ -1,4 +1,6 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import F
 
 from ..venue.models import Venue
 
@@ -8,6 +10,49 @@ from ..utils.Models import SmartModel
 class Menu(SmartModel):
     venue = models.OneToOneField(Venue, primary_key=True, related_name="menu", on_delete=models.CASCADE)
 
+    # Moves on whenever anything the menu detail shows changes, see invalidate
+    version = models.PositiveIntegerField(default=1)
+
+    # What MenuDetailSerializer returned at snapshot_version, it's stale when that's behind version
+    snapshot = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+
+    snapshot_version = models.PositiveIntegerField(default=0)
+
     def __str__(self):
         """Return a human readable representation of the model instance."""
         return "Menu {}: ".format(self.venue.id)
+
+    @staticmethod
+    def invalidate(menus):
+        """
+        Moves every one of menus (a queryset) to a new version with one UPDATE, their snapshots are rebuilt in the
+        background once the transaction commits.
+        """
+        from ..tasks import build_menu_snapshots
+
+        venue_ids = list(menus.values_list("venue_id", flat=True).distinct())
+
+        if not venue_ids:
+            return
+
+        Menu.all_objects.filter(venue_id__in=venue_ids).update(version=F("version") + 1)
+
+        build_menu_snapshots.delay_on_commit(venue_ids)
+
+    @staticmethod
+    def build_snapshot(venue_id):
+        """
+        Serializes the menu and stores it as the snapshot of the version it was read at, unless the menu moved on
+        in the meantime. Returns (version, data).
+        """
+        from .serializers import MenuDetailSerializer
+
+        menu = Menu.all_objects.defer("snapshot").get(venue_id=venue_id)
+
+        # The version is read first, so data is never older than the version it's stored for
+        data = MenuDetailSerializer(menu).data
+
+        Menu.all_objects.filter(venue_id=venue_id, version=menu.version)\
+            .update(snapshot=data, snapshot_version=menu.version)
+
+        return menu.version, data
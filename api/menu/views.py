@@ -2,6 +2,9 @@ from __future__ import unicode_literals
 
 import time
 
+from rest_framework import status
+from rest_framework.response import Response
+
 from .serializers import *
 from ..utils.Views import SmartDetailAPIView
 
@@ -10,9 +13,37 @@ class Detail(SmartDetailAPIView):
     model = Menu
     detail_serializer = MenuDetailSerializer
 
+    def get(self, request, id):
+        if not self.has_permission(request, "GET"):
+            return self.get_permission_denied_response(request, "GET")
+
+        menu = self.queryset(request, id).defer("snapshot").first()
+
+        if not menu:
+            return self.get_instance_not_found_response(request, "GET")
+
+        # Every role gets the same menu, so one snapshot and one ETag per version serve everyone
+        etag = Detail.etag_for(menu.venue_id, menu.version)
+        if_none_match = [tag.strip().replace("W/", "", 1) for tag in request.headers.get("If-None-Match", "").split(",")]
+
+        if etag in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        if menu.snapshot_version == menu.version:
+            version = menu.version
+            data = Menu.all_objects.filter(venue_id=menu.venue_id).values_list("snapshot", flat=True).first()
+        else:
+            # Changed and not rebuilt in the background yet
+            version, data = Menu.build_snapshot(menu.venue_id)
+
+        return Response(data, status=status.HTTP_200_OK, headers={"ETag": Detail.etag_for(menu.venue_id, version)})
+
+    @staticmethod
+    def etag_for(venue_id, version):
+        return f'"{venue_id}-{version}"'
+
     def queryset(self, request, id):
         from ..company.models import Company
-        start_time = time.time()
 
         queryset = Menu.objects.filter(venue_id=id)
 
@@ -20,9 +51,6 @@ class Detail(SmartDetailAPIView):
             queryset = queryset.filter(venue__company__members__user_id=self.request.user.id)
             queryset = Company.filter_with_passcode(self, request, queryset, "venue__company__passcode")
 
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"Execution time: {execution_time} seconds")
         return queryset
 
     def has_permission(self, request, method):
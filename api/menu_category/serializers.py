@@ -1,4 +1,5 @@
 from .models import MenuCategory
+from ..menu.models import Menu
 from ..category.serializers import CategoryListSerializer
 from ..company_member.models import CompanyMember, Company
 from ..menu_item.serializers import MenuItemMenuListSerializer
@@ -42,6 +43,8 @@ class MenuCategoryCreateSerializer(CreateModelSerializer):
 
         menu_category = super(MenuCategoryCreateSerializer, self).create(validated_data)
 
+        Menu.invalidate(Menu.objects.filter(venue_id=menu_category.menu_id))
+
         return menu_category
 
 
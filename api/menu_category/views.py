@@ -43,3 +43,10 @@ class Detail(SmartDetailAPIView):
 
         return queryset
 
+    def handle_delete(self, instance):
+        response = super(Detail, self).handle_delete(instance)
+
+        Menu.invalidate(Menu.objects.filter(venue_id=instance.menu_id))
+
+        return response
+
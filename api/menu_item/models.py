@@ -49,52 +49,26 @@ class MenuItem(SmartModel):
 
     @staticmethod
     def update_sales_count_for(order):
-        from django.db.models import F
+        """
+        Adds one sale per order line to its menu item, item, subcategory and category, with one UPDATE per table.
+        """
         from ..category.models import Category
-        from ..utils import List
-        menu_items = order.data["items"]
-
-        items_to_update = []
-        categories_to_update = []
-        subcategories_to_update = []
-
-        for menu_item in menu_items:
-            item = menu_item["item"]
-            subcategory = item["subcategory"]
-            category = subcategory["parent"]
-
-            items_to_update.append(item)
-            subcategories_to_update.append(subcategory)
-            categories_to_update.append(category)
-
-        menu_items_with_occurrences = List.count_occurrence(menu_items, "id")
-        items_with_occurrences = List.count_occurrence(items_to_update, "id")
-        categories_with_occurrences = List.count_occurrence(subcategories_to_update, "id")
-        subcategories_with_occurrences = List.count_occurrence(categories_to_update, "id")
-
-        for data in menu_items_with_occurrences:
-            item = MenuItem.objects.get(id=data["item"]["id"])
-            item.sales_count = F("sales_count") + data["occurrence"]
-            item.save()
-
-        for data in items_with_occurrences:
-            item = Item.objects.get(id=data["item"]["id"])
-            item.sales_count = F("sales_count") + data["occurrence"]
-            item.save()
-
-        for data in categories_with_occurrences:
-            item = Category.objects.get(id=data["item"]["id"])
-            item.sales_count = F("sales_count") + data["occurrence"]
-            item.save()
-
-        for data in subcategories_with_occurrences:
-            item = Category.objects.get(id=data["item"]["id"])
-            item.sales_count = F("sales_count") + data["occurrence"]
-            item.save()
+        from ..utils import Counters
+
+        lines = order.data["items"]
+
+        Counters.add(MenuItem, Counters.collect((line["id"], {"sales_count": 1}) for line in lines))
+        Counters.add(Item, Counters.collect((line["item"]["id"], {"sales_count": 1}) for line in lines))
+
+        # Subcategories and categories are both rows of Category
+        Counters.add(Category, Counters.collect((category_id, {"sales_count": 1})
+                                                for line in lines
+                                                for category_id in (line["item"]["subcategory"]["id"],
+                                                                    line["item"]["subcategory"]["parent"]["id"])))
 
     @staticmethod
     def add_customer_filters(queryset, point=None, open_now=False):
-        from ..utils import DateUtils, Nearby
+        from ..utils import Nearby, OpeningSchedule
         from ..company.models import Company
 
         queryset = Company.exclude_stripe_incomplete(queryset, "menu__venue__company")
@@ -105,12 +79,7 @@ class MenuItem(SmartModel):
             queryset = Nearby.menu_items(queryset, point)
 
         if open_now:
-            day = DateUtils.weekday()
-            time = DateUtils.time(DateUtils.now(True))
-            queryset = queryset.filter(menu__venue__opening_hours__day__iexact=day,
-                                       menu__venue__opening_hours__starts_at__lte=time,
-                                       menu__venue__opening_hours__ends_at__gt=time,
-                                       menu__venue__opening_hours__deleted_at__isnull=True).distinct()
+            queryset = OpeningSchedule.filter(queryset, "menu__venue__")
 
         return queryset
 
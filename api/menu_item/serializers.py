@@ -7,6 +7,7 @@ from ..venue.serializers import VenueCustomerListSerializer, VenueCustomerDistan
 from ..company_member.models import CompanyMember, Company
 from ..utils import Constants
 from ..menu.models import Menu
+from ..item_offer.models import ItemOffer
 from .models import MenuItem
 
 
@@ -55,6 +56,7 @@ class MenuItemCreateSerializer(CreateModelSerializer):
         menu_item = super(MenuItemCreateSerializer, self).create(validated_data)
 
         MenuItem.update_menu_item_count_for(menu_item.item)
+        Menu.invalidate(Menu.objects.filter(venue_id=menu_item.menu_id))
 
         company = menu_item.menu.venue.company
         if company.has_added_menu_items is False:
@@ -69,6 +71,8 @@ class MenuItemCreateSerializer(CreateModelSerializer):
             menu.venue.currency = currency
             menu.venue.save()
 
+        ItemOffer.refresh(item_ids=[menu_item.item_id])
+
         return menu_item
 
 
@@ -94,9 +98,12 @@ class MenuItemEditSerializer(EditModelSerializer):
         return attrs
 
     def update(self, instance, validated_data):
+        item_id_old = instance.item_id
         menu_item = super(MenuItemEditSerializer, self).update(instance, validated_data)
 
         MenuItem.update_menu_item_count_for(menu_item.item)
+        Menu.invalidate(Menu.objects.filter(venue_id=menu_item.menu_id))
+        ItemOffer.refresh(item_ids={item_id_old, menu_item.item_id})
 
         return menu_item
 
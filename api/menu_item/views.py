@@ -1,7 +1,5 @@
 from __future__ import unicode_literals
 
-from django.db.models import Q
-
 from .serializers import *
 
 from ..utils.Permissions import (
@@ -11,7 +9,7 @@ from ..utils.Permissions import (
 
 from ..utils.Views import SmartPaginationAPIView, SmartDetailAPIView, CustomPagination
 
-from ..utils import QueryParams, Constants, Point, Nearby, DateUtils
+from ..utils import QueryParams, Constants, Point, Nearby, DateUtils, Search
 
 
 class ListCreate(SmartPaginationAPIView):
@@ -69,10 +67,8 @@ class ListCreate(SmartPaginationAPIView):
             queryset = queryset.filter(menu_id=menu_id)
 
         if search_term:
-            queryset = queryset.filter(Q(item__title__icontains=search_term) |
-                                       Q(item__description__icontains=search_term) |
-                                       Q(item__subcategory__title__icontains=search_term) |
-                                       Q(item__subcategory__parent__title__icontains=search_term))
+            queryset = Search.rank(Search.filter(queryset, search_term, "item__"), search_term, "item__")
+            self.pagination_class = CustomPagination(["-search_rank", "order", "created_at"])
 
         if order == "lowest_price":
             self.pagination_class = CustomPagination(["price_sale", "price", "order", "created_at"])
@@ -147,10 +143,8 @@ class ListCreateV2(SmartPaginationAPIView):
             queryset = queryset.filter(menu_id=menu_id)
 
         if search_term:
-            queryset = queryset.filter(Q(item__title__icontains=search_term) |
-                                       Q(item__description__icontains=search_term) |
-                                       Q(item__subcategory__title__icontains=search_term) |
-                                       Q(item__subcategory__parent__title__icontains=search_term))
+            queryset = Search.rank(Search.filter(queryset, search_term, "item__"), search_term, "item__")
+            self.pagination_class = CustomPagination(["-search_rank", "order", "created_at"])
 
         if order == "lowest_price":
             self.pagination_class = CustomPagination(["price_sale", "price", "order", "created_at"])
@@ -199,5 +193,7 @@ class EditDelete(SmartDetailAPIView):
         response = super(EditDelete, self).handle_delete(instance)
 
         MenuItem.update_menu_item_count_for(instance.item)
+        Menu.invalidate(Menu.objects.filter(venue_id=instance.menu_id))
+        ItemOffer.refresh(item_ids=[instance.item_id])
 
         return response
@@ -2,6 +2,11 @@ from .utils import DateUtils, Constants
 import json
 
 
+# last_seen is only written when it is older than this, so frequent requests (e.g. driver location pings)
+# don't each cost a write
+LAST_SEEN_RESOLUTION_IN_SECONDS = 60
+
+
 class LastSeen:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -9,8 +14,11 @@ class LastSeen:
     def __call__(self, request):
         user = request.user
         if not user.is_anonymous:
-            user.last_seen = DateUtils.now()
-            user.save()
+            now = DateUtils.now()
+
+            if not user.last_seen or (now - user.last_seen).total_seconds() >= LAST_SEEN_RESOLUTION_IN_SECONDS:
+                user.last_seen = now
+                user.save(update_fields=["last_seen"])
 
         response = self.get_response(request)
 
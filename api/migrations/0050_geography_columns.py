@@ -0,0 +1,39 @@
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0049_alter_deliverydistance_driver_fee'),
+    ]
+
+    operations = [
+        # spatial_index (on by default) creates a GiST index on it
+        migrations.AddField(
+            model_name='address',
+            name='point_geography',
+            field=django.contrib.gis.db.models.fields.PointField(editable=False, geography=True, null=True, srid=4326),
+        ),
+        # A trigger rather than save() so raw updates keep it in sync too
+        migrations.RunSQL(
+            sql="""
+                CREATE FUNCTION api_address_set_point_geography() RETURNS trigger AS $$
+                BEGIN
+                    NEW.point_geography := NEW.point::geography;
+                    RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER api_address_set_point_geography
+                BEFORE INSERT OR UPDATE OF point, point_geography ON api_address
+                FOR EACH ROW EXECUTE PROCEDURE api_address_set_point_geography();
+
+                UPDATE api_address SET point_geography = point::geography;
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS api_address_set_point_geography ON api_address;
+                DROP FUNCTION IF EXISTS api_address_set_point_geography();
+            """
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0050_geography_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='delivery_coverage_radius',
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.CreateModel(
+            name='DeliveryCoverage',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('geohash', models.CharField(db_index=True, max_length=12)),
+                ('min_distance', models.FloatField()),
+                ('max_distance', models.FloatField()),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='delivery_coverage', to='api.venue')),
+            ],
+        ),
+    ]
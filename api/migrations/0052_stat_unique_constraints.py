@@ -0,0 +1,53 @@
+import api.utils.Fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0051_deliverycoverage'),
+    ]
+
+    operations = [
+        # DailyStat.update used to create a new company row whenever the venue row of the day didn't exist yet,
+        # each of those rows holds part of the day's value so duplicates are summed into the oldest one.
+        migrations.RunSQL(
+            sql="""
+                UPDATE api_dailystat AS kept
+                SET value = duplicates.value
+                FROM (
+                    SELECT MIN(id) AS id, SUM(value) AS value
+                    FROM api_dailystat
+                    GROUP BY type, date, COALESCE(venue_id, 0), COALESCE(company_id, 0)
+                    HAVING COUNT(*) > 1
+                ) AS duplicates
+                WHERE kept.id = duplicates.id;
+
+                DELETE FROM api_dailystat AS duplicate
+                USING api_dailystat AS kept
+                WHERE duplicate.type = kept.type
+                  AND duplicate.date = kept.date
+                  AND COALESCE(duplicate.venue_id, 0) = COALESCE(kept.venue_id, 0)
+                  AND COALESCE(duplicate.company_id, 0) = COALESCE(kept.company_id, 0)
+                  AND duplicate.id > kept.id;
+
+                CREATE UNIQUE INDEX api_dailystat_type_date_venue_company_uniq
+                ON api_dailystat (type, date, (COALESCE(venue_id, 0)), (COALESCE(company_id, 0)));
+            """,
+            reverse_sql="DROP INDEX IF EXISTS api_dailystat_type_date_venue_company_uniq;",
+        ),
+        # AllTimeStat.update always updated the oldest row of a type (first() orders by id), the others are stale
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM api_alltimestat AS duplicate
+                USING api_alltimestat AS kept
+                WHERE duplicate.type = kept.type AND duplicate.id > kept.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='alltimestat',
+            name='type',
+            field=api.utils.Fields.EnumField(choices=[('company_count', 'company_count'), ('driver_count', 'driver_count'), ('venue_count', 'venue_count'), ('total_earnings', 'total_earnings'), ('total_company_earnings', 'total_company_earnings'), ('total_driver_earnings', 'total_driver_earnings'), ('platform_earnings', 'platform_earnings'), ('sales_count', 'sales_count'), ('delivered_order_count', 'delivered_order_count'), ('cancelled_order_count', 'cancelled_order_count'), ('rejected_order_count', 'rejected_order_count'), ('average_wait_time', 'average_wait_time'), ('customer_count', 'customer_count'), ('total_wait_time', 'total_wait_time'), ('no_driver_found_order_count', 'no_driver_found_order_count'), ('expired_order_count', 'expired_order_count')], default='company_count', unique=True),
+        ),
+    ]
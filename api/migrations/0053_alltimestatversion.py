@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0052_stat_unique_constraints'),
+    ]
+
+    operations = [
+        # One row incremented by every write to api_alltimestat, processes compare it to the version of their copy
+        # of the stats to know when to reload it, see AllTimeStatCache
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE api_alltimestatversion (
+                    id smallint PRIMARY KEY,
+                    value bigint NOT NULL
+                );
+
+                INSERT INTO api_alltimestatversion (id, value) VALUES (1, 0);
+            """,
+            reverse_sql="DROP TABLE api_alltimestatversion;",
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0053_alltimestatversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='accepted_order_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        # average_accept_time used to be (average_accept_time + accept time) / sales_count, it's now the total accept
+        # time over the orders the company's venues accepted, which are the ones that started looking for a driver
+        migrations.RunSQL(
+            sql="""
+                UPDATE api_company AS company
+                SET accepted_order_count = accepted.count,
+                    average_accept_time = company.total_accept_time / accepted.count
+                FROM (
+                    SELECT venue.company_id, COUNT(*) AS count
+                    FROM api_order AS "order"
+                    JOIN api_venue AS venue ON venue.id = "order".venue_id
+                    WHERE "order".started_looking_for_drivers_at IS NOT NULL
+                    GROUP BY venue.company_id
+                ) AS accepted
+                WHERE company.id = accepted.company_id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0054_company_accepted_order_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriverDailyEarning',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('payment_count', models.PositiveIntegerField(default=0)),
+                ('earnings', models.PositiveIntegerField(default=0)),
+                ('tips', models.PositiveIntegerField(default=0)),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='driver_daily_earnings', to='api.currency')),
+                ('driver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_earnings', to='api.driver')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='driverdailyearning',
+            constraint=models.UniqueConstraint(fields=('driver', 'date'), name='api_driverdailyearning_driver_date_uniq'),
+        ),
+        # Every payment made so far, tips only count for delivery payments as return payments don't include them
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO api_driverdailyearning (driver_id, date, currency_id, payment_count, earnings, tips)
+                SELECT driver_payment.driver_id, driver_payment.created_at::date, MIN(driver_payment.currency_id),
+                       COUNT(*), SUM(driver_payment.amount),
+                       SUM(CASE WHEN driver_payment.type = 'delivery' THEN payment.tip ELSE 0 END)
+                FROM api_driverpayment AS driver_payment
+                JOIN api_order AS "order" ON "order".id = driver_payment.order_id
+                JOIN api_payment AS payment ON payment.id = "order".payment_id
+                WHERE driver_payment.deleted_at IS NULL
+                GROUP BY driver_payment.driver_id, driver_payment.created_at::date;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,34 @@
+import api.utils.Fields
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0055_driverdailyearning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimingSketch',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('type', api.utils.Fields.EnumField(choices=[('accept_time', 'accept_time'), ('delivery_time', 'delivery_time')], default='accept_time')),
+                ('date', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('counts', django.contrib.postgres.fields.ArrayField(base_field=models.PositiveIntegerField(), size=None)),
+                ('driver', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='timing_sketches', to='api.driver')),
+                ('venue', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='timing_sketches', to='api.venue')),
+            ],
+        ),
+        # TimingSketch.add upserts on it, one of venue_id and driver_id is always null
+        migrations.RunSQL(
+            sql="""
+                CREATE UNIQUE INDEX api_timingsketch_type_date_venue_driver_uniq
+                ON api_timingsketch (type, date, (COALESCE(venue_id, 0)), (COALESCE(driver_id, 0)));
+            """,
+            reverse_sql="DROP INDEX IF EXISTS api_timingsketch_type_date_venue_driver_uniq;",
+        ),
+    ]
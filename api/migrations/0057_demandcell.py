@@ -0,0 +1,48 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0056_timingsketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DemandCell',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('geohash', models.CharField(max_length=12)),
+                ('hour_of_week', models.PositiveSmallIntegerField()),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('no_driver_found_order_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='demandcell',
+            constraint=models.UniqueConstraint(fields=('geohash', 'hour_of_week'), name='api_demandcell_geohash_hour_uniq'),
+        ),
+        # Every order placed so far, redacted orders don't have coordinates anymore and are skipped. ST_GeoHash encodes
+        # the same cells as utils.Geohash.
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO api_demandcell (geohash, hour_of_week, order_count, no_driver_found_order_count)
+                SELECT cell.geohash, cell.hour_of_week, COUNT(*),
+                       COUNT(*) FILTER (WHERE cell.rejection_reason = 'no_driver_found')
+                FROM (
+                    SELECT ST_GeoHash(ST_SetSRID(ST_MakePoint((data->'customer_address'->>'longitude')::float,
+                                                              (data->'customer_address'->>'latitude')::float), 4326),
+                                      6) AS geohash,
+                           ((EXTRACT(ISODOW FROM created_at AT TIME ZONE 'Europe/Dublin') - 1) * 24
+                            + EXTRACT(HOUR FROM created_at AT TIME ZONE 'Europe/Dublin'))::smallint AS hour_of_week,
+                           rejection_reason
+                    FROM api_order
+                    WHERE jsonb_typeof(data->'customer_address') = 'object'
+                      AND data->'customer_address'->>'latitude' IS NOT NULL
+                      AND data->'customer_address'->>'longitude' IS NOT NULL
+                ) AS cell
+                GROUP BY cell.geohash, cell.hour_of_week;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
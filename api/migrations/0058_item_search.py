@@ -0,0 +1,48 @@
+import api.utils.Fields
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0057_demandcell'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='item',
+            name='search_document',
+            field=api.utils.Fields.SearchDocumentField(default=''),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(null=True),
+        ),
+        # Same as Item.update_search_documents for every item
+        migrations.RunSQL(
+            sql="""
+                UPDATE api_item AS item
+                SET search_document = lower(concat_ws(' ', item.title, subcategory.title, category.title, item.description)),
+                    search_vector = setweight(to_tsvector('english', item.title), 'A') ||
+                                    setweight(to_tsvector('english', concat_ws(' ', subcategory.title, category.title)), 'B') ||
+                                    setweight(to_tsvector('english', coalesce(item.description, '')), 'C')
+                FROM api_category AS subcategory
+                LEFT JOIN api_category AS category ON category.id = subcategory.parent_id
+                WHERE subcategory.id = item.subcategory_id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='api_item_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_document'], name='api_item_search_document_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
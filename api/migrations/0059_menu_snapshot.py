@@ -0,0 +1,27 @@
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0058_item_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menu',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='menu',
+            name='snapshot',
+            field=models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True),
+        ),
+        migrations.AddField(
+            model_name='menu',
+            name='snapshot_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
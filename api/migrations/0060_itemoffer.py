@@ -0,0 +1,61 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0059_menu_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemOffer',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('geohash', models.CharField(max_length=12)),
+                ('price', models.PositiveIntegerField()),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='offers', to='api.currency')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='offers', to='api.item')),
+                ('menu_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='offers', to='api.menuitem')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='itemoffer',
+            constraint=models.UniqueConstraint(fields=('geohash', 'item'), name='api_itemoffer_geohash_item_uniq'),
+        ),
+        # Same offers as ItemOffer.refresh, from the menu items MenuItem.add_customer_filters keeps
+        migrations.RunSQL(
+            sql="""
+                WITH live_menu_item AS (
+                    SELECT menu_item.id, menu_item.item_id, menu_item.menu_id, menu_item.currency_id,
+                           LEAST(menu_item.price, COALESCE(menu_item.price_sale, menu_item.price)) AS price
+                    FROM api_menuitem AS menu_item
+                    JOIN api_venue AS venue ON venue.id = menu_item.menu_id
+                    JOIN api_company AS company ON company.id = venue.company_id
+                    WHERE menu_item.deleted_at IS NULL
+                      AND venue.paused = false
+                      AND company.status = 'active'
+                      AND company.stripe_account_id IS NOT NULL
+                      AND company.stripe_charges_enabled = true
+                )
+                INSERT INTO api_itemoffer (geohash, item_id, menu_item_id, currency_id, price)
+                SELECT DISTINCT ON (offer.geohash, offer.item_id)
+                       offer.geohash, offer.item_id, offer.menu_item_id, offer.currency_id, offer.price
+                FROM (
+                    SELECT coverage.geohash, live_menu_item.item_id, live_menu_item.id AS menu_item_id,
+                           live_menu_item.currency_id, live_menu_item.price
+                    FROM live_menu_item
+                    JOIN api_deliverycoverage AS coverage
+                      ON coverage.venue_id = live_menu_item.menu_id
+                     AND coverage.max_distance <= (SELECT MAX(ends) FROM api_deliverydistance)
+                    UNION ALL
+                    SELECT '', live_menu_item.item_id, live_menu_item.id, live_menu_item.currency_id,
+                           live_menu_item.price
+                    FROM live_menu_item
+                ) AS offer
+                ORDER BY offer.geohash, offer.item_id, offer.price, offer.menu_item_id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,83 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0060_itemoffer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='opening_schedule',
+            field=models.BinaryField(editable=False, null=True),
+        ),
+        # See utils.OpeningSchedule for the layout. Triggers rather than save() so opening hours written with update()
+        # and stale venue instances saved afterwards keep the schedule in sync too. Any update of opening_schedule
+        # recompiles it, so changed opening hours only have to touch their venue.
+        migrations.RunSQL(
+            sql="""
+                CREATE FUNCTION api_venue_opening_schedule(integer) RETURNS bytea AS $$
+                    WITH open_minute AS (
+                        SELECT DISTINCT
+                               (array_position(ARRAY['monday', 'tuesday', 'wednesday', 'thursday', 'friday',
+                                                     'saturday', 'sunday'], lower(opening_hour.day)) - 1) * 1440
+                               + m AS m
+                        FROM api_openinghour AS opening_hour,
+                             generate_series(CEIL(EXTRACT(EPOCH FROM opening_hour.starts_at) / 60)::integer,
+                                             CEIL(EXTRACT(EPOCH FROM opening_hour.ends_at) / 60)::integer - 1) AS m
+                        WHERE opening_hour.venue_id = $1
+                          AND opening_hour.deleted_at IS NULL
+                          AND lower(opening_hour.day) IN ('monday', 'tuesday', 'wednesday', 'thursday', 'friday',
+                                                          'saturday', 'sunday')
+                    ), filled AS (
+                        SELECT m / 8 AS b, SUM(1 << (m % 8))::integer AS bits
+                        FROM open_minute
+                        GROUP BY m / 8
+                    )
+                    SELECT decode(string_agg(lpad(to_hex(COALESCE(filled.bits, 0)), 2, '0'), '' ORDER BY slot.b),
+                                  'hex')
+                    FROM generate_series(0, 1259) AS slot(b)
+                    LEFT JOIN filled ON filled.b = slot.b;
+                $$ LANGUAGE sql STABLE;
+
+                CREATE FUNCTION api_venue_set_opening_schedule() RETURNS trigger AS $$
+                BEGIN
+                    NEW.opening_schedule := api_venue_opening_schedule(NEW.id);
+                    RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER api_venue_set_opening_schedule
+                BEFORE INSERT OR UPDATE OF opening_schedule ON api_venue
+                FOR EACH ROW EXECUTE PROCEDURE api_venue_set_opening_schedule();
+
+                CREATE FUNCTION api_openinghour_touch_venue() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP = 'INSERT' THEN
+                        UPDATE api_venue SET opening_schedule = NULL WHERE id = NEW.venue_id;
+                    ELSIF TG_OP = 'DELETE' THEN
+                        UPDATE api_venue SET opening_schedule = NULL WHERE id = OLD.venue_id;
+                    ELSE
+                        UPDATE api_venue SET opening_schedule = NULL WHERE id IN (OLD.venue_id, NEW.venue_id);
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER api_openinghour_touch_venue
+                AFTER INSERT OR UPDATE OR DELETE ON api_openinghour
+                FOR EACH ROW EXECUTE PROCEDURE api_openinghour_touch_venue();
+
+                UPDATE api_venue SET opening_schedule = NULL;
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS api_openinghour_touch_venue ON api_openinghour;
+                DROP FUNCTION IF EXISTS api_openinghour_touch_venue();
+                DROP TRIGGER IF EXISTS api_venue_set_opening_schedule ON api_venue;
+                DROP FUNCTION IF EXISTS api_venue_set_opening_schedule();
+                DROP FUNCTION IF EXISTS api_venue_opening_schedule(integer);
+            """
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0061_venue_opening_schedule'),
+    ]
+
+    operations = [
+        # Overlapping dispatches may have sent a driver the same order twice, the request a driver is on or accepted
+        # is kept, otherwise the first one
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM api_deliveryrequest AS delivery_request
+                USING (
+                    SELECT request.id,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY request.order_id, request.driver_id
+                               ORDER BY EXISTS (SELECT 1 FROM api_driver AS driver
+                                                WHERE driver.current_delivery_request_id = request.id) DESC,
+                                        (request.status = 'accepted') DESC,
+                                        request.id
+                           ) AS rank
+                    FROM api_deliveryrequest AS request
+                ) AS ranked
+                WHERE delivery_request.id = ranked.id AND ranked.rank > 1;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='deliveryrequest',
+            constraint=models.UniqueConstraint(fields=('order', 'driver'), name='api_deliveryrequest_order_driver_uniq'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0062_deliveryrequest_order_driver_uniq'),
+    ]
+
+    operations = [
+        # A trigger rather than DriverPayment.create so payments that are soft deleted, hard deleted or moved to
+        # another day (or driver) take their earnings with them. Tips only count for delivery payments, as in 0055.
+        migrations.RunSQL(
+            sql="""
+                CREATE FUNCTION api_driverpayment_tip(varchar, integer) RETURNS integer AS $$
+                    SELECT CASE WHEN $1 = 'delivery' THEN payment.tip ELSE 0 END
+                    FROM api_order AS "order"
+                    JOIN api_payment AS payment ON payment.id = "order".payment_id
+                    WHERE "order".id = $2;
+                $$ LANGUAGE sql STABLE;
+
+                CREATE FUNCTION api_driverpayment_sync_daily_earning() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.deleted_at IS NULL THEN
+                        UPDATE api_driverdailyearning AS earning
+                        SET payment_count = earning.payment_count - 1,
+                            earnings = earning.earnings - OLD.amount,
+                            tips = earning.tips - COALESCE(api_driverpayment_tip(OLD.type, OLD.order_id), 0)
+                        WHERE earning.driver_id = OLD.driver_id AND earning.date = OLD.created_at::date;
+                    END IF;
+
+                    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+                        INSERT INTO api_driverdailyearning (driver_id, date, currency_id, payment_count, earnings,
+                                                            tips)
+                        VALUES (NEW.driver_id, NEW.created_at::date, NEW.currency_id, 1, NEW.amount,
+                                COALESCE(api_driverpayment_tip(NEW.type, NEW.order_id), 0))
+                        ON CONFLICT (driver_id, date)
+                        DO UPDATE SET payment_count = api_driverdailyearning.payment_count + 1,
+                                      earnings = api_driverdailyearning.earnings + EXCLUDED.earnings,
+                                      tips = api_driverdailyearning.tips + EXCLUDED.tips;
+                    END IF;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER api_driverpayment_sync_daily_earning
+                AFTER INSERT OR DELETE OR UPDATE OF driver_id, order_id, amount, type, created_at, deleted_at
+                ON api_driverpayment
+                FOR EACH ROW EXECUTE PROCEDURE api_driverpayment_sync_daily_earning();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS api_driverpayment_sync_daily_earning ON api_driverpayment;
+                DROP FUNCTION IF EXISTS api_driverpayment_sync_daily_earning();
+                DROP FUNCTION IF EXISTS api_driverpayment_tip(varchar, integer);
+            """
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0063_driverpayment_daily_earning_trigger'),
+    ]
+
+    operations = [
+        # Every process checks this version before serving its copy of the categories, see CategoryTree. A sequence,
+        # so writes never wait on each other for it, moved by deferred triggers so it only moves as the write commits.
+        # Only the columns the copy is made of count, sales counts change on every order.
+        migrations.RunSQL(
+            sql="""
+                CREATE SEQUENCE api_categorytree_version;
+
+                CREATE FUNCTION api_categorytree_bump_version() RETURNS trigger AS $$
+                BEGIN
+                    PERFORM nextval('api_categorytree_version');
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE CONSTRAINT TRIGGER api_category_bump_categorytree_version
+                AFTER INSERT OR DELETE OR UPDATE OF title, parent_id, item_count, menu_item_count ON api_category
+                DEFERRABLE INITIALLY DEFERRED
+                FOR EACH ROW EXECUTE PROCEDURE api_categorytree_bump_version();
+
+                CREATE CONSTRAINT TRIGGER api_menucategory_bump_categorytree_version
+                AFTER INSERT OR DELETE OR UPDATE OF menu_id, category_id ON api_menucategory
+                DEFERRABLE INITIALLY DEFERRED
+                FOR EACH ROW EXECUTE PROCEDURE api_categorytree_bump_version();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS api_menucategory_bump_categorytree_version ON api_menucategory;
+                DROP TRIGGER IF EXISTS api_category_bump_categorytree_version ON api_category;
+                DROP FUNCTION IF EXISTS api_categorytree_bump_version();
+                DROP SEQUENCE IF EXISTS api_categorytree_version;
+            """
+        ),
+    ]
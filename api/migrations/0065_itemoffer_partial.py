@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0064_category_tree_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='itemoffer',
+            name='partial',
+            field=models.BooleanField(default=False),
+        ),
+        # Rebuilds the offers as ItemOffer.refresh now does, with the cells venues only deliver to part of
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM api_itemoffer;
+
+                WITH live_menu_item AS (
+                    SELECT menu_item.id, menu_item.item_id, menu_item.menu_id, menu_item.currency_id,
+                           LEAST(menu_item.price, COALESCE(menu_item.price_sale, menu_item.price)) AS price
+                    FROM api_menuitem AS menu_item
+                    JOIN api_venue AS venue ON venue.id = menu_item.menu_id
+                    JOIN api_company AS company ON company.id = venue.company_id
+                    WHERE menu_item.deleted_at IS NULL
+                      AND venue.paused = false
+                      AND company.status = 'active'
+                      AND company.stripe_account_id IS NOT NULL
+                      AND company.stripe_charges_enabled = true
+                )
+                INSERT INTO api_itemoffer (geohash, item_id, menu_item_id, currency_id, price, partial)
+                SELECT DISTINCT ON (offer.geohash, offer.item_id)
+                       offer.geohash, offer.item_id, offer.menu_item_id, offer.currency_id, offer.price, offer.partial
+                FROM (
+                    SELECT coverage.geohash, live_menu_item.item_id, live_menu_item.id AS menu_item_id,
+                           live_menu_item.currency_id, live_menu_item.price,
+                           coverage.max_distance > (SELECT MAX(ends) FROM api_deliverydistance) AS partial
+                    FROM live_menu_item
+                    JOIN api_deliverycoverage AS coverage
+                      ON coverage.venue_id = live_menu_item.menu_id
+                     AND coverage.min_distance <= (SELECT MAX(ends) FROM api_deliverydistance)
+                    UNION ALL
+                    SELECT '', live_menu_item.item_id, live_menu_item.id, live_menu_item.currency_id,
+                           live_menu_item.price, false
+                    FROM live_menu_item
+                ) AS offer
+                ORDER BY offer.geohash, offer.item_id, offer.price, offer.menu_item_id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -4,4 +4,9 @@ from django.db import models
 from .user.models import User
 from .log.models import Log
 from .driver_payment.models import DriverPayment
-from .venue_payment.models import VenuePayment
\ No newline at end of file
+from .venue_payment.models import VenuePayment
+from .delivery_coverage.models import DeliveryCoverage
+from .driver_daily_earning.models import DriverDailyEarning
+from .timing_sketch.models import TimingSketch
+from .demand_cell.models import DemandCell
+from .item_offer.models import ItemOffer
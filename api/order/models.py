@@ -70,20 +70,6 @@ class Order(SmartModel):
         """Return a human readable representation of the model instance."""
         return "Order: {}".format(self.id)
 
-    def accepted(self, delivery_request):
-        from ..utils import DateUtils
-        from ..tasks import send_notification
-
-        self.driver = delivery_request.driver
-        self.accepted_at = DateUtils.now()
-        self.status = Constants.ORDER_STATUS_ACCEPTED
-
-        self.save()
-
-        self.driver.update_stats_for_accepted_delivery_request(delivery_request)
-
-        send_notification.delay_on_commit("send_order_for_customer", self.id, self.status)
-
     def redact_customer(self):
         if self.identification:
             print("---")
@@ -9,6 +9,7 @@ from ..venue.serializers import VenueOrderDetailSerializer, VenueOrderAdminDetai
 from ..venue.models import Venue
 from ..setting.models import Setting
 from ..delivery_distance.models import DeliveryDistance
+from ..delivery_coverage.models import DeliveryCoverage
 from django.contrib.gis.geos import Point
 
 from ..identification.serializers import IdentificationCreateSerializer
@@ -144,7 +145,10 @@ class OrderCreateSerializer(CreateModelSerializer):
         if is_test_order:
             delivery_distance = DeliveryDistance.get_by_distance(0)
         else:
-            delivery_distance = DeliveryDistance.get_by_distance(Distance.between(venue.address.point, customer.address.point, True))
+            delivery_distance = DeliveryCoverage.delivery_distance_for(venue, customer.address.point)
+
+            if not delivery_distance:
+                raise Exception("Delivery fee for this distance is not found")
 
 
         service_fee_percentage = venue.service_fee_percentage
@@ -371,6 +375,7 @@ class OrderCompanyMemberEditSerializer(EditModelSerializer):
                 #logger.info(f"Updating {order.id} ORDER_STATUS_LOOKING_FOR_DRIVER create_delivery_requests")
                 # Using delay instead of delay_on_commit because there can be some lag on this task
                 # and it blocks the http response.
+                # This only sends the first round, dispatch_delivery_requests keeps looking after that
                 create_delivery_requests.delay(order.id)
 
             if status is Constants.ORDER_STATUS_LOOKING_FOR_DRIVER or status is Constants.ORDER_STATUS_REJECTED:
@@ -539,6 +544,11 @@ class OrderDriverEditSerializer(EditModelSerializer):
             attrs.pop("no_answer_image", None)
 
         now = DateUtils.now()
+        if delivery_status == Constants.DELIVERY_STATUS_DELIVERED:
+            attrs["delivered_at"] = now
+        elif delivery_status == Constants.DELIVERY_STATUS_FAILED:
+            attrs["failed_at"] = now
+
         if delivery_status == Constants.ORDER_STATUS_LOOKING_FOR_DRIVER:
             attrs["started_looking_for_drivers_at"] = now
         elif delivery_status == Constants.ORDER_STATUS_REJECTED:
@@ -2,10 +2,16 @@ from celery import Task, shared_task
 from celery.utils.log import get_task_logger
 from celery import shared_task
 from django.db import transaction
+from celery.signals import worker_process_shutdown
 from .utils import Constants, Api
 from .utils import Mail
+from .utils import StatsAccumulator
 
 logger = get_task_logger(__name__)
+
+# Prefork children don't run atexit handlers, stats buffered by update_stats_for_order are written before they go
+worker_process_shutdown.connect(StatsAccumulator.flush_on_exit)
+
 class TransactionAwareTask(Task):
     def delay_on_commit(self, *args, **kwargs):
         """
@@ -44,6 +50,22 @@ def import_items_via_csv(job_id, user_id):
     Items.import_file(job_id, user_id)
 
 
+# Queued by Menu.invalidate
+@shared_task(
+    name="build_menu_snapshots",
+    ignore_result=True,
+    base=TransactionAwareTask
+)
+def build_menu_snapshots(venue_ids):
+    from .menu.models import Menu
+
+    for venue_id in venue_ids:
+        try:
+            Menu.build_snapshot(venue_id)
+        except Menu.DoesNotExist:
+            continue
+
+
 @shared_task(
     name="update_stats_for_order",
     ignore_result=True,
@@ -52,69 +74,137 @@ def import_items_via_csv(job_id, user_id):
 def update_stats_for_order(order_id):
     from .order.models import Order
     from .all_time_stat.models import AllTimeStat
+    from .company.models import Company
+    from .customer.models import Customer
     from .daily_stat.models import DailyStat
+    from .demand_cell.models import DemandCell
+    from .driver.models import Driver
     from .menu_item.models import MenuItem
+    from .timing_sketch.models import TimingSketch
+    from .venue.models import Venue
 
     # logger.info(f"Start > update_stats_for_order")
 
-    order = Order.objects.get(id=order_id)
+    order = Order.objects.select_related("payment", "venue").get(id=order_id)
     if order.status == Constants.ORDER_STATUS_PENDING:
-        customer = order.customer
-        customer.update_stats_for(order)
+        Customer.update_stats_for_orders([order])
 
         DailyStat.update_for(order)
+        DemandCell.add([order], "order_count")
         MenuItem.update_sales_count_for(order)
 
-    venue = order.venue
-    venue.update_stats_for(order)
-
-    company = venue.company
-    company.update_stats_for(order)
+    Venue.update_stats_for_orders([order])
+    Company.update_stats_for_orders([order])
     AllTimeStat.update_for(order)
+    TimingSketch.add_for_order(order)
 
     if order.delivery_status == Constants.DELIVERY_STATUS_DELIVERED:
-        driver = order.driver
-        driver.update_stats_for_delivered_order(order)
+        Driver.update_stats_for_delivered_orders([order])
 
     # logger.info(f"End > update_stats_for_order")
 
 
-# This is triggered after accept button pressed by vendor
+# Orders are only offered to drivers within LOWER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS while they have been looking
+# for a driver for less than this, after that the dispatch loop widens them to UPPER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS
+DISPATCH_RADIUS_EXPANSION_IN_SECONDS = 2
+
+# Postgres advisory lock key held while delivery requests are created, so overlapping dispatch ticks and first waves
+# never pick the same drivers for an order
+DISPATCH_LOCK_KEY = 7314
+
+
+# This is triggered after accept button pressed by vendor, it gives the order its first wave of
+# delivery requests straight away. Every wave after that is sent by dispatch_delivery_requests
 @shared_task(
     name="create_delivery_requests",
     ignore_result=True,
     base=TransactionAwareTask
 )
 def create_delivery_requests(order_id, max_distance=Api.LOWER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS):
-    # If _create_delivery_requests returns True then stop further processing, else start looping
-    if _create_delivery_requests(order_id, max_distance):
-        # Schedule this task to run every 5 seconds, 5km from vendor
-        # Setting this to every 2 seconds because it should try to get it to the driver as quickly as possible
-        create_delivery_requests.apply_async(args=(order_id, Api.UPPER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS), countdown=2)
+    _create_delivery_requests(order_id, max_distance)
 
 
 def _create_delivery_requests(order_id, max_distance):
+    from django.db import connection
     from .order.models import Order
     from .delivery_request.models import DeliveryRequest
 
     logger.info(f'Starting _create_delivery_requests for {order_id}')
 
-    order = Order.objects.get(id=order_id)
-    
-    # If order is no longer looking for driver, then stop further processing
-    if order.status != Constants.ORDER_STATUS_LOOKING_FOR_DRIVER:
-        logger.info(f"Order {order_id} has been accepted. Stopping further delivery requests.")
-        return False  # Stop further processing and scheduling if order is accepted by returning early
-
-    # This is the important logic which is run each time
-    delivery_requests = DeliveryRequest.create_for(order, max_distance)
-
-    logger.info(f'Sending notification to new drivers {delivery_requests}')
-    if delivery_requests:
-        send_notification("send_delivery_requests", delivery_requests)
-    
+    with transaction.atomic():
+        # Waits for a running dispatch tick instead of skipping, the first wave can't be left to the next tick
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [DISPATCH_LOCK_KEY])
+
+        order = Order.objects.get(id=order_id)
+
+        # If order is no longer looking for driver, then stop further processing
+        if order.status != Constants.ORDER_STATUS_LOOKING_FOR_DRIVER:
+            logger.info(f"Order {order_id} has been accepted. Stopping further delivery requests.")
+            return False  # Stop further processing and scheduling if order is accepted by returning early
+
+        # This is the important logic which is run each time
+        delivery_requests = DeliveryRequest.create_for(order, max_distance)
+
+        logger.info(f'Sending notification to new drivers {delivery_requests}')
+        if delivery_requests:
+            transaction.on_commit(lambda: send_notification("send_delivery_requests", delivery_requests))
+
     return True
 
+
+# See celery.py for the schedule
+# One dispatch loop for every order looking for a driver, instead of a self rescheduling task per order
+@shared_task(name="dispatch_delivery_requests", ignore_result=True)
+def dispatch_delivery_requests():
+    import datetime
+    from django.db import connection
+    from django.db.models import Count, Max, Q
+    from .order.models import Order
+    from .delivery_request.models import DeliveryRequest
+    from .utils import DateUtils
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [DISPATCH_LOCK_KEY])
+
+            if not cursor.fetchone()[0]:
+                logger.info("Periodic_task: dispatch_delivery_requests is already running, skipping this tick")
+                return
+
+        orders = Order.objects.filter(status=Constants.ORDER_STATUS_LOOKING_FOR_DRIVER)\
+            .annotate(last_wave_at=Max("delivery_requests__created_at"),
+                      pending_request_count=Count("delivery_requests",
+                                                  filter=Q(delivery_requests__status=Constants.DELIVERY_REQUEST_STATUS_PENDING)))\
+            .only("id", "status", "data", "started_looking_for_drivers_at")
+
+        expands_before = DateUtils.now() - datetime.timedelta(seconds=DISPATCH_RADIUS_EXPANSION_IN_SECONDS)
+        waves_sent_before = DateUtils.now() - datetime.timedelta(seconds=Api.DISPATCH_WAVE_TIMEOUT_IN_SECONDS)
+
+        orders_with_max_distances = []
+
+        for order in orders:
+            # The drivers of the last wave still have time to answer
+            if order.pending_request_count and order.last_wave_at > waves_sent_before:
+                continue
+
+            max_distance = Api.UPPER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS
+
+            if order.started_looking_for_drivers_at and order.started_looking_for_drivers_at > expands_before:
+                max_distance = Api.LOWER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS
+
+            orders_with_max_distances.append((order, max_distance))
+
+        if not orders_with_max_distances:
+            return
+
+        delivery_requests = DeliveryRequest.create_for_orders(orders_with_max_distances)
+
+        logger.info(f"Periodic_task: dispatch_delivery_requests created {len(delivery_requests)} delivery requests for {len(orders_with_max_distances)} orders")
+
+        if delivery_requests:
+            transaction.on_commit(lambda: send_notification("send_delivery_requests", delivery_requests))
+
 # This is triggered after a driver accepts the delivery request
 # To stop the request from being accepted by multiple drivers
 @shared_task(
@@ -137,6 +227,7 @@ def cancel_driver_not_found_or_expired_orders():
     from .order.models import Order
     from .delivery_request.models import DeliveryRequest
     from .all_time_stat.models import AllTimeStat
+    from .demand_cell.models import DemandCell
     from .utils import Constants, DateUtils
 
     logger.info(f"Periodic_task: cancel_driver_not_found_or_expired_orders")
@@ -146,6 +237,7 @@ def cancel_driver_not_found_or_expired_orders():
 
     # FIRST CHECK FOR NO DRIVER FOUND ORDERS
     no_driver_found_orders = Order.objects.filter(status=Constants.ORDER_STATUS_LOOKING_FOR_DRIVER, started_looking_for_drivers_at__lte=threshold)
+    refunded_orders = []
 
     for order in no_driver_found_orders:
         try:
@@ -165,6 +257,10 @@ def cancel_driver_not_found_or_expired_orders():
             status=Constants.DELIVERY_REQUEST_STATUS_EXPIRED
         )
 
+        refunded_orders.append(order)
+
+    DemandCell.add(refunded_orders, "no_driver_found_order_count")
+
     count_of_orders = no_driver_found_orders.count()
 
     if count_of_orders > 0:
@@ -219,4 +315,34 @@ def generate_receipt_for_order(order_id):
 
     order = Order.objects.get(id=order_id)
 
-    Receipt.generate(order)
\ No newline at end of file
+    Receipt.generate(order)
+
+@shared_task(
+    name="rebuild_delivery_coverage",
+    ignore_result=True,
+    base=TransactionAwareTask
+)
+def rebuild_delivery_coverage():
+    from .delivery_coverage.models import DeliveryCoverage
+    from .item_offer.models import ItemOffer
+
+    count = DeliveryCoverage.rebuild_stale()
+
+    # The longest delivery distance may have shrunk as well, which takes cells away from every venue
+    ItemOffer.refresh()
+
+    logger.info(f"Rebuilt delivery coverage for {count} venues")
+
+
+# See celery.py for the schedule. Counters of a day drift when an update_stats_for_order fails or runs after
+# midnight, so once the day is closed its stats are rebuilt from its orders.
+@shared_task(name="rollup_daily_stats", ignore_result=True)
+def rollup_daily_stats():
+    from .daily_stat.models import DailyStat
+    from .utils import DateUtils
+
+    yesterday = DateUtils.yesterday().date()
+
+    count = DailyStat.rebuild(yesterday, yesterday)
+
+    logger.info(f"Periodic_task: rollup_daily_stats rebuilt {count} daily stats for {yesterday}")
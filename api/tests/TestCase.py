@@ -2,6 +2,7 @@ from django.test import TransactionTestCase as DjangoTestCase
 
 from rest_framework.test import APIClient
 from .utils import Request, Manager
+from ..utils import CategoryTree, DriverIndex
 import json
 from urllib.parse import urlencode
 
@@ -15,6 +16,11 @@ class TestCase(DjangoTestCase):
         super()._pre_setup()
         Manager.setup_db()
 
+        # The driver index and the category tree outlive the rows they were loaded from, which are flushed between
+        # cases without moving the category tree's version
+        DriverIndex.clear()
+        CategoryTree.clear()
+
     @classmethod
     def _post(cls, endpoint, data, access_token="", multipart=False, **kwargs):
         data = json.dumps(data) if multipart is False else data
@@ -1,8 +1,11 @@
+from django.db import transaction
+
 from ...tests.TestCase import TestCase
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from ...all_time_stat.models import AllTimeStat
 from ...utils import Constants
 from ..utils import Manager, Data
 
@@ -44,6 +47,38 @@ class ListTest(TestCase):
         self.assertEqual(response.json["sales_count"], 0)
         self.assertEqual(response.json["company_count"], 1)
 
+    def test_with_updated_stats(self):
+        AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT, 2)
+        self.assertEqual(AllTimeStat.get(Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT), 2)
+        AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT, 3)
+        self.assertEqual(AllTimeStat.get(Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT), 5)
+        AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_VENUE_COUNT, 7, True)
+        self.assertEqual(AllTimeStat.get(Constants.ALL_TIME_STAT_TYPE_VENUE_COUNT), 7)
+        AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_VENUE_COUNT, 4, True)
+        self.assertEqual(AllTimeStat.get(Constants.ALL_TIME_STAT_TYPE_VENUE_COUNT), 4)
+
+        query_params_dict = {
+            "types": f"{Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT}, {Constants.ALL_TIME_STAT_TYPE_VENUE_COUNT}"
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(response.json["rejected_order_count"], 5)
+        self.assertEqual(response.json["venue_count"], 4)
+        self.assertEqual(AllTimeStat.objects.filter(type=Constants.ALL_TIME_STAT_TYPE_VENUE_COUNT).count(), 1)
+
+    def test_with_rolled_back_update(self):
+        self.assertEqual(AllTimeStat.get(Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT), 0)
+
+        with transaction.atomic():
+            AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT, 2)
+            transaction.set_rollback(True)
+
+        self.assertEqual(AllTimeStat.get(Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT), 0)
+        self.assertFalse(AllTimeStat.objects.filter(type=Constants.ALL_TIME_STAT_TYPE_REJECTED_ORDER_COUNT).exists())
+
     def test_with_invalid_query_params(self):
         query_params_dict = {
             "types": f"random"
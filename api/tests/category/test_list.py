@@ -5,6 +5,9 @@ from rest_framework import status
 
 from ..utils import Manager, Data
 
+from ...category.models import Category
+from ...utils import CategoryTree
+
 
 class ListTest(TestCase):
 
@@ -271,6 +274,37 @@ class ListTest(TestCase):
 
         self.assertEqual(len(results), 2)
 
+    def test_with_cached_categories(self):
+        query_params_dict = {
+            "search_term": self.category_1.title
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result["id"] for result in response.json["results"]], [self.category_1.id])
+
+        # Served from this process's copy, only its version is read
+        with self.assertNumQueries(1):
+            self.assertEqual(CategoryTree.filter_ids(search_term=self.category_1.title), [self.category_1.id])
+
+        # Written the way another process would, nothing clears this process's copy
+        Category.objects.filter(id=self.category_1.id).update(title="Renamed category")
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json["results"], [])
+
+        query_params_dict = {
+            "search_term": "Renamed category"
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result["id"] for result in response.json["results"]], [self.category_1.id])
+
     def test_failure_with_company_member(self):
         response = self._get(access_token=Manager.get_company_member_access_token())
 
@@ -131,6 +131,39 @@ class ListTest(TestCase):
         self.assertEqual(company_stats[0]["sales_count"], 1)
         self.assertEqual(company_stats[0]["earnings"], order_1.payment.amount)
 
+    def test_with_monthly_interval(self):
+        today = DateUtils.today().date()
+
+        order = Manager.create_order(time_to_freeze=f"{today} 12:31:01")
+
+        query_params_dict = {
+            "total": True,
+            "platform": True,
+            "min_date": str(DateUtils.month_before().date()),
+            "max_date": str(today),
+            "interval": "month"
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(set(response.json.keys()), {"total", "platform"})
+
+        total_stats = response.json["total"]
+
+        self.assertEqual(len(total_stats), 2)
+        self.assertEqual(total_stats[-1]["date"], str(today.replace(day=1)))
+        self.assertEqual(total_stats[-1]["sales_count"], 1)
+        self.assertEqual(total_stats[-1]["earnings"], order.payment.total)
+
+    def test_failure_with_invalid_interval(self):
+        response = self._get({"total": True, "interval": "year"}, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(response.json["detail"], "'interval' must be one of day, week or month")
+
     def test_with_no_query_params(self):
         response = self._get(access_token=self.admin_access_token)
 
@@ -0,0 +1,41 @@
+import datetime
+
+from ...tests.TestCase import TestCase
+
+from ...daily_stat.models import DailyStat
+from ...utils import Constants
+from ..utils import Manager
+
+
+class RollupTest(TestCase):
+
+    def setUp(self):
+        self.order = Manager.create_order(time_to_freeze="2022-01-01 12:31:01")
+        self.date = datetime.date(2022, 1, 1)
+
+    def test_rollup_matches_counters(self):
+        self.assertEqual(DailyStat.verify(self.date, self.date), [])
+
+        stats = DailyStat.rollup(self.date, self.date)
+
+        self.assertEqual(stats[(Constants.DAILY_STAT_TYPE_SALES_COUNT, self.date, None, None)], 1)
+        self.assertEqual(stats[(Constants.DAILY_STAT_TYPE_TOTAL_COMPANY_EARNINGS, self.date, self.order.venue_id, None)],
+                         self.order.payment.amount)
+        self.assertEqual(stats[(Constants.DAILY_STAT_TYPE_TOTAL_COMPANY_EARNINGS, self.date, None,
+                                self.order.venue.company_id)], self.order.payment.amount)
+
+    def test_rebuild_fixes_drift(self):
+        DailyStat.objects.filter(type=Constants.DAILY_STAT_TYPE_SALES_COUNT, date=self.date, venue__isnull=True,
+                                 company__isnull=True).update(value=5)
+        DailyStat.objects.filter(type=Constants.DAILY_STAT_TYPE_PLATFORM_EARNINGS, date=self.date).delete()
+
+        differences = DailyStat.verify(self.date, self.date)
+
+        self.assertEqual(len(differences), 2)
+        self.assertIn((Constants.DAILY_STAT_TYPE_SALES_COUNT, self.date, None, None, 5, 1), differences)
+
+        DailyStat.rebuild(self.date, self.date)
+
+        self.assertEqual(DailyStat.verify(self.date, self.date), [])
+        self.assertEqual(DailyStat.objects.get(type=Constants.DAILY_STAT_TYPE_PLATFORM_EARNINGS, date=self.date).value,
+                         self.order.payment.service_fee)
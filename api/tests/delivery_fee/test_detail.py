@@ -4,6 +4,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 
 from ...delivery_distance.models import DeliveryDistance
+from ...delivery_coverage.models import DeliveryCoverage
 
 from ..utils import Manager, Data, Point
 
@@ -44,6 +45,27 @@ class DetailTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_success_with_delivery_coverage(self):
+        DeliveryCoverage.build_for(self.venue)
+
+        self.assertTrue(DeliveryCoverage.objects.filter(venue=self.venue).exists())
+
+        for distance in [0.5, 1.5, 2.5, 3.5, 4.5]:
+            if distance > DeliveryDistance.max_delivery_distance():
+                continue
+
+            location = Point.north_for_point(self.venue.address.point, distance)
+
+            query_params_dict = {
+                "latitude": str(location.latitude),
+                "longitude": str(location.longitude)
+            }
+
+            response = self._get(self.venue.id, query_params_dict, Manager.get_customer_access_token())
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json["fee"], DeliveryDistance.get_by_distance(distance).fee)
+
     def test_failure_with_invalid_id(self):
         location = Point.from_db_to_lat_and_lng(self.venue.address.point)
 
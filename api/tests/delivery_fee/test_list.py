@@ -0,0 +1,93 @@
+from ...tests.TestCase import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from ...delivery_distance.models import DeliveryDistance
+
+from ..utils import Manager, Point
+
+
+class ListTest(TestCase):
+
+    client = APIClient()
+
+    def setUp(self):
+        self.venue = Manager.create_venue()
+        self.other_venue = Manager.create_venue(company=self.venue.company)
+
+        Manager.create_delivery_distances()
+
+    def _get(self, query_params_dict=None, access_token="", **kwargs):
+        response = super()._get("/delivery-fees", query_params_dict, access_token=access_token)
+
+        return response
+
+    def test_success(self):
+        location = Point.north_for_point(self.venue.address.point, 0.5)
+
+        query_params_dict = {
+            "latitude": str(location.latitude),
+            "longitude": str(location.longitude),
+            "venue_ids": f"{self.venue.id},{self.other_venue.id},99999999"
+        }
+
+        response = self._get(query_params_dict, Manager.get_customer_access_token())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = response.json["results"]
+
+        self.assertEqual([result["venue"] for result in results], [self.venue.id, self.other_venue.id])
+        self.assertTrue(results[0]["deliverable"])
+        self.assertEqual(results[0]["fee"], DeliveryDistance.get_by_distance(results[0]["distance"]/1000).fee)
+
+        response = self._get(query_params_dict)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_success_with_out_of_delivery_distance(self):
+        location = Point.north_for_point(self.venue.address.point, int(DeliveryDistance.max_delivery_distance())+1)
+
+        query_params_dict = {
+            "latitude": str(location.latitude),
+            "longitude": str(location.longitude),
+            "venue_ids": str(self.venue.id)
+        }
+
+        response = self._get(query_params_dict, Manager.get_customer_access_token())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        result = response.json["results"][0]
+
+        self.assertFalse(result["deliverable"])
+        self.assertIsNone(result["fee"])
+
+    def test_failure_with_too_many_venues(self):
+        location = Point.from_db_to_lat_and_lng(self.venue.address.point)
+
+        query_params_dict = {
+            "latitude": str(location["latitude"]),
+            "longitude": str(location["longitude"]),
+            "venue_ids": ",".join(str(venue_id) for venue_id in range(1, 102))
+        }
+
+        response = self._get(query_params_dict, Manager.get_customer_access_token())
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(response.json["detail"], "You can only quote up to 100 venues at once")
+
+    def test_failure_without_location(self):
+        response = self._get({"venue_ids": str(self.venue.id)})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(response.json["detail"], "'latitude' and 'longitude' are required")
+
+    def test_failure_with_admin(self):
+        self.permission_denied_test(self._get(access_token=Manager.get_admin_access_token()))
+
+    def test_failure_with_driver(self):
+        self.permission_denied_test(self._get(access_token=Manager.get_driver_access_token()))
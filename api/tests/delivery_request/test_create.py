@@ -88,8 +88,8 @@ class CreateTest(TestCase):
         order.driver = self.driver_1
         order.save()
 
-        self.driver_1.current_delivery_request = DeliveryRequest.objects.create(driver=self.driver_1, order=order,
-                                                                                driver_location=order.venue.address.point)
+        # A driver is only ever sent an order once, see DeliveryRequest.Meta
+        self.driver_1.current_delivery_request = DeliveryRequest.objects.get(driver=self.driver_1, order=order)
         self.driver_1.save()
 
         order_2 = Manager.create_looking_for_driver_order(venue=venue)
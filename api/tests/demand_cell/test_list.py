@@ -0,0 +1,75 @@
+from ...tests.TestCase import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from ...demand_cell.models import DemandCell
+
+from ...utils import Constants
+from ..utils import Manager
+
+
+class ListTest(TestCase):
+
+    client = APIClient()
+
+    def setUp(self):
+        self.admin_access_token = Manager.get_admin_access_token()
+
+    def _get(self, query_params_dict=None, access_token="", **kwargs):
+
+        response = super()._get("/demand-cells", query_params_dict, access_token)
+
+        return response
+
+    def test_with_admin(self):
+        response = self._get(access_token=self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(len(response.json), 0)
+
+        order = Manager.create_delivered_order()
+
+        response = self._get(access_token=self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(len(response.json), 1)
+        self.assertEqual(response.json[0]["geohash"], DemandCell.geohash_for(order))
+        self.assertEqual(response.json[0]["order_count"], 1)
+        self.assertEqual(response.json[0]["no_driver_found_order_count"], 0)
+
+        hour_of_week = DemandCell.hour_of_week_for(order.created_at)
+
+        query_params_dict = {
+            "day": Constants.DAYS_ORDERED[hour_of_week // 24],
+            "hour": hour_of_week % 24
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(len(response.json), 1)
+
+        query_params_dict = {
+            "hour": (hour_of_week + 1) % 24
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(len(response.json), 0)
+
+    def test_failure_with_invalid_hour(self):
+        response = self._get({"hour": 24}, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_failure_with_company_member(self):
+        self.permission_denied_test(self._get(access_token=Manager.get_company_member_access_token()))
+
+    def test_failure_with_driver(self):
+        self.permission_denied_test(self._get(access_token=Manager.get_driver_access_token()))
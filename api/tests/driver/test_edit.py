@@ -5,7 +5,7 @@ from ...tests.TestCase import TestCase
 
 from ..utils import Data, Manager
 
-from ...utils import Constants, DateUtils
+from ...utils import Constants, DateUtils, DriverLocationBuffer
 
 
 class EditTest(TestCase):
@@ -235,6 +235,33 @@ class EditTest(TestCase):
 
         self.assertEqual(response.json["longitude"], data["longitude"])
 
+    def test_stale_location_pings_are_dropped(self):
+        from django.contrib.gis.geos import Point
+
+        user = self.driver.user
+        data = {
+            "latitude": 53.3331671,
+            "longitude": -6.24394
+        }
+
+        response = self._patch(user.id, data, Manager.get_access_token(user))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.driver.refresh_from_db()
+
+        self.assertEqual(self.driver.last_known_location.coords[1], data["latitude"])
+
+        stale_updated_at = DateUtils.minutes_before(1)
+
+        DriverLocationBuffer.add(user.id, Point(-6.1, 53.1), stale_updated_at)
+        DriverLocationBuffer.flush()
+
+        self.driver.refresh_from_db()
+
+        self.assertEqual(self.driver.last_known_location.coords[1], data["latitude"])
+        self.assertGreater(self.driver.last_known_location_updated_at, stale_updated_at)
+
     def test_failure_with_updating_latitude_and_longitude(self):
         user = self.driver.user
         data = {
@@ -0,0 +1,76 @@
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from ...tests.TestCase import TestCase
+
+from ..utils import Manager
+
+from ...utils import Api, DateUtils
+
+import json
+import tempfile
+
+
+class LocationsTest(TestCase):
+
+    client = APIClient()
+
+    def setUp(self):
+        self.admin_access_token = Manager.get_admin_access_token()
+
+        self.driver = Manager.create_driver()
+
+        # Pings of this test go to a directory of its own rather than the configured shared one
+        self.history_directory = tempfile.TemporaryDirectory()
+        self.configured_history_directory = Api.DRIVER_LOCATION_HISTORY_DIRECTORY
+        Api.DRIVER_LOCATION_HISTORY_DIRECTORY = self.history_directory.name
+
+    def tearDown(self):
+        Api.DRIVER_LOCATION_HISTORY_DIRECTORY = self.configured_history_directory
+        self.history_directory.cleanup()
+
+    def _get(self, id, query_params_dict=None, access_token="", **kwargs):
+        response = super()._get(f"/drivers/{id}/locations", query_params_dict, access_token, include_json_response=False)
+
+        return response
+
+    def test_success(self):
+        starts_at = DateUtils.minutes_before(1)
+        driver_access_token = Manager.get_access_token(self.driver.user)
+
+        points = [(53.3331671, -6.24394), (53.3341671, -6.24494), (53.3351671, -6.24594)]
+
+        for latitude, longitude in points:
+            response = super()._patch(f"/drivers/{self.driver.user.id}", {"latitude": latitude, "longitude": longitude}, driver_access_token)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self._get(self.driver.user.id, {"starts_at": starts_at.isoformat()}, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = json.loads(b"".join(response.streaming_content))
+
+        self.assertEqual(data["driver"], self.driver.user.id)
+        self.assertEqual(len(data["locations"]), len(points))
+        self.assertAlmostEqual(data["locations"][-1]["latitude"], points[-1][0], places=4)
+        self.assertAlmostEqual(data["locations"][-1]["longitude"], points[-1][1], places=4)
+
+    def test_failure_with_invalid_window(self):
+        data = {
+            "starts_at": DateUtils.now().isoformat(),
+            "ends_at": DateUtils.minutes_before(10).isoformat()
+        }
+
+        response = self._get(self.driver.user.id, data, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_failure_with_driver_account(self):
+        data = {
+            "starts_at": DateUtils.minutes_before(10).isoformat()
+        }
+
+        response = self._get(self.driver.user.id, data, Manager.get_access_token(self.driver.user))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -179,9 +179,10 @@ class ListTest(TestCase):
         self.assertEqual(response.json["total_tips"], 0)
         self.assertIsNotNone(response.json["currency"])
 
+        # Payments moved to another day, or deleted, take their earnings with them. max_date is exclusive
         order = Manager.create_delivered_order(driver=driver)
         driver_payment = DriverPayment.objects.get(order=order)
-        driver_payment.created_at = DateUtils.tomorrow().date()
+        driver_payment.created_at = DateUtils.tomorrow()
         driver_payment.save()
 
         query_params_dict = {
@@ -193,11 +194,44 @@ class ListTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(response.json["count"], 2)
-        self.assertEqual(response.json["total_earnings"], 1600)
+        self.assertEqual(response.json["count"], 1)
+        self.assertEqual(response.json["total_earnings"], 800)
         self.assertEqual(response.json["total_tips"], 0)
         self.assertIsNotNone(response.json["currency"])
 
+        days = response.json["days"]
+
+        self.assertEqual(len(days), 2)
+        self.assertEqual(days[0]["date"], str(DateUtils.yesterday().date()))
+        self.assertEqual(days[0]["count"], 0)
+        self.assertEqual(days[1]["date"], str(DateUtils.today().date()))
+        self.assertEqual(days[1]["count"], 1)
+        self.assertEqual(days[1]["earnings"], 800)
+
+        query_params_dict = {
+            "min_date": str(DateUtils.today().date()),
+            "max_date": str(DateUtils.next_week(DateUtils.today().date()))
+        }
+
+        response = self._get(query_params_dict, access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(response.json["count"], 2)
+        self.assertEqual(response.json["total_earnings"], 1600)
+        self.assertEqual(response.json["days"][1]["date"], str(DateUtils.tomorrow().date()))
+        self.assertEqual(response.json["days"][1]["count"], 1)
+
+        driver_payment.delete()
+
+        response = self._get(query_params_dict, access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(response.json["count"], 1)
+        self.assertEqual(response.json["total_earnings"], 800)
+        self.assertEqual(response.json["days"][1]["count"], 0)
+
         query_params_dict = {
             "min_date": str(DateUtils.today().date()),
             "max_date": str(DateUtils.yesterday().date())
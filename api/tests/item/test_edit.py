@@ -68,6 +68,24 @@ class EditTest(TestCase):
 
         self.assertEqual(subcategory.item_count, 0)
 
+    def test_success_ignores_search_columns(self):
+        data = {
+            "description": "Edited description",
+            "search_document": "edited"
+        }
+
+        response = self._patch(self.item.id, data, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertNotIn("search_document", response.json)
+        self.assertNotIn("search_vector", response.json)
+
+        self.item.refresh_from_db()
+
+        self.assertIn("edited description", self.item.search_document)
+        self.assertNotEqual(self.item.search_document, data["search_document"])
+
     def test_failure_with_using_same_title(self):
         item = Manager.create_item()
 
@@ -5,6 +5,7 @@ from rest_framework import status
 
 from django.contrib.gis.geos import Point
 from ...opening_hour.models import OpeningHour
+from ...item_offer.models import ItemOffer
 
 from ...utils import DateUtils, Constants
 
@@ -157,6 +158,53 @@ class ListTest(TestCase):
 
         self.assertEqual(results[0]["id"], self.item_1.id)
 
+    def test_search_with_admin(self):
+        item_1 = Manager.create_item(Data.valid_item_data(title="Sparkling water",
+                                                          description="Goes well with a Heineken"))
+        item_2 = Manager.create_item(Data.valid_item_data(title="Heineken Lager"))
+
+        query_params_dict = {
+            "search_term": "heineken"
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        results = response.json["results"]
+
+        self.assertEqual(len(results), 2)
+
+        # A match in the title ranks above one in the description
+        self.assertEqual(results[0]["id"], item_2.id)
+        self.assertEqual(results[1]["id"], item_1.id)
+
+        query_params_dict = {
+            "search_term": "heiniken"
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        results = response.json["results"]
+
+        self.assertEqual(len(results), 2)
+
+        response = self._patch_category(item_2.subcategory.parent, {"title": "Beer and cider"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        query_params_dict = {
+            "search_term": "cider"
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        results = response.json["results"]
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["id"], item_2.id)
+
+    def _patch_category(self, category, data):
+        return super()._patch(f"/categories/{category.id}", data, self.admin_access_token)
+
     def test_with_company_member(self):
         response = self._get(access_token=Manager.get_company_member_access_token())
 
@@ -335,6 +383,88 @@ class ListTest(TestCase):
 
         self.assertEqual(results[0]["id"], self.item_2.id)
 
+    def test_filter_with_customer_after_menu_changes(self):
+        access_token = Manager.get_customer_access_token()
+
+        menu_item_1 = Manager.create_menu_item(Data.valid_menu_item_data(price=600, item=self.item_1))
+        menu_item_2 = Manager.create_menu_item(Data.valid_menu_item_data(price=500, item=self.item_1))
+
+        query_params_dict = {
+            "latitude": 53.3331671,
+            "longitude": -6.243948,
+            "has_menu_item": True
+        }
+
+        response = self._get(query_params_dict, access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = response.json["results"]
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["menu_item"]["price"], menu_item_2.price)
+
+        response = super()._patch(f"/menu-items/{menu_item_1.id}", {"price_sale": 400}, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self._get(query_params_dict, access_token)
+
+        self.assertEqual(response.json["results"][0]["menu_item"]["price"], 400)
+
+        response = super()._patch(f"/venues/{menu_item_1.menu.venue_id}", {"paused": True}, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self._get(query_params_dict, access_token)
+
+        self.assertEqual(response.json["results"][0]["menu_item"]["price"], menu_item_2.price)
+
+        response = super()._patch(f"/venues/{menu_item_2.menu.venue_id}", {"paused": True}, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self._get(query_params_dict, access_token)
+
+        self.assertEqual(len(response.json["results"]), 0)
+
+    def test_filter_with_customer_in_partly_covered_cell(self):
+        access_token = Manager.get_customer_access_token()
+
+        menu_item = Manager.create_menu_item(Data.valid_menu_item_data(price=600, item=self.item_1))
+
+        # Both in a cell the venue only delivers to part of, the first one inside its delivery distance
+        inside = PointHelper.north(53.3331671, -6.243948, self.max_delivery_distance - 0.05)
+        outside = PointHelper.north(53.3331671, -6.243948, self.max_delivery_distance + 0.15)
+
+        offer = ItemOffer.objects.get(item=self.item_1, geohash=ItemOffer.geohash_for(Point(inside.longitude,
+                                                                                               inside.latitude)))
+
+        self.assertTrue(offer.partial)
+
+        response = self._get({
+            "latitude": inside.latitude,
+            "longitude": inside.longitude,
+            "has_menu_item": True
+        }, access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = response.json["results"]
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["id"], self.item_1.id)
+        self.assertEqual(results[0]["menu_item"]["price"], menu_item.price)
+
+        response = self._get({
+            "latitude": outside.latitude,
+            "longitude": outside.longitude,
+            "has_menu_item": True
+        }, access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json["results"]), 0)
+
     def test_with_driver(self):
         response = self._get(access_token=Manager.get_driver_access_token())
 
@@ -49,6 +49,28 @@ class DetailTest(TestCase):
 
         self.assertEqual(menu_item["order"], 0)
 
+    def test_with_etag(self):
+        response = self._get(self.venue.id, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response["ETag"]
+
+        response = super()._get(f"/menus/{self.venue.id}", access_token=self.admin_access_token,
+                                include_json_response=False, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        Manager.setup_menu(self.venue)
+
+        response = super()._get(f"/menus/{self.venue.id}", access_token=self.admin_access_token,
+                                HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json["menu_categories"]), 1)
+
     def test_with_staff_belongs_to_venue(self):
         access_token = Manager.get_staff_access_token(self.venue)
 
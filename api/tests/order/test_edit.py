@@ -66,6 +66,8 @@ class EditTest(TestCase):
 
         self.assertNotEqual(company.total_accept_time, company_total_accept_time)
         self.assertNotEqual(company.average_accept_time, company_average_accept_time)
+        self.assertEqual(company.accepted_order_count, 1)
+        self.assertEqual(company.average_accept_time, company.total_accept_time)
 
         self.assertIsNotNone(self.order.started_looking_for_drivers_at)
         self.assertIsNone(self.order.rejected_at)
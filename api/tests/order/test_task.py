@@ -8,9 +8,9 @@ from rest_framework import status
 from ...delivery_request.models import DeliveryRequest
 from ...all_time_stat.models import AllTimeStat
 
-from ...tasks import cancel_driver_not_found_or_expired_orders, _create_delivery_requests, create_delivery_requests
+from ...tasks import cancel_driver_not_found_or_expired_orders, _create_delivery_requests, create_delivery_requests, dispatch_delivery_requests
 from ...utils import Constants, DateUtils, Api
-from ..utils import Manager, Data
+from ..utils import Manager, Data, Point
 
 
 class TaskTest(TestCase):
@@ -246,7 +246,8 @@ class TaskTest(TestCase):
         order.driver = driver_1
         order.save()
 
-        driver_1.current_delivery_request = DeliveryRequest.objects.create(driver=driver_1, order=order, driver_location=order.venue.address.point)
+        # A driver is only ever sent an order once, see DeliveryRequest.Meta
+        driver_1.current_delivery_request = DeliveryRequest.objects.get(driver=driver_1, order=order)
         driver_1.save()
 
         Manager.get_driver_close_to_venue(venue=order_3.venue)
@@ -335,3 +336,91 @@ class TaskTest(TestCase):
 
 
 
+
+    def test_check_if_drivers_who_moved_away_are_not_requested(self):
+        order = Manager.create_order()
+
+        driver_1 = Manager.get_driver_close_to_venue(venue=order.venue)
+        driver_2 = Manager.get_driver_close_to_venue(venue=order.venue)
+
+        far_away_point = Point.north_for_point(order.venue.address.point, Api.UPPER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS + 5)
+
+        data = {
+            "latitude": far_away_point.latitude,
+            "longitude": far_away_point.longitude
+        }
+
+        response = super()._patch(f"/drivers/{driver_2.user_id}", data, Manager.get_access_token(driver_2.user))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        Manager.create_looking_for_driver_order(order)
+
+        _create_delivery_requests(order.id, Api.UPPER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS)
+
+        delivery_requests = DeliveryRequest.objects.filter(order=order)
+
+        self.assertEqual(delivery_requests.count(), 1)
+        self.assertEqual(delivery_requests.first().driver, driver_1)
+
+    def test_dispatch_delivery_requests_for_all_orders_looking_for_drivers(self):
+        order = Manager.create_order()
+        order_2 = Manager.create_order()
+
+        Manager.create_looking_for_driver_order(order)
+        Manager.create_looking_for_driver_order(order_2)
+
+        self.assertEqual(DeliveryRequest.objects.filter(order__in=[order, order_2]).count(), 0)
+
+        driver_1 = Manager.get_driver_close_to_venue(venue=order.venue)
+        driver_2 = Manager.get_driver_close_to_venue(venue=order_2.venue,
+                                                     distance_to_venue=Api.UPPER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS)
+
+        order.refresh_from_db()
+        order_2.refresh_from_db()
+
+        order_2.started_looking_for_drivers_at = DateUtils.minutes_before(1)
+        order_2.save()
+
+        dispatch_delivery_requests()
+
+        self.assertTrue(DeliveryRequest.objects.filter(order=order, driver=driver_1).exists())
+        self.assertTrue(DeliveryRequest.objects.filter(order=order_2, driver=driver_2).exists())
+
+        count_of_delivery_requests = DeliveryRequest.objects.count()
+
+        dispatch_delivery_requests()
+
+        self.assertEqual(DeliveryRequest.objects.count(), count_of_delivery_requests)
+
+    def test_dispatch_delivery_requests_in_waves(self):
+        order = Manager.create_order()
+
+        Manager.create_looking_for_driver_order(order)
+
+        order.refresh_from_db()
+
+        driver_1 = Manager.get_driver_close_to_venue(venue=order.venue,
+                                                     distance_to_venue=Api.UPPER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS)
+        driver_2 = Manager.get_driver_close_to_venue(venue=order.venue)
+
+        DeliveryRequest.create_for_orders([(order, Api.UPPER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS)], wave_size=1)
+
+        delivery_requests = DeliveryRequest.objects.filter(order=order)
+
+        self.assertEqual(delivery_requests.count(), 1)
+        self.assertEqual(delivery_requests.first().driver, driver_2)
+
+        order.started_looking_for_drivers_at = DateUtils.minutes_before(1)
+        order.save()
+
+        dispatch_delivery_requests()
+
+        self.assertEqual(DeliveryRequest.objects.filter(order=order).count(), 1)
+
+        Manager.reject_a_delivery_request(delivery_requests.first())
+
+        dispatch_delivery_requests()
+
+        self.assertEqual(DeliveryRequest.objects.filter(order=order).count(), 2)
+        self.assertTrue(DeliveryRequest.objects.filter(order=order, driver=driver_1).exists())
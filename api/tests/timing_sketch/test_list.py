@@ -0,0 +1,94 @@
+from ...tests.TestCase import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from ...timing_sketch.models import TimingSketch
+
+from ...utils import Constants, DateUtils, Histogram
+from ..utils import Manager
+
+
+class ListTest(TestCase):
+
+    client = APIClient()
+
+    def setUp(self):
+        self.admin_access_token = Manager.get_admin_access_token()
+
+    def _get(self, query_params_dict=None, access_token="", **kwargs):
+
+        response = super()._get("/timing-sketches", query_params_dict, access_token)
+
+        return response
+
+    def test_with_admin(self):
+        query_params_dict = {
+            "type": Constants.TIMING_SKETCH_TYPE_DELIVERY_TIME
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(response.json["count"], 0)
+        self.assertIsNone(response.json["p50"])
+
+        order = Manager.create_delivered_order()
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(response.json["count"], 1)
+        self.assertIsNotNone(response.json["p50"])
+        self.assertEqual(response.json["p50"], response.json["p99"])
+
+        query_params_dict["driver_id"] = order.driver_id
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(response.json["count"], 1)
+
+        query_params_dict = {
+            "type": Constants.TIMING_SKETCH_TYPE_DELIVERY_TIME,
+            "min_date": str(DateUtils.tomorrow().date()),
+            "max_date": str(DateUtils.tomorrow().date())
+        }
+
+        response = self._get(query_params_dict, self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(response.json["count"], 0)
+
+    def test_merges_sketches(self):
+        venue = Manager.create_venue()
+
+        durations = [(Constants.TIMING_SKETCH_TYPE_DELIVERY_TIME, venue.id, None, seconds)
+                     for seconds in range(1, 101)]
+
+        TimingSketch.add(durations[:50])
+        TimingSketch.add(durations[50:])
+
+        self.assertEqual(TimingSketch.objects.filter(venue=venue).count(), 1)
+
+        data = TimingSketch.percentiles(Constants.TIMING_SKETCH_TYPE_DELIVERY_TIME, DateUtils.today().date(),
+                                        DateUtils.today().date(), venue_id=venue.id)
+
+        self.assertEqual(data["count"], 100)
+        self.assertEqual(Histogram.bucket_for(data["p50"]), Histogram.bucket_for(50))
+        self.assertEqual(Histogram.bucket_for(data["p99"]), Histogram.bucket_for(99))
+
+    def test_failure_without_type(self):
+        response = self._get(access_token=self.admin_access_token)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_failure_with_company_member(self):
+        self.permission_denied_test(self._get(access_token=Manager.get_company_member_access_token()))
+
+    def test_failure_with_driver(self):
+        self.permission_denied_test(self._get(access_token=Manager.get_driver_access_token()))
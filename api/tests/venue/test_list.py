@@ -205,6 +205,28 @@ class ListTest(TestCase):
 
         self.assertEqual(len(results), 2)
 
+    def test_filter_with_deleted_opening_hour(self):
+        from ...opening_hour.models import OpeningHour
+
+        opening_hour = OpeningHour.objects.create(venue=self.venue, day=DateUtils.weekday(), starts_at=DateUtils.time(),
+                                                  ends_at=DateUtils.minutes_later(60), order=0)
+
+        self.venue.refresh_from_db()
+
+        self.assertTrue(self.venue.open())
+
+        opening_hour.delete()
+
+        self.venue.refresh_from_db()
+
+        self.assertFalse(self.venue.open())
+
+        response = self._get({"open_now": True})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(len(response.json["results"]), 0)
+
     def test_filter(self):
         from ...opening_hour.models import OpeningHour
         query_params_dict = {
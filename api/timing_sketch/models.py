@@ -0,0 +1,122 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db import connection, models
+
+from ..utils.Fields import EnumField
+
+from ..venue.models import Venue
+from ..driver.models import Driver
+
+from ..utils import Constants, DateUtils, Histogram
+
+
+class TimingSketch(models.Model):
+    """
+    The histogram of a type of duration, for one venue or one driver on one day, see Histogram. Histograms of any
+    range of days are merged into percentiles without going through orders.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+
+    type = EnumField(options=Constants.TIMING_SKETCH_TYPES)
+
+    date = models.DateField()
+
+    venue = models.ForeignKey(Venue, related_name="timing_sketches", null=True, on_delete=models.CASCADE)
+
+    driver = models.ForeignKey(Driver, related_name="timing_sketches", null=True, on_delete=models.CASCADE)
+
+    count = models.PositiveIntegerField(default=0)
+
+    counts = ArrayField(models.PositiveIntegerField())
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return f"TimingSketch: {self.type}: {self.date}: venue {self.venue_id}: driver {self.driver_id}"
+
+    @staticmethod
+    def add_for_order(order):
+        """
+        Adds the accept time of order when its venue just accepted it, and its delivery time when it was just
+        delivered, to its venue's and driver's sketches of today. Both are measured between the order's own
+        timestamps, so how long the task waited in the queue doesn't count.
+        """
+        durations = []
+
+        if order.status == Constants.ORDER_STATUS_LOOKING_FOR_DRIVER and order.started_looking_for_drivers_at:
+            accept_time = (order.started_looking_for_drivers_at - order.created_at).total_seconds()
+            durations.append((Constants.TIMING_SKETCH_TYPE_ACCEPT_TIME, order.venue_id, None, accept_time))
+
+        if order.delivery_status == Constants.DELIVERY_STATUS_DELIVERED and order.collected_at and order.delivered_at:
+            delivery_time = (order.delivered_at - order.collected_at).total_seconds()
+            durations.append((Constants.TIMING_SKETCH_TYPE_DELIVERY_TIME, order.venue_id, None, delivery_time))
+            durations.append((Constants.TIMING_SKETCH_TYPE_DELIVERY_TIME, None, order.driver_id, delivery_time))
+
+        return TimingSketch.add(durations)
+
+    @staticmethod
+    def add(durations):
+        """
+        Adds (type, venue_id, driver_id, seconds) durations to today's sketches with one INSERT ... ON CONFLICT DO
+        UPDATE, which sums the histograms bucket by bucket in the database.
+        """
+        date = DateUtils.today().date()
+
+        values_by_key = {}
+
+        for type, venue_id, driver_id, seconds in durations:
+            values_by_key.setdefault((type, venue_id, driver_id), []).append(seconds)
+
+        if not values_by_key:
+            return 0
+
+        values = []
+        params = []
+
+        for (type, venue_id, driver_id), seconds in values_by_key.items():
+            values.append("(%s, %s::date, %s::integer, %s::integer, %s::integer, %s::integer[])")
+            params.extend([type, date, venue_id, driver_id, len(seconds), Histogram.of(seconds)])
+
+        table = TimingSketch._meta.db_table
+
+        # Matches the unique index of migration 0056, one of venue_id and driver_id is always null
+        sql = f"""
+            INSERT INTO {table} (type, date, venue_id, driver_id, count, counts)
+            VALUES {", ".join(values)}
+            ON CONFLICT (type, date, (COALESCE(venue_id, 0)), (COALESCE(driver_id, 0)))
+            DO UPDATE SET count = {table}.count + EXCLUDED.count,
+                          counts = ARRAY(
+                              SELECT stored + added
+                              FROM unnest({table}.counts, EXCLUDED.counts) WITH ORDINALITY AS bucket(stored, added, i)
+                              ORDER BY i
+                          )
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    @staticmethod
+    def percentiles(type, min_date, max_date, venue_id=None, driver_id=None):
+        """
+        Returns the count, p50, p90 and p99 in seconds of type from min_date to max_date (inclusive), for one venue,
+        one driver or every venue when neither is given, by merging their daily sketches.
+        """
+        queryset = TimingSketch.objects.filter(type=type, date__gte=min_date, date__lte=max_date)
+
+        if driver_id:
+            queryset = queryset.filter(driver_id=driver_id)
+        elif venue_id:
+            queryset = queryset.filter(venue_id=venue_id)
+        else:
+            # Delivery times are in both the venue and the driver sketches, only the venue ones are merged
+            queryset = queryset.filter(venue__isnull=False)
+
+        counts = Histogram.merge(queryset.values_list("counts", flat=True))
+        estimates = Histogram.quantiles(counts, [0.5, 0.9, 0.99])
+
+        return {
+            "count": sum(counts),
+            "p50": estimates[0.5],
+            "p90": estimates[0.9],
+            "p99": estimates[0.99]
+        }
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import List
+
+urlpatterns = [
+    path('', List.as_view()),
+]
\ No newline at end of file
@@ -0,0 +1,38 @@
+from __future__ import unicode_literals
+
+from .models import TimingSketch
+
+from rest_framework import status
+
+from rest_framework.response import Response
+
+from ..utils.Permissions import (
+    IsAdminPermission,
+)
+
+from ..utils import QueryParams, Constants, DateUtils
+
+from ..utils.Views import SmartAPIView
+
+
+class List(SmartAPIView):
+    permission_classes = [IsAdminPermission, ]
+
+    def get(self, request):
+        type = QueryParams.get_enum(request, "type", Constants.TIMING_SKETCH_TYPES, raise_exception=True)
+        venue_id = QueryParams.get_int(request, "venue_id")
+        driver_id = QueryParams.get_int(request, "driver_id")
+        min_date = QueryParams.get_date(request, "min_date", DateUtils.last_week().date())
+        max_date = QueryParams.get_date(request, "max_date", DateUtils.today().date())
+
+        if venue_id and driver_id:
+            return self.respond_with("Only one of 'venue_id' and 'driver_id' can be given",
+                                     status_code=status.HTTP_400_BAD_REQUEST)
+
+        if max_date < min_date:
+            return self.respond_with("'max_date' cannot be less than 'min_date'", status_code=status.HTTP_400_BAD_REQUEST)
+
+        # Merged from the daily sketches of the range, see TimingSketch
+        data = TimingSketch.percentiles(type, min_date, max_date, venue_id=venue_id, driver_id=driver_id)
+
+        return Response(data, status=status.HTTP_200_OK)
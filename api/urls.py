@@ -51,6 +51,10 @@ urlpatterns = [
 
     path("daily-stats", include("api.daily_stat.urls")),
 
+    path("timing-sketches", include("api.timing_sketch.urls")),
+
+    path("demand-cells", include("api.demand_cell.urls")),
+
     path("delivery-requests", include("api.delivery_request.urls")),
 
     path("payments", include("api.payment.urls")),
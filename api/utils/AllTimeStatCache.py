@@ -0,0 +1,101 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from . import Api
+
+# Every all time stat of this process as (version, {type: value}), shared by every thread. The version is the one
+# row of api_alltimestatversion which every write to api_alltimestat increments in the same statement, see
+# AllTimeStat.update and StatsAccumulator. Those writes run after the request that made them commits, each in a
+# transaction of its own, so the version row is only locked for one statement.
+_snapshot = None
+
+_checked_at = None
+
+_lock = threading.Lock()
+
+VERSION_TABLE = "api_alltimestatversion"
+
+
+def get(types):
+    """
+    Returns {type: value} for every one of types, 0 for the ones that were never written.
+    """
+    values = _get_snapshot()[1]
+    return {type: values.get(type, 0) for type in types}
+
+
+def apply(version, values):
+    """
+    Applies values returned by a committed write that moved the stats to version. When another write happened since
+    the snapshot was taken the snapshot is dropped instead, the next read reloads it.
+    """
+    global _snapshot
+
+    with _lock:
+        if _snapshot is None:
+            return
+
+        if version != _snapshot[0] + 1:
+            _snapshot = None
+            return
+
+        _snapshot = (version, {**_snapshot[1], **values})
+
+
+def clear():
+    global _snapshot, _checked_at
+
+    with _lock:
+        _snapshot = None
+        _checked_at = None
+
+
+def _get_snapshot():
+    global _snapshot, _checked_at
+
+    # Tests flush the stats between every case but not the version
+    if getattr(settings, "TESTING", False):
+        return _load()
+
+    with _lock:
+        current = _snapshot
+        if current is not None and time.monotonic() - _checked_at < Api.ALL_TIME_STAT_CACHE_IN_SECONDS:
+            return current
+
+    if current is not None and current[0] == _read_version():
+        with _lock:
+            _checked_at = time.monotonic()
+        return current
+
+    snapshot = _load()
+
+    with _lock:
+        _snapshot = snapshot
+        _checked_at = time.monotonic()
+
+    return snapshot
+
+
+def _read_version():
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT value FROM {VERSION_TABLE} WHERE id = 1")
+        return cursor.fetchone()[0]
+
+
+def _load():
+    from ..all_time_stat.models import AllTimeStat
+
+    # One statement, so the version and the stats are read from the same snapshot of the database
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT version.value, stat.type, stat.value
+            FROM {VERSION_TABLE} AS version
+            LEFT JOIN {AllTimeStat._meta.db_table} AS stat ON stat.deleted_at IS NULL
+            WHERE version.id = 1
+        """)
+        rows = cursor.fetchall()
+
+    return rows[0][0], {type: int(value) for version, type, value in rows if type is not None}
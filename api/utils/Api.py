@@ -24,6 +24,34 @@ NO_ANSWER_DISTANCE_TO_CUSTOMER_IN_KMS = int(os.environ["NO_ANSWER_DISTANCE_TO_CU
 LOWER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS = int(os.environ["LOWER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS"])
 UPPER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS = int(os.environ["UPPER_MAX_DRIVER_DISTANCE_TO_VENUE_IN_KMS"])
 
+# Delivery requests are sent in waves to this many of the closest free drivers of an order at a time
+DISPATCH_WAVE_SIZE = int(os.getenv("DISPATCH_WAVE_SIZE", 3))
+
+# The dispatch loop sends an order's next wave once its last one is this old, or as soon as none of it is pending
+DISPATCH_WAVE_TIMEOUT_IN_SECONDS = int(os.getenv("DISPATCH_WAVE_TIMEOUT_IN_SECONDS", 20))
+
+# Driver location pings are buffered per process and written in batches this often, 0 writes every ping straight away
+DRIVER_LOCATION_FLUSH_INTERVAL_IN_SECONDS = int(os.getenv("DRIVER_LOCATION_FLUSH_INTERVAL_IN_SECONDS", 5))
+
+# Every driver location ping is appended to per driver per day files under this directory. It has to be storage every
+# web and worker process mounts and that outlives them (not a dyno's own disk), or replays only see some of the pings
+DRIVER_LOCATION_HISTORY_DIRECTORY = os.environ["DRIVER_LOCATION_HISTORY_DIRECTORY"]
+
+# How long each process keeps its copy of the DeliveryDistance tiers before reloading them
+DELIVERY_DISTANCE_CACHE_IN_SECONDS = int(os.getenv("DELIVERY_DISTANCE_CACHE_IN_SECONDS", 60))
+
+# Push notification batches sent at the same time per process
+PUSH_NOTIFICATION_WORKERS = int(os.getenv("PUSH_NOTIFICATION_WORKERS", 8))
+
+# Daily and all time stat deltas are buffered per process and written in batches this often, 0 writes them straight away
+STATS_FLUSH_INTERVAL_IN_SECONDS = int(os.getenv("STATS_FLUSH_INTERVAL_IN_SECONDS", 5))
+
+# How long each process serves its copy of the all time stats before checking whether another process changed them
+ALL_TIME_STAT_CACHE_IN_SECONDS = int(os.getenv("ALL_TIME_STAT_CACHE_IN_SECONDS", 5))
+
+# Longest each process keeps its copy of the categories, it's reloaded as soon as any process changes them
+CATEGORY_TREE_CACHE_IN_SECONDS = int(os.getenv("CATEGORY_TREE_CACHE_IN_SECONDS", 60))
+
 
 RETURN_EMAILS = os.environ["RETURN_EMAILS"]
 
@@ -0,0 +1,120 @@
+import threading
+import time
+
+from django.db import connection
+
+from . import Api
+
+# Copy of the categories shared by every thread of this process, as (categories by id, subcategory ids by parent id,
+# ids of the categories on each venue's menu by venue id). Deleted categories are kept, the queryset they're used with
+# decides whether they are listed. It's served for as long as the version, which the triggers of migration 0064 move
+# whenever a category or menu category is written by any process, hasn't changed.
+_tree = None
+
+_version = None
+
+_loaded_at = None
+
+_lock = threading.Lock()
+
+VERSION_SEQUENCE = "api_categorytree_version"
+
+
+def _get_tree():
+    global _tree, _version, _loaded_at
+
+    # Read before the categories, so a write that commits while they're loaded is seen by the next call
+    version = _read_version()
+
+    with _lock:
+        if _tree is not None and _version == version and not _expired():
+            return _tree
+
+    from ..category.models import Category
+    from ..menu_category.models import MenuCategory
+
+    categories = {category.id: category for category in
+                  Category.all_objects.only("id", "title", "parent_id", "item_count", "menu_item_count")}
+
+    subcategory_ids = {}
+
+    for category in categories.values():
+        if category.parent_id is not None:
+            subcategory_ids.setdefault(category.parent_id, []).append(category.id)
+
+    # Menu ids are venue ids. Deleted menu categories still count, as they did when venues were joined
+    category_ids_by_venue_id = {}
+
+    for venue_id, category_id in MenuCategory.all_objects.values_list("menu_id", "category_id"):
+        category_ids_by_venue_id.setdefault(venue_id, set()).add(category_id)
+
+    tree = (categories, subcategory_ids, category_ids_by_venue_id)
+
+    with _lock:
+        _tree = tree
+        _version = version
+        _loaded_at = time.monotonic()
+
+    return tree
+
+
+def clear():
+    global _tree, _version, _loaded_at
+
+    with _lock:
+        _tree = None
+        _version = None
+        _loaded_at = None
+
+
+def filter_ids(search_term=None, has_parent=None, parent_id=None, has_items=False, has_menu_items=False,
+               venue_id=None):
+    """
+    Returns the ids of the categories that match every filter given, the same ones the category list used to find
+    by joining menu categories.
+    """
+    categories, subcategory_ids, category_ids_by_venue_id = _get_tree()
+
+    venue_category_ids = category_ids_by_venue_id.get(venue_id, set()) if venue_id else None
+    search_term = search_term.lower() if search_term else None
+
+    if parent_id is not None:
+        candidates = [categories[id] for id in subcategory_ids.get(parent_id, [])]
+    else:
+        candidates = categories.values()
+
+    ids = []
+
+    for category in candidates:
+        if search_term and search_term not in category.title.lower():
+            continue
+
+        if has_parent is not None and (category.parent_id is not None) != has_parent:
+            continue
+
+        if has_items and not category.item_count > 0:
+            continue
+
+        if has_menu_items and not category.menu_item_count > 0:
+            continue
+
+        # Subcategories belong to a venue through their parent
+        if venue_category_ids is not None and \
+                (category.parent_id if has_parent else category.id) not in venue_category_ids:
+            continue
+
+        ids.append(category.id)
+
+    return ids
+
+
+def _read_version():
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT last_value FROM {VERSION_SEQUENCE}")
+        return cursor.fetchone()[0]
+
+
+def _expired():
+    # The version moves right before a write commits, a copy loaded in between is stamped with the new version but
+    # misses the write. This bounds how long such a copy is served
+    return time.monotonic() - _loaded_at >= Api.CATEGORY_TREE_CACHE_IN_SECONDS
@@ -166,6 +166,14 @@ DAILY_STAT_TYPES = [
     DAILY_STAT_TYPE_PLATFORM_EARNINGS
 ]
 
+TIMING_SKETCH_TYPE_ACCEPT_TIME = "accept_time"
+TIMING_SKETCH_TYPE_DELIVERY_TIME = "delivery_time"
+
+TIMING_SKETCH_TYPES = [
+    TIMING_SKETCH_TYPE_ACCEPT_TIME,
+    TIMING_SKETCH_TYPE_DELIVERY_TIME
+]
+
 DAY_MONDAY = "monday"
 DAY_TUESDAY = "tuesday"
 DAY_WEDNESDAY = "wednesday"
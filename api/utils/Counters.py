@@ -0,0 +1,86 @@
+from django.db import connection
+
+
+def add(model, rows, averages=None, latest=None):
+    """
+    Applies rows ({id: {column: value}}) to the model's rows with one UPDATE ... FROM (VALUES ...).
+    Values are added to their column, except for the columns in latest which keep the greater of the stored and the
+    given value. Every column of averages ({average column: (total column, count column)}) is recomputed from its new
+    total and count in the same statement. Returns the number of rows updated.
+    """
+    rows = {id: values for id, values in rows.items() if values}
+
+    if not rows:
+        return 0
+
+    averages = averages or {}
+    latest = set(latest or [])
+
+    quote = connection.ops.quote_name
+
+    columns = sorted({column for values in rows.values() for column in values})
+    fields = {column: model._meta.get_field(column) for column in columns + [column for average in averages.values()
+                                                                             for column in average]}
+
+    placeholders = ["%s::bigint"] + [f"%s::{fields[column].db_type(connection)}" for column in columns]
+
+    params = []
+
+    for id in sorted(rows):
+        params.append(id)
+        params.extend(rows[id].get(column, None if column in latest else 0) for column in columns)
+
+    def new_value(column):
+        name = quote(fields[column].column)
+
+        if column not in columns:
+            return f"target.{name}"
+
+        if column in latest:
+            return f"GREATEST(target.{name}, delta.{name})"
+
+        return f"target.{name} + delta.{name}"
+
+    assignments = [f"{quote(fields[column].column)} = {new_value(column)}" for column in columns]
+
+    for average, (total, count) in averages.items():
+        if total not in columns and count not in columns:
+            continue
+
+        name = quote(model._meta.get_field(average).column)
+        assignments.append(f"{name} = COALESCE(({new_value(total)}) / NULLIF({new_value(count)}, 0), target.{name})")
+
+    values = ", ".join(f"({', '.join(placeholders)})" for _ in rows)
+
+    sql = f"""
+        UPDATE {quote(model._meta.db_table)} AS target
+        SET {", ".join(assignments)}
+        FROM (VALUES {values}) AS delta(id, {", ".join(quote(fields[column].column) for column in columns)})
+        WHERE target.{quote(model._meta.pk.column)} = delta.id
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def collect(deltas, latest=None):
+    """
+    Merges (id, {column: value}) pairs into the rows add takes, values of the same row and column are summed, or the
+    greatest one is kept for the columns in latest.
+    """
+    latest = set(latest or [])
+    rows = {}
+
+    for id, values in deltas:
+        row = rows.setdefault(id, {})
+
+        for column, value in values.items():
+            if column not in row:
+                row[column] = value
+            elif column in latest:
+                row[column] = max(row[column], value)
+            else:
+                row[column] += value
+
+    return rows
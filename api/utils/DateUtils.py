@@ -252,6 +252,13 @@ def minutes_between(starts_at, ends_at):
     return difference.total_seconds()/60
 
 
+def to_aware(date):
+    if timezone.is_naive(date):
+        return timezone.make_aware(date, pytz.UTC)
+
+    return date
+
+
 def convert_to_dublin_time(utctime):
     utc = utctime.replace(tzinfo=pytz.UTC)
     dublin_tmz = utc.astimezone(pytz.timezone('Europe/Dublin'))
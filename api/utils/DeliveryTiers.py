@@ -0,0 +1,91 @@
+import bisect
+import threading
+import time
+
+from django.conf import settings
+
+from . import Api
+
+# Copy of the DeliveryDistance table shared by every thread of this process, as (tiers ordered by starts, their ends).
+# Tiers are contiguous (the 1st starts at 0 and each one starts where the previous one ends), so a distance is looked
+# up by bisecting the ends.
+_table = None
+
+_loaded_at = None
+
+_lock = threading.Lock()
+
+
+def _get_table():
+    global _table, _loaded_at
+
+    with _lock:
+        if _table is not None and not _expired():
+            return _table
+
+    from ..delivery_distance.models import DeliveryDistance
+
+    tiers = list(DeliveryDistance.objects.order_by("starts"))
+    table = (tiers, [float(tier.ends) for tier in tiers])
+
+    with _lock:
+        _table = table
+        _loaded_at = time.monotonic()
+
+    return table
+
+
+def get():
+    """
+    Returns the DeliveryDistance tiers ordered by starts.
+    """
+    return _get_table()[0]
+
+
+def clear():
+    global _table, _loaded_at
+
+    with _lock:
+        _table = None
+        _loaded_at = None
+
+
+def table():
+    """
+    Returns a snapshot to pass to find() when looking up many distances against the same tiers.
+    """
+    return _get_table()
+
+
+def find(distance, snapshot=None):
+    """
+    Returns the tier distance (kms) falls in, None if it's beyond the longest one.
+    Same boundaries as DeliveryDistance.get_by_distance.
+    """
+    tiers, ends = snapshot or _get_table()
+
+    if not tiers:
+        return None
+
+    if distance == 0:
+        return tiers[0] if tiers[0].starts == 0 else None
+
+    index = bisect.bisect_left(ends, distance)
+
+    if index == len(tiers) or not float(tiers[index].starts) < distance:
+        return None
+
+    return tiers[index]
+
+
+def longest():
+    tiers = get()
+    return tiers[-1] if tiers else None
+
+
+def _expired():
+    # Other processes only see tier changes when their copy expires, tests change tiers between every case
+    if getattr(settings, "TESTING", False):
+        return True
+
+    return time.monotonic() - _loaded_at >= Api.DELIVERY_DISTANCE_CACHE_IN_SECONDS
@@ -0,0 +1,144 @@
+import math
+import threading
+import datetime
+
+from haversine import haversine
+
+from . import DriverLocationBuffer
+
+# A uniform lat/lng grid of driver positions kept in the dispatch process, so create_for can
+# find the drivers around a venue without casting every driver location to geography.
+# Cells are ~5.5km tall (and ~3.3km wide around Dublin), so a dispatch radius only walks a few cells.
+CELL_SIZE_IN_DEGREES = 0.05
+
+KMS_PER_DEGREE_OF_LATITUDE = 111.32
+
+# Rows are re-read for this long after a sync, so rows saved by transactions that committed after it started, or by a
+# server whose clock is slightly behind the database's, are not skipped. Buffered pings are stamped by the database
+# when they're written, see DriverLocationBuffer.flush, so how long they waited in a buffer doesn't matter.
+SYNC_OVERLAP_IN_SECONDS = 10
+
+_lock = threading.Lock()
+
+_cells = {}
+
+_drivers = {}
+
+_synced_at = None
+
+
+def _cell_for(longitude, latitude):
+    return math.floor(latitude / CELL_SIZE_IN_DEGREES), math.floor(longitude / CELL_SIZE_IN_DEGREES)
+
+
+def _remove(driver_id):
+    current = _drivers.pop(driver_id, None)
+
+    if current is None:
+        return
+
+    cell = _cells.get(current["cell"])
+
+    if cell is None:
+        return
+
+    cell.discard(driver_id)
+
+    if not cell:
+        del _cells[current["cell"]]
+
+
+def _update(driver_id, point):
+    _remove(driver_id)
+
+    if point is None:
+        return
+
+    longitude = point.coords[0]
+    latitude = point.coords[1]
+    cell = _cell_for(longitude, latitude)
+
+    _drivers[driver_id] = {
+        "longitude": longitude,
+        "latitude": latitude,
+        "cell": cell
+    }
+
+    _cells.setdefault(cell, set()).add(driver_id)
+
+
+def clear():
+    global _synced_at
+
+    with _lock:
+        _cells.clear()
+        _drivers.clear()
+        _synced_at = None
+
+
+def sync():
+    """
+    Pulls every driver whose location (or row) changed since the last sync into the index.
+    The first call loads all drivers with a known location.
+    """
+    from django.db import connection
+    from ..driver.models import Driver
+
+    global _synced_at
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT statement_timestamp()")
+        started_at = cursor.fetchone()[0]
+
+    with _lock:
+        if _synced_at is None:
+            rows = Driver.objects.filter(last_known_location__isnull=False)
+        else:
+            rows = Driver.all_objects.filter(updated_at__gte=_synced_at)
+
+        rows = rows.values_list("user_id", "last_known_location", "last_known_location_updated_at", "deleted_at")
+
+        for driver_id, point, updated_at, deleted_at in rows:
+            if deleted_at is not None:
+                _remove(driver_id)
+                continue
+
+            # A ping still waiting in this process' write buffer is fresher than the stored location
+            buffered = DriverLocationBuffer.get(driver_id)
+            if buffered and (updated_at is None or buffered["updated_at"] > updated_at):
+                point = buffered["point"]
+
+            _update(driver_id, point)
+
+        _synced_at = started_at - datetime.timedelta(seconds=SYNC_OVERLAP_IN_SECONDS)
+
+
+def nearby(point, max_distance):
+    """
+    Returns the ids of the indexed drivers within max_distance kms of point, closest first.
+    """
+    longitude = point.coords[0]
+    latitude = point.coords[1]
+    max_distance = float(max_distance)
+
+    latitude_span = max_distance / KMS_PER_DEGREE_OF_LATITUDE
+    longitude_span = max_distance / (KMS_PER_DEGREE_OF_LATITUDE * max(math.cos(math.radians(latitude)), 0.01))
+
+    min_cell = _cell_for(longitude - longitude_span, latitude - latitude_span)
+    max_cell = _cell_for(longitude + longitude_span, latitude + latitude_span)
+
+    found = []
+
+    with _lock:
+        for latitude_index in range(min_cell[0], max_cell[0] + 1):
+            for longitude_index in range(min_cell[1], max_cell[1] + 1):
+                for driver_id in _cells.get((latitude_index, longitude_index), ()):
+                    driver = _drivers[driver_id]
+                    distance = haversine((latitude, longitude), (driver["latitude"], driver["longitude"]))
+
+                    if distance <= max_distance:
+                        found.append((distance, driver_id))
+
+    found.sort()
+
+    return [driver_id for distance, driver_id in found]
@@ -0,0 +1,175 @@
+import atexit
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from . import Api
+
+import logging
+logger = logging.getLogger('clinks-api-live')
+
+# Latest location ping per driver that hasn't been written yet, shared by every thread of this process.
+# Each entry is {"point": Point or None, "updated_at": datetime}, a None point means the location was reset.
+_pending = {}
+
+# Entries taken out of _pending by the flush that is currently running, still served to readers
+_flushing = {}
+
+_lock = threading.Lock()
+
+_flusher = None
+
+_registered_exit_flush = False
+
+
+def add(driver_id, point, updated_at):
+    """
+    Keeps the ping if it is newer than the one already buffered for the driver, stale pings are dropped.
+    Returns True when the ping was kept.
+    """
+    with _lock:
+        current = _pending.get(driver_id) or _flushing.get(driver_id)
+
+        if current and current["updated_at"] > updated_at:
+            logger.info(f"Dropping stale location ping for driver {driver_id} from {updated_at}")
+            return False
+
+        _pending[driver_id] = {
+            "point": point,
+            "updated_at": updated_at
+        }
+
+    if _writes_through():
+        flush()
+    else:
+        _start_flusher()
+
+    return True
+
+
+def get(driver_id):
+    with _lock:
+        return _pending.get(driver_id) or _flushing.get(driver_id)
+
+
+def apply(driver):
+    """
+    Overlays the buffered location on a driver loaded from the database, if it is fresher.
+    """
+    buffered = get(driver.user_id)
+
+    if not buffered:
+        return driver
+
+    updated_at = driver.last_known_location_updated_at
+
+    if updated_at is None or buffered["updated_at"] > updated_at:
+        driver.last_known_location = buffered["point"]
+        driver.last_known_location_updated_at = buffered["updated_at"]
+
+    return driver
+
+
+def flush():
+    """
+    Writes every buffered ping with one multi-row UPDATE. A row is only updated when the ping is newer than the
+    stored location, so pings buffered by another process can't overwrite a fresher one. updated_at is set by the
+    database when the row is written, DriverIndex.sync picks rows up by it.
+    """
+    from ..driver.models import Driver
+
+    with _lock:
+        if not _pending:
+            return 0
+
+        _flushing.update(_pending)
+        _pending.clear()
+        entries = list(_flushing.items())
+
+    values = []
+    params = []
+
+    for driver_id, entry in entries:
+        point = entry["point"]
+        values.append("(%s::bigint, %s::double precision, %s::double precision, %s::timestamptz)")
+        params.extend([driver_id,
+                       point.coords[0] if point else None,
+                       point.coords[1] if point else None,
+                       entry["updated_at"]])
+
+    sql = f"""
+        UPDATE {Driver._meta.db_table} AS driver
+        SET last_known_location = ST_SetSRID(ST_MakePoint(ping.longitude, ping.latitude), 4326),
+            last_known_location_updated_at = ping.updated_at,
+            updated_at = statement_timestamp()
+        FROM (VALUES {", ".join(values)}) AS ping(user_id, longitude, latitude, updated_at)
+        WHERE driver.user_id = ping.user_id
+          AND (driver.last_known_location_updated_at IS NULL OR driver.last_known_location_updated_at < ping.updated_at)
+    """
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            updated_count = cursor.rowcount
+    except Exception:
+        # Put the pings back so the next flush retries them, unless a newer ping arrived in the meantime
+        with _lock:
+            for driver_id, entry in entries:
+                current = _pending.get(driver_id)
+                if not current or current["updated_at"] < entry["updated_at"]:
+                    _pending[driver_id] = entry
+                _flushing.pop(driver_id, None)
+        raise
+
+    with _lock:
+        for driver_id, entry in entries:
+            if _flushing.get(driver_id) is entry:
+                del _flushing[driver_id]
+
+    logger.info(f"Flushed {len(entries)} driver location pings, {updated_count} were newer than the stored location")
+
+    return updated_count
+
+
+def _writes_through():
+    return Api.DRIVER_LOCATION_FLUSH_INTERVAL_IN_SECONDS <= 0 or getattr(settings, "TESTING", False)
+
+
+def _run_flusher():
+    while True:
+        time.sleep(Api.DRIVER_LOCATION_FLUSH_INTERVAL_IN_SECONDS)
+
+        try:
+            flush()
+        except Exception as e:
+            logger.error(f"Failed to flush driver location pings: {e}")
+        finally:
+            # This thread's connection isn't managed by the request cycle
+            connection.close()
+
+
+def _start_flusher():
+    global _flusher, _registered_exit_flush
+
+    if _flusher is not None and _flusher.is_alive():
+        return
+
+    with _lock:
+        if _flusher is not None and _flusher.is_alive():
+            return
+
+        _flusher = threading.Thread(target=_run_flusher, name="driver-location-flusher", daemon=True)
+        _flusher.start()
+
+        if not _registered_exit_flush:
+            atexit.register(_flush_on_exit)
+            _registered_exit_flush = True
+
+
+def _flush_on_exit():
+    try:
+        flush()
+    except Exception as e:
+        logger.error(f"Failed to flush driver location pings on exit: {e}")
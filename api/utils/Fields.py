@@ -31,3 +31,24 @@ class EnumField(models.Field):
         return "enum({0})".format( ','.join("'%s'" % v for v in self.values) )
 
 
+class WordSimilar(models.Lookup):
+    """
+    field__word_similar=value is true when value is close to a run of words of field, see pg_trgm's word_similarity.
+    It can use a trigram GIN index of the field.
+    """
+    lookup_name = "word_similar"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} %%> {rhs}", lhs_params + rhs_params
+
+
+class SearchDocumentField(models.TextField):
+    """
+    The lowercased text a row is searched by, see utils.Search.
+    """
+    pass
+
+
+SearchDocumentField.register_lookup(WordSimilar)
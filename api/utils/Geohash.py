@@ -0,0 +1,114 @@
+import math
+
+from haversine import haversine
+
+BASE_32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Distances between a point and a cell are measured on the lat/lng rectangle of the cell, which is off by a few meters
+# at most for the cell sizes used here. Cells are widened by this much so that is never under counted.
+EDGE_TOLERANCE_IN_KMS = 0.01
+
+
+def encode(latitude, longitude, precision):
+    latitude_range = [-90.0, 90.0]
+    longitude_range = [-180.0, 180.0]
+
+    geohash = []
+    bits = 0
+    bit_count = 0
+    is_longitude = True
+
+    while len(geohash) < precision:
+        value_range, value = (longitude_range, longitude) if is_longitude else (latitude_range, latitude)
+        middle = (value_range[0] + value_range[1]) / 2
+
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            value_range[0] = middle
+        else:
+            value_range[1] = middle
+
+        is_longitude = not is_longitude
+        bit_count += 1
+
+        if bit_count == 5:
+            geohash.append(BASE_32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+def decode(geohash):
+    """
+    Returns the (latitude, longitude) of the center of the cell.
+    """
+    latitude_range = [-90.0, 90.0]
+    longitude_range = [-180.0, 180.0]
+
+    is_longitude = True
+
+    for character in geohash:
+        bits = BASE_32.index(character)
+
+        for shift in range(4, -1, -1):
+            value_range = longitude_range if is_longitude else latitude_range
+            middle = (value_range[0] + value_range[1]) / 2
+
+            if bits >> shift & 1:
+                value_range[0] = middle
+            else:
+                value_range[1] = middle
+
+            is_longitude = not is_longitude
+
+    return (latitude_range[0] + latitude_range[1]) / 2, (longitude_range[0] + longitude_range[1]) / 2
+
+
+def cell_size(precision):
+    """
+    Returns the (latitude, longitude) span of a cell in degrees.
+    """
+    bit_count = precision * 5
+    longitude_bit_count = math.ceil(bit_count / 2)
+    latitude_bit_count = bit_count // 2
+
+    return 180.0 / (2 ** latitude_bit_count), 360.0 / (2 ** longitude_bit_count)
+
+
+def cells_within(latitude, longitude, radius, precision):
+    """
+    Yields (geohash, min_distance, max_distance) for every cell that has a point within radius kms of
+    (latitude, longitude), with the closest and furthest distance in kms from it to the cell.
+    """
+    latitude_span, longitude_span = cell_size(precision)
+
+    latitude_radius = radius / 111.32
+    longitude_radius = radius / (111.32 * max(math.cos(math.radians(latitude)), 0.01))
+
+    first_row = math.floor((latitude - latitude_radius + 90) / latitude_span)
+    last_row = math.floor((latitude + latitude_radius + 90) / latitude_span)
+    first_column = math.floor((longitude - longitude_radius + 180) / longitude_span)
+    last_column = math.floor((longitude + longitude_radius + 180) / longitude_span)
+
+    for row in range(first_row, last_row + 1):
+        south = row * latitude_span - 90
+        north = south + latitude_span
+
+        for column in range(first_column, last_column + 1):
+            west = column * longitude_span - 180
+            east = west + longitude_span
+
+            closest = (min(max(latitude, south), north), min(max(longitude, west), east))
+            min_distance = max(haversine((latitude, longitude), closest) - EDGE_TOLERANCE_IN_KMS, 0)
+
+            if min_distance > radius:
+                continue
+
+            max_distance = max(haversine((latitude, longitude), corner)
+                               for corner in ((south, west), (south, east), (north, west), (north, east)))
+
+            geohash = encode((south + north) / 2, (west + east) / 2, precision)
+
+            yield geohash, min_distance, max_distance + EDGE_TOLERANCE_IN_KMS
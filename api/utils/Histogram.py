@@ -0,0 +1,82 @@
+import math
+
+# Fixed log buckets of durations in seconds. Bucket 0 holds everything under a second, after that every bucket is
+# 2^(1/8) (about 9%) wider than the one before it, up to the last bucket which holds everything from ~33 hours on.
+# Every histogram has the same buckets, so merging histograms is summing them bucket by bucket.
+BUCKETS_PER_DOUBLING = 8
+
+BUCKET_COUNT = 1 + BUCKETS_PER_DOUBLING * 17
+
+
+def empty():
+    return [0] * BUCKET_COUNT
+
+
+def of(values):
+    """
+    Returns the histogram of values, durations in seconds.
+    """
+    counts = empty()
+
+    for value in values:
+        counts[bucket_for(value)] += 1
+
+    return counts
+
+
+def bucket_for(value):
+    if value < 1:
+        return 0
+
+    return min(1 + int(math.log2(value) * BUCKETS_PER_DOUBLING), BUCKET_COUNT - 1)
+
+
+def lower_bound(bucket):
+    if bucket == 0:
+        return 0
+
+    return 2 ** ((bucket - 1) / BUCKETS_PER_DOUBLING)
+
+
+def upper_bound(bucket):
+    return 2 ** (bucket / BUCKETS_PER_DOUBLING)
+
+
+def merge(histograms):
+    counts = empty()
+
+    for histogram in histograms:
+        for bucket, count in enumerate(histogram):
+            counts[bucket] += count
+
+    return counts
+
+
+def quantiles(counts, qs):
+    """
+    Returns {q: estimate} for every q of qs (0 < q <= 1), None when counts is empty. An estimate is the middle of
+    the bucket the q-th value falls in, so it's within ~5% of the real value.
+    """
+    total = sum(counts)
+
+    if total == 0:
+        return {q: None for q in qs}
+
+    estimates = {}
+
+    for q in qs:
+        rank = max(math.ceil(q * total), 1)
+        seen = 0
+
+        for bucket, count in enumerate(counts):
+            seen += count
+
+            if seen >= rank:
+                break
+
+        if bucket == 0:
+            estimates[q] = 0
+        else:
+            estimates[q] = round(math.sqrt(lower_bound(bucket) * upper_bound(bucket)))
+
+    return estimates
@@ -16,6 +16,7 @@ def import_file(job_id, user_id):
     current_user = User.objects.get(id=user_id)
 
     skipped_rows = []
+    created_item_ids = []
     index = 1
 
     for row in rows:
@@ -66,6 +67,11 @@ def import_file(job_id, user_id):
 
         if not created:
             skipped_rows.append({"row": index, "reason": f"Item with this title: {title} already exists"})
+        else:
+            created_item_ids.append(item.id)
+
+    # One update for the whole file instead of one per row
+    Item.update_search_documents(item_ids=created_item_ids)
 
     if len(skipped_rows) > 0:
         from ..tasks import send_mail
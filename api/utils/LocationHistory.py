@@ -0,0 +1,92 @@
+import datetime
+import mmap
+import os
+import struct
+
+import pytz
+
+from . import Api
+
+import logging
+logger = logging.getLogger('clinks-api-live')
+
+# Append only history of driver location pings, one file per driver per (UTC) day.
+# Every ping is a fixed width record of timestamp (uint32 seconds since epoch), latitude and longitude (float32, ~1m),
+# so a driver pinging every 5 seconds for a whole day takes ~200KB and a ping never costs a database row.
+RECORD = struct.Struct("<Iff")
+
+
+def _path_for(driver_id, date):
+    return os.path.join(Api.DRIVER_LOCATION_HISTORY_DIRECTORY, date.isoformat(), f"{driver_id}.bin")
+
+
+def _to_utc(value):
+    if value.tzinfo is None:
+        return value.replace(tzinfo=pytz.UTC)
+
+    return value.astimezone(pytz.UTC)
+
+
+def append(driver_id, point, recorded_at):
+    if point is None:
+        return
+
+    recorded_at = _to_utc(recorded_at)
+    path = _path_for(driver_id, recorded_at.date())
+
+    record = RECORD.pack(int(recorded_at.timestamp()), point.coords[1], point.coords[0])
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Writes this small with O_APPEND are atomic, so every worker process can append to the same file
+        file_descriptor = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(file_descriptor, record)
+        finally:
+            os.close(file_descriptor)
+    except OSError as e:
+        logger.error(f"Failed to append location history for driver {driver_id}: {e}")
+
+
+def read(driver_id, starts_at, ends_at):
+    """
+    Yields the pings of a driver between starts_at and ends_at, in the order they were received.
+    """
+    starts_at = _to_utc(starts_at)
+    ends_at = _to_utc(ends_at)
+
+    starts_at_timestamp = starts_at.timestamp()
+    ends_at_timestamp = ends_at.timestamp()
+
+    date = starts_at.date()
+
+    while date <= ends_at.date():
+        yield from _read_day(driver_id, date, starts_at_timestamp, ends_at_timestamp)
+        date += datetime.timedelta(days=1)
+
+
+def _read_day(driver_id, date, starts_at_timestamp, ends_at_timestamp):
+    path = _path_for(driver_id, date)
+
+    if not os.path.exists(path):
+        return
+
+    with open(path, "rb") as file:
+        # A record that is still being appended is left out
+        size = os.fstat(file.fileno()).st_size
+        size -= size % RECORD.size
+
+        if size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ) as records:
+            pings = [record for record in RECORD.iter_unpack(records)
+                     if starts_at_timestamp <= record[0] <= ends_at_timestamp]
+
+    for timestamp, latitude, longitude in pings:
+        yield {
+            "latitude": latitude,
+            "longitude": longitude,
+            "recorded_at": datetime.datetime.fromtimestamp(timestamp, pytz.UTC)
+        }
@@ -1,12 +1,10 @@
-from django.db.models.functions import Cast
 from ..delivery_distance.models import DeliveryDistance
-from django.contrib.gis.db.models import PointField
-from django.db.models import F
 from django.contrib.gis.db.models.functions import Distance
-from django.contrib.gis.geos import fromstr, Point
+from django.contrib.gis.geos import fromstr
+from django.contrib.gis.measure import D
 
 
-def _get(queryset, point_field, point, annotate_distance=False, max_delivery_distance=None):
+def _get(queryset, geography_field, point, annotate_distance=False, max_delivery_distance=None):
     if not max_delivery_distance:
         max_delivery_distance = DeliveryDistance.objects.order_by("-ends").first()
 
@@ -15,29 +13,41 @@ def _get(queryset, point_field, point, annotate_distance=False, max_delivery_dis
         else:
             max_delivery_distance = max_delivery_distance.ends
 
-    queryset = queryset.annotate(point_geo=Cast(f"{point_field}", PointField(geography=True))).filter(
-        point_geo__distance_lte=(point, max_delivery_distance*1000))
+    point_in_srid = fromstr(f'POINT({point.coords[0]} {point.coords[1]})', srid=4326)
+
+    # geography_field is a stored geography column with a GiST index, so ST_DWithin can use the index
+    # instead of casting every candidate row
+    queryset = queryset.filter(**{f"{geography_field}__dwithin": (point_in_srid, D(km=max_delivery_distance))})
 
     if annotate_distance:
-        point_in_srid = fromstr(f'POINT({point.coords[0]} {point.coords[1]})', srid=4326)
-        queryset = queryset.annotate(distance=Distance("point_geo", point_in_srid))
+        queryset = queryset.annotate(distance=Distance(geography_field, point_in_srid))
 
     return queryset
 
 
+def _venue_ids(point):
+    from ..delivery_coverage.models import DeliveryCoverage
+    delivery_distances = DeliveryCoverage.delivery_distances_for(point)
+    return None if delivery_distances is None else list(delivery_distances.keys())
+
+
 def venues(queryset, point):
-    return _get(queryset, "address__point", point)
+    venue_ids = _venue_ids(point)
+
+    if venue_ids is None:
+        return queryset
+
+    return queryset.filter(id__in=venue_ids)
 
 
 def menu_items(queryset, point):
-    return _get(queryset, "menu__venue__address__point", point, True)
+    return _get(queryset, "menu__venue__address__point_geography", point, True)
 
 
 def items(queryset, point):
-    return _get(queryset, "menu_items__menu__venue__address__point", point)
+    venue_ids = _venue_ids(point)
 
+    if venue_ids is None:
+        return queryset
 
-def drivers(queryset, order, max_distance):
-    from ..driver.models import Driver
-    venue_point = Point(order.data["venue_address"]["longitude"], order.data["venue_address"]["latitude"])
-    return _get(queryset, "last_known_location", venue_point, max_delivery_distance=max_distance)
\ No newline at end of file
+    return queryset.filter(menu_items__menu__venue_id__in=venue_ids)
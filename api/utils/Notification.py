@@ -4,7 +4,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from push_notifications.models import APNSDevice, GCMDevice
-from . import Constants
+from . import Constants, Push
 
 from celery.utils.log import get_task_logger
 logger = get_task_logger(__name__)
@@ -51,25 +51,10 @@ def send_delivery_requests(delivery_requests):
         "type": Constants.NOTIFICATION_TYPE_ORDER_DELIVERY_REQUESTS
     }
 
-    # Collect all devices
-    all_android_devices = []
-    all_ios_devices = []
-
-    driver_ids = [delivery_request.driver.user_id for delivery_request in delivery_requests]
+    driver_ids = list({delivery_request.driver_id for delivery_request in delivery_requests})
     logger.info(f"Sending notifications to drivers: {driver_ids}")
 
-    for delivery_request in delivery_requests:
-        devices = get_devices(delivery_request.driver.user_id)
-        # Add to combined lists
-        all_android_devices.extend(devices["android"])
-        all_ios_devices.extend(devices["ios"])
-    
-    # Log device IDs before sending notifications
-    logger.info(f"Android devices: {[device.id for device in all_android_devices]}")
-    logger.info(f"iOS devices: {[device.id for device in all_ios_devices]}")
-
-    send_bulk(title, title, data, android_devices=devices["android"], ios_devices=devices["ios"])
-
+    Push.send_to_users(driver_ids, title, title, data)
 
 
 def send_returned_order_to_driver(order_id):
@@ -0,0 +1,188 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+from push_notifications.models import APNSDevice, GCMDevice
+
+from . import Api
+
+from celery.utils.log import get_task_logger
+logger = get_task_logger(__name__)
+
+# FCM takes up to 1000 registration ids per request, APNS batches are multiplexed over one HTTP/2 connection
+FCM_BATCH_SIZE = 1000
+APNS_BATCH_SIZE = 500
+
+# An APNS notification is kept by Apple for a month if the device is offline
+APNS_EXPIRATION_IN_SECONDS = 2592000
+
+_executor = None
+
+_executor_lock = threading.Lock()
+
+# Every worker thread keeps its own APNS connections open between sends, HTTP/2 connections aren't thread safe
+_local = threading.local()
+
+
+def send_to_users(user_ids, title, body, data=None, badge=0):
+    """
+    Sends a notification to every active device of user_ids. Devices are resolved with one query per platform and
+    sent in batches from a bounded pool of workers. Returns one report per batch with its latency and failure count.
+    """
+    if not user_ids:
+        return []
+
+    extra = dict(data or {})
+    extra.update({
+        "title": title,
+        "body": body
+    })
+
+    message = {
+        "title": title,
+        "body": body
+    }
+
+    batches = []
+
+    android_devices = GCMDevice.objects.filter(user_id__in=user_ids, active=True)
+    for (cloud_type, application_id), registration_ids in _group(android_devices.values_list(
+            "registration_id", "cloud_message_type", "application_id")).items():
+        for chunk in _chunks(registration_ids, FCM_BATCH_SIZE):
+            batches.append(("android", _send_fcm, (chunk, cloud_type, application_id, message, extra, badge)))
+
+    ios_devices = APNSDevice.objects.filter(user_id__in=user_ids, active=True)
+    for (application_id,), registration_ids in _group(ios_devices.values_list(
+            "registration_id", "application_id")).items():
+        for chunk in _chunks(registration_ids, APNS_BATCH_SIZE):
+            batches.append(("ios", _send_apns, (chunk, application_id, message, extra, badge)))
+
+    if not batches:
+        return []
+
+    futures = [(platform, len(args[0]), _get_executor().submit(_timed, send, *args))
+               for platform, send, args in batches]
+
+    reports = []
+    unregistered_tokens = []
+
+    for platform, size, future in futures:
+        latency, failures, unregistered, error = future.result()
+
+        report = {
+            "platform": platform,
+            "size": size,
+            "latency": latency,
+            "failures": failures
+        }
+        reports.append(report)
+        unregistered_tokens.extend(unregistered)
+
+        if error:
+            logger.error(f"'send_to_users': {platform} batch of {size} failed after {latency}ms: {error}")
+        else:
+            logger.info(f"'send_to_users': {platform} batch of {size} sent in {latency}ms with {failures} failures")
+
+    if unregistered_tokens:
+        APNSDevice.objects.filter(registration_id__in=unregistered_tokens).update(active=False)
+
+    return reports
+
+
+def _group(rows):
+    groups = {}
+    for registration_id, *key in rows:
+        groups.setdefault(tuple(key), []).append(registration_id)
+    return groups
+
+
+def _chunks(items, size):
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=Api.PUSH_NOTIFICATION_WORKERS,
+                                               thread_name_prefix="push-notification")
+    return _executor
+
+
+def _timed(send, *args):
+    """
+    Returns (latency in ms, failure count, unregistered apns tokens, error) of one batch, a batch never raises.
+    """
+    started_at = time.perf_counter()
+
+    try:
+        failures, unregistered = send(*args)
+        error = None
+    except Exception as e:
+        failures, unregistered, error = len(args[0]), [], e
+    finally:
+        # The push library may deactivate devices from this thread, its connection isn't managed by a request
+        connection.close()
+
+    return int((time.perf_counter() - started_at) * 1000), failures, unregistered, error
+
+
+def _send_fcm(registration_ids, cloud_type, application_id, message, extra, badge):
+    from push_notifications.gcm import send_message
+
+    data = dict(extra)
+    data["message"] = message
+
+    responses = send_message(registration_ids, data, cloud_type, application_id=application_id,
+                             badge=badge, sound="default")
+
+    if not isinstance(responses, list):
+        responses = [responses]
+
+    return sum(response.get("failure", 0) for response in responses if isinstance(response, dict)), []
+
+
+def _send_apns(registration_ids, application_id, message, extra, badge):
+    from push_notifications.apns import _apns_prepare
+    from push_notifications.conf import get_manager
+    from apns2.client import Notification
+
+    notifications = [Notification(token=registration_id,
+                                  payload=_apns_prepare(registration_id, message, application_id=application_id,
+                                                        badge=badge, sound="default", extra=extra))
+                     for registration_id in registration_ids]
+
+    client = _apns_client(application_id)
+
+    try:
+        results = client.send_notification_batch(notifications, get_manager().get_apns_topic(application_id=application_id),
+                                                 expiration=int(time.time()) + APNS_EXPIRATION_IN_SECONDS)
+    except Exception:
+        # Reconnect on the next batch
+        _local.apns_clients.pop(application_id, None)
+        raise
+
+    unregistered = [token for token, result in results.items() if result == "Unregistered"]
+    failures = sum(1 for result in results.values() if result != "Success")
+
+    return failures, unregistered
+
+
+def _apns_client(application_id):
+    from push_notifications.apns import _apns_create_socket
+
+    if not hasattr(_local, "apns_clients"):
+        _local.apns_clients = {}
+
+    client = _local.apns_clients.get(application_id)
+
+    if client is None:
+        client = _apns_create_socket(application_id=application_id)
+        _local.apns_clients[application_id] = client
+
+    return client
@@ -0,0 +1,32 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField, Func, Q, Value
+
+# Text search configuration of the search vectors, see Item.update_search_documents
+CONFIG = "english"
+
+
+class WordSimilarity(Func):
+    function = "word_similarity"
+    output_field = FloatField()
+
+
+def filter(queryset, search_term, prefix=""):
+    """
+    Keeps the rows of queryset whose search document, at prefix (e.g. "item__"), matches search_term by its words,
+    as a substring or with typos. Every one of them can use a GIN index of the search document.
+    """
+    term = search_term.lower()
+
+    return queryset.filter(Q(**{f"{prefix}search_vector": SearchQuery(search_term, config=CONFIG)}) |
+                           Q(**{f"{prefix}search_document__contains": term}) |
+                           Q(**{f"{prefix}search_document__word_similar": term}))
+
+
+def rank(queryset, search_term, prefix=""):
+    """
+    Annotates search_rank on the rows of queryset, higher for words that match and more so in titles, then for
+    closer spellings.
+    """
+    return queryset.annotate(search_rank=SearchRank(F(f"{prefix}search_vector"),
+                                                    SearchQuery(search_term, config=CONFIG)) +
+                             WordSimilarity(Value(search_term.lower()), F(f"{prefix}search_document")))
@@ -0,0 +1,209 @@
+import atexit
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from . import AllTimeStatCache, Api, Constants, DateUtils
+
+import logging
+logger = logging.getLogger('clinks-api-live')
+
+# Counter deltas that haven't been written yet, shared by every thread of this process.
+# DailyStat deltas are keyed by (type, date, venue_id, company_id), AllTimeStat deltas by type.
+_daily = {}
+
+_all_time = {}
+
+_lock = threading.Lock()
+
+_flusher = None
+
+_registered_exit_flush = False
+
+
+def add_daily(type, value, venue=None):
+    """
+    Adds value to the platform wide stat of today and, when venue is given, to the venue's and its company's.
+    """
+    date = DateUtils.today().date()
+
+    keys = [(type, date, None, None)]
+
+    if venue:
+        keys.append((type, date, venue.id, None))
+        keys.append((type, date, None, venue.company_id))
+
+    with _lock:
+        for key in keys:
+            _daily[key] = _daily.get(key, 0) + value
+
+    _flush_later()
+
+
+def add_all_time(type, value):
+    with _lock:
+        _all_time[type] = _all_time.get(type, 0) + value
+
+    _flush_later()
+
+
+def flush():
+    """
+    Writes every buffered delta with one INSERT ... ON CONFLICT DO UPDATE per table, so rows that don't exist yet
+    are created and the others are incremented in the database, whichever process got there first.
+    """
+    with _lock:
+        daily = dict(_daily)
+        all_time = dict(_all_time)
+        _daily.clear()
+        _all_time.clear()
+
+    if daily:
+        try:
+            _flush_daily(daily)
+        except Exception:
+            _restore(_daily, daily)
+            _restore(_all_time, all_time)
+            raise
+
+    if all_time:
+        try:
+            _flush_all_time(all_time)
+        except Exception:
+            _restore(_all_time, all_time)
+            raise
+
+    if daily or all_time:
+        logger.info(f"Flushed {len(daily)} daily and {len(all_time)} all time stat deltas")
+
+    return len(daily) + len(all_time)
+
+
+def _flush_daily(deltas):
+    from ..daily_stat.models import DailyStat
+
+    values = []
+    params = []
+
+    for (type, date, venue_id, company_id), value in deltas.items():
+        values.append("(%s, %s::date, %s::integer, %s::integer, %s::integer, now(), now())")
+        params.extend([type, date, venue_id, company_id, value])
+
+    table = DailyStat._meta.db_table
+
+    # Matches the unique index of migration 0052, venue_id and company_id are null for platform wide stats
+    sql = f"""
+        INSERT INTO {table} (type, date, venue_id, company_id, value, created_at, updated_at)
+        VALUES {", ".join(values)}
+        ON CONFLICT (type, date, (COALESCE(venue_id, 0)), (COALESCE(company_id, 0)))
+        DO UPDATE SET value = {table}.value + EXCLUDED.value, updated_at = EXCLUDED.updated_at
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def _flush_all_time(deltas):
+    from ..all_time_stat.models import AllTimeStat
+
+    values = []
+    params = []
+
+    for type, value in deltas.items():
+        values.append("(%s, %s::integer, now(), now())")
+        params.extend([type, value])
+
+    table = AllTimeStat._meta.db_table
+
+    # The average wait time isn't a counter, it's recomputed from the two counters it's made of in the same statement.
+    # The new values and version are handed to the cache, see AllTimeStatCache.
+    sql = f"""
+        WITH counters AS (
+            INSERT INTO {table} (type, value, created_at, updated_at)
+            VALUES {", ".join(values)}
+            ON CONFLICT (type)
+            DO UPDATE SET value = {table}.value + EXCLUDED.value, updated_at = EXCLUDED.updated_at
+            RETURNING type, value
+        ), average AS (
+            INSERT INTO {table} (type, value, created_at, updated_at)
+            SELECT %s, total_wait_time.value / delivered_order_count.value, now(), now()
+            FROM counters AS total_wait_time, counters AS delivered_order_count
+            WHERE total_wait_time.type = %s AND delivered_order_count.type = %s AND delivered_order_count.value > 0
+            ON CONFLICT (type)
+            DO UPDATE SET value = EXCLUDED.value, updated_at = EXCLUDED.updated_at
+            RETURNING type, value
+        ), version AS (
+            UPDATE {AllTimeStatCache.VERSION_TABLE} SET value = value + 1 WHERE id = 1 RETURNING value
+        )
+        SELECT stat.type, stat.value, version.value
+        FROM (SELECT type, value FROM counters UNION ALL SELECT type, value FROM average) AS stat, version
+    """
+    params.extend([Constants.ALL_TIME_STAT_TYPE_AVERAGE_WAIT_TIME,
+                   Constants.ALL_TIME_STAT_TYPE_TOTAL_WAIT_TIME,
+                   Constants.ALL_TIME_STAT_TYPE_DELIVERED_ORDER_COUNT])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    # Only once the new values can be read by other processes, a rollback would leave the cache ahead of the database
+    transaction.on_commit(lambda: AllTimeStatCache.apply(rows[0][2], {type: value for type, value, version in rows}))
+
+
+def _restore(pending, deltas):
+    # Put the deltas back so the next flush retries them, on top of whatever was added in the meantime
+    with _lock:
+        for key, value in deltas.items():
+            pending[key] = pending.get(key, 0) + value
+
+
+def _flush_later():
+    # Written through once the caller's transaction commits, so the version row isn't locked until a request ends
+    if _writes_through():
+        transaction.on_commit(flush)
+    else:
+        _start_flusher()
+
+
+def _writes_through():
+    return Api.STATS_FLUSH_INTERVAL_IN_SECONDS <= 0 or getattr(settings, "TESTING", False)
+
+
+def _run_flusher():
+    while True:
+        time.sleep(Api.STATS_FLUSH_INTERVAL_IN_SECONDS)
+
+        try:
+            flush()
+        except Exception as e:
+            logger.error(f"Failed to flush stats: {e}")
+        finally:
+            # This thread's connection isn't managed by the request cycle
+            connection.close()
+
+
+def _start_flusher():
+    global _flusher, _registered_exit_flush
+
+    if _flusher is not None and _flusher.is_alive():
+        return
+
+    with _lock:
+        if _flusher is not None and _flusher.is_alive():
+            return
+
+        _flusher = threading.Thread(target=_run_flusher, name="stats-flusher", daemon=True)
+        _flusher.start()
+
+        if not _registered_exit_flush:
+            atexit.register(flush_on_exit)
+            _registered_exit_flush = True
+
+
+def flush_on_exit(**kwargs):
+    try:
+        flush()
+    except Exception as e:
+        logger.error(f"Failed to flush stats on exit: {e}")
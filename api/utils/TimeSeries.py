@@ -0,0 +1,97 @@
+import calendar
+import datetime
+
+HOUR = "hour"
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+
+INTERVALS = [HOUR, DAY, WEEK, MONTH]
+
+
+def build(rows, min_date, max_date, keys, interval=DAY):
+    """
+    Turns (date, key, value) rows into one entry per interval from min_date to max_date (inclusive), oldest first,
+    as {"date": start of the interval, key: sum of its values, ...}. Intervals without rows are filled with zeros.
+    Hourly series take datetimes for min_date and max_date, the others take dates.
+    """
+    buckets = {}
+
+    for date, key, value in rows:
+        start = truncate(date, interval)
+
+        if start not in buckets:
+            buckets[start] = dict.fromkeys(keys, 0)
+
+        if key in buckets[start]:
+            buckets[start][key] += value
+
+    series = []
+
+    current = truncate(min_date, interval)
+    last = truncate(max_date, interval)
+
+    while current <= last:
+        series.append({
+            "date": current,
+            **(buckets.get(current) or dict.fromkeys(keys, 0))
+        })
+        current = following(current, interval)
+
+    return series
+
+
+def build_many(rows, names, min_date, max_date, keys, interval=DAY):
+    """
+    Same as build for (series name, date, key, value) rows, returns {name: series} for every one of names.
+    """
+    rows_by_name = {name: [] for name in names}
+
+    for name, date, key, value in rows:
+        if name in rows_by_name:
+            rows_by_name[name].append((date, key, value))
+
+    return {name: build(rows_by_name[name], min_date, max_date, keys, interval) for name in names}
+
+
+def truncate(date, interval):
+    """
+    Returns the start of the interval date falls in, weeks start on monday.
+    """
+    if interval == HOUR:
+        if not isinstance(date, datetime.datetime):
+            return datetime.datetime.combine(date, datetime.time.min)
+        return date.replace(minute=0, second=0, microsecond=0)
+
+    if isinstance(date, datetime.datetime):
+        date = date.date()
+
+    if interval == DAY:
+        return date
+
+    if interval == WEEK:
+        return date - datetime.timedelta(days=date.weekday())
+
+    if interval == MONTH:
+        return date.replace(day=1)
+
+    raise Exception(f"interval must be one of {INTERVALS}")
+
+
+def following(start, interval):
+    """
+    Returns the start of the interval after the one starting at start.
+    """
+    if interval == HOUR:
+        return start + datetime.timedelta(hours=1)
+
+    if interval == DAY:
+        return start + datetime.timedelta(days=1)
+
+    if interval == WEEK:
+        return start + datetime.timedelta(weeks=1)
+
+    if interval == MONTH:
+        return start + datetime.timedelta(days=calendar.monthrange(start.year, start.month)[1])
+
+    raise Exception(f"interval must be one of {INTERVALS}")
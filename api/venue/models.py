@@ -4,11 +4,11 @@ from ..address.models import Address
 from ..company.models import Company
 from ..currency.models import Currency
 
-from ..utils import Constants, Distance
+from ..utils import Constants
 
 from ..utils.Models import SmartModel
 
-from ..utils import Slug, DateUtils
+from ..utils import Slug, DateUtils, OpeningSchedule
 
 
 class Venue(SmartModel):
@@ -47,6 +47,12 @@ class Venue(SmartModel):
 
     paused = models.BooleanField(default=False)
 
+    # Longest distance in kms the venue's DeliveryCoverage was built for, None if it hasn't been built
+    delivery_coverage_radius = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+
+    # The opening hours compiled by a database trigger whenever they change, see OpeningSchedule
+    opening_schedule = models.BinaryField(null=True, editable=False)
+
     def __str__(self):
         """Return a human readable representation of the model instance."""
         return "Venue {}: ".format(self.id)
@@ -66,35 +72,45 @@ class Venue(SmartModel):
         AllTimeStat.update(Constants.ALL_TIME_STAT_TYPE_VENUE_COUNT, Venue.objects.count(), True)
 
     def open(self):
-        weekday = DateUtils.weekday()
-        now = DateUtils.now(True).time()
-        opening_hour = self.opening_hours.filter(day__iexact=weekday, starts_at__lte=now, ends_at__gt=now)
-        return opening_hour.exists()
+        return OpeningSchedule.is_open(self.opening_schedule)
 
     def can_deliver_to(self, address):
-        from ..delivery_distance.models import DeliveryDistance
+        from ..delivery_coverage.models import DeliveryCoverage
 
-        max_delivery_distance = DeliveryDistance.max_delivery_distance()
-        distance = Distance.between(self.address.point, address.point, True)
+        return DeliveryCoverage.delivery_distance_for(self, address.point) is not None
 
-        return distance <= max_delivery_distance
+    # Recomputed from their total and count whenever either changes, see Counters
+    STAT_AVERAGES = {
+        "average_delivery_time": ("total_delivery_time", "delivered_order_count")
+    }
 
     def update_stats_for(self, order):
-        from ..utils import Constants
-        from django.db.models import F
+        Venue.update_stats_for_orders([order])
+
+    @staticmethod
+    def update_stats_for_orders(orders):
+        """
+        Applies the stats of every one of orders with one UPDATE, see Counters.
+        """
+        from ..utils import Counters
+
+        rows = Counters.collect((order.venue_id, Venue.stat_deltas_for(order)) for order in orders)
+
+        return Counters.add(Venue, rows, Venue.STAT_AVERAGES)
+
+    @staticmethod
+    def stat_deltas_for(order):
+        deltas = {}
 
         if order.status == Constants.ORDER_STATUS_PENDING:
-            self.sales_count = F("sales_count") + 1
-            self.total_earnings = F("total_earnings") + order.payment.amount
+            deltas["sales_count"] = 1
+            deltas["total_earnings"] = order.payment.amount
 
         if order.status == Constants.ORDER_STATUS_LOOKING_FOR_DRIVER:
-            accept_time = DateUtils.minutes_between(order.created_at, DateUtils.now())
-            self.total_accept_time = F("total_accept_time") + accept_time
+            deltas["total_accept_time"] = DateUtils.minutes_between(order.created_at, DateUtils.now())
 
         if order.delivery_status == Constants.DELIVERY_STATUS_DELIVERED:
-            delivery_time = DateUtils.minutes_between(order.collected_at, DateUtils.now())
-            self.delivered_order_count = F("delivered_order_count") + 1
-            self.total_delivery_time = F("total_delivery_time") + delivery_time
-            self.average_delivery_time = self.total_delivery_time/self.delivered_order_count
+            deltas["delivered_order_count"] = 1
+            deltas["total_delivery_time"] = DateUtils.minutes_between(order.collected_at, DateUtils.now())
 
-        self.save()
\ No newline at end of file
+        return deltas
@@ -10,9 +10,11 @@ from ..opening_hour.serializers import (OpeningHour,
 
 from ..currency.serializers import CurrencyDetailSerializer
 
-from ..utils import List
+from ..utils import List, DeliveryTiers
 
 from ..menu.models import Menu
+from ..delivery_coverage.models import DeliveryCoverage
+from ..item_offer.models import ItemOffer
 from .models import Venue
 
 
@@ -39,6 +41,8 @@ class VenueCreateSerializer(CreateModelSerializer):
 
         Menu.objects.create(venue=venue)
 
+        DeliveryCoverage.build_for(venue)
+
         return venue
 
 
@@ -59,6 +63,10 @@ class VenueEditSerializer(EditModelSerializer):
         if opening_hours_data is not None:
             save_opening_hours(venue, opening_hours_data)
 
+        if "paused" in validated_data:
+            ItemOffer.refresh(venue_ids=[venue.id])
+
+        # Moving the address rebuilds the venue's DeliveryCoverage, see Address.save
         if address_data:
             Address.create_or_update_for(venue, address_data)
         return venue
@@ -109,11 +117,14 @@ class VenueCustomerDistanceListSerializer(VenueCustomerListSerializer):
         return instance.distance.m
 
     def get_delivery_fee(self, instance):
-        from ..delivery_distance.models import DeliveryDistance
         distance = instance.distance
         if distance is None:
             return None
-        return DeliveryDistance.get_by_distance(distance.m/1000).fee
+
+        delivery_distance = DeliveryTiers.find(distance.m/1000)
+        if delivery_distance is None:
+            raise Exception("Delivery fee for this distance is not found")
+        return delivery_distance.fee
 
 
 class VenueMemberDetailSerializer(VenueMemberListSerializer):
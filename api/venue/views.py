@@ -15,7 +15,7 @@ from ..utils.Permissions import (
 
 from ..utils.Views import SmartPaginationAPIView, SmartDetailAPIView
 
-from ..utils import QueryParams, Point, Nearby, DateUtils
+from ..utils import QueryParams, Point, Nearby, OpeningSchedule
 from rest_framework.response import Response
 from django.http import Http404
 
@@ -57,12 +57,7 @@ class ListCreate(SmartPaginationAPIView):
             queryset = Nearby.venues(queryset, point)
 
         if open_now:
-            day = DateUtils.weekday()
-            time = DateUtils.time(DateUtils.now(True))
-            queryset = queryset.filter(opening_hours__day__iexact=day,
-                                       opening_hours__starts_at__lte=time,
-                                       opening_hours__ends_at__gt=time,
-                                       opening_hours__deleted_at__isnull=True)
+            queryset = OpeningSchedule.filter(queryset)
 
         if self.is_customer_request() or self.is_anonymous_request():
             from ..company.models import Company
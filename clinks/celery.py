@@ -25,4 +25,13 @@ app.conf.beat_schedule = {
         'task': 'cancel_driver_not_found_or_expired_orders',
         'schedule': crontab(minute='*/5'),  # Runs every 5 minutes
     },
+    'dispatch-delivery-requests': {
+        'task': 'dispatch_delivery_requests',
+        'schedule': 2.0,  # Runs every 2 seconds, drivers should hear about new orders as quickly as possible
+        'options': {'expires': 2.0},  # A tick that couldn't start in time is dropped, the next one covers it
+    },
+    'rollup-daily-stats': {
+        'task': 'rollup_daily_stats',
+        'schedule': crontab(hour=0, minute=30),  # Rebuilds yesterday once the last stat deltas have been flushed
+    },
 }
\ No newline at end of file